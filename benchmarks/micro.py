@@ -0,0 +1,67 @@
+# benchmarks/micro.py
+from __future__ import annotations
+
+import os
+import time
+from typing import Callable, Dict
+
+from core.clock import SimClock
+from core.logger_csv import CSVEventLogger
+from core.point import CovRule
+from core.point_types import AnalogPoint
+from core.policies import all_true
+from plant.plant_core.alarms import Alarm, AlarmPanel
+from plant.plant_core.commands import Command, CommandQueue, CommandType
+
+def time_op(fn: Callable[[], object], n: int, repeat: int = 3) -> float:
+    """Best-of-repeat nanoseconds per call of fn()."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        for _ in range(n):
+            fn()
+        best = min(best, (time.perf_counter_ns() - t0) / n)
+    return best
+
+def bench_should_publish(n: int) -> float:
+    cov = CovRule(deadband_abs=0.05, min_interval_s=0.0)
+    prev = AnalogPoint(id="LT_1", value=5.0, ts_mono=0.0, cov=cov)
+    cur = AnalogPoint(id="LT_1", value=5.01, ts_mono=1.0, cov=cov)
+    return time_op(lambda: cur.should_publish(prev, 1.0), n)
+
+def bench_csv_log(n: int, log_dir: str) -> float:
+    clk = SimClock(0.1)
+    logger = CSVEventLogger(path=os.path.join(log_dir, "micro.csv"))
+    try:
+        return time_op(lambda: logger.log(clk, "INFO", "publish", point_id="LT_1", value=5.0, quality="GOOD"), n)
+    finally:
+        logger.close()
+
+def bench_alarm_update(n: int, alarms: int = 50) -> float:
+    panel = AlarmPanel()
+    for i in range(alarms):
+        panel.add(Alarm(f"A{i}", "alarm"))
+    signals = {f"A{i}": i % 7 == 0 for i in range(alarms)}
+    return time_op(lambda: panel.update(signals, 1.0), n)
+
+def bench_command_queue(n: int) -> float:
+    q = CommandQueue()
+    cmd = Command(CommandType.START, 0.0)
+    def push_pop():
+        q.push(cmd)
+        q.pop()
+    return time_op(push_pop, n)
+
+def bench_all_true(n: int, permissives: int = 8) -> float:
+    preds = [lambda: True] * permissives
+    return time_op(lambda: all_true(preds), n)
+
+def run_micro(log_dir: str, n: int = 20_000) -> Dict[str, Dict[str, float]]:
+    """ns/op for the hot primitives."""
+    return {
+        "point.should_publish": {"ns_per_op": bench_should_publish(n)},
+        "csv_logger.log": {"ns_per_op": bench_csv_log(max(1, n // 10), log_dir)},
+        "alarm_panel.update[50]": {"ns_per_op": bench_alarm_update(max(1, n // 10))},
+        "command_queue.push_pop": {"ns_per_op": bench_command_queue(n)},
+        "all_true[8]": {"ns_per_op": bench_all_true(n)},
+    }
@@ -0,0 +1,104 @@
+# benchmarks/plants.py
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+from typing import Dict, List
+
+from core.commands import Command, CommandKind
+from core.logger_csv import CSVEventLogger
+from core.policy_points import threshold_ge
+from devices.actuators.pump_actuator import OnOffPump
+from devices.sensors.sensor_level import SensorLevel
+from plant.plant_core.alarms import Alarm, AlarmPanel, Severity
+
+PHASES = ("inputs", "commands", "logic", "alarms", "logging")
+
+class SyntheticPlant:
+    """
+    Benchmark plant of n_devices: tank cells of one level sensor and one pump.
+    - Levels are seeded sinusoids, so about one sensor in five publishes per scan.
+    - Each pump has a level permissive and a high-level interlock and gets a START/STOP every
+      command_every scans (staggered across cells).
+    - Each cell has a HI alarm and a pump trip alarm; sensor publishes go to a CSV event log.
+    scan() returns the seconds spent in each phase.
+    """
+
+    def __init__(self, n_devices: int, log_dir: str, seed: int = 0, command_every: int = 50) -> None:
+        rng = random.Random(seed)
+        self.t = 0.0
+        self.command_every = command_every
+        self.sensors: List[SensorLevel] = []
+        self.pumps: List[OnOffPump] = []
+        self.panels: List[AlarmPanel] = []
+        for i in range(max(1, n_devices // 2)):
+            phase, w = rng.uniform(0, 2 * math.pi), rng.uniform(0.05, 0.5)
+            s = SensorLevel(
+                id=f"LT_{i}",
+                read_fn=lambda phase=phase, w=w: 5.0 + 4.5 * math.sin(self.t * w + phase),
+                deadband_abs=0.05, min_interval_s=0.5,
+            )
+            p = OnOffPump(id=f"P_{i}")
+            p.add_permissive(lambda s=s: threshold_ge(s.point, 1.0))
+            p.add_interlock(lambda s=s: s.point.value < 9.8)
+            panel = AlarmPanel()
+            panel.add(Alarm(f"LT_{i}:HI", "Level high", Severity.WARN, latching=False))
+            panel.add(Alarm(f"P_{i}:TRIP", "Pump trip", Severity.TRIP))
+            self.sensors.append(s)
+            self.pumps.append(p)
+            self.panels.append(panel)
+        self.logger = CSVEventLogger(path=os.path.join(log_dir, "events.csv"), rotate_bytes=50_000_000)
+        self.scans = 0
+        self.publishes = 0
+
+    @property
+    def n_devices(self) -> int:
+        return len(self.sensors) + len(self.pumps)
+
+    def scan(self, clk) -> Dict[str, float]:
+        pc = time.perf_counter
+        self.t = clk.now()
+        cost = {}
+
+        t0 = pc()
+        published = []
+        for s in self.sensors:
+            before = s.point
+            s.update(clk)
+            if s.point is not before:
+                published.append(s.point)
+        t1 = pc()
+        cost["inputs"] = t1 - t0
+
+        k = self.scans % self.command_every
+        for i in range(k, len(self.pumps), self.command_every):
+            p = self.pumps[i]
+            kind = CommandKind.STOP if p.state == "RUNNING" else CommandKind.START
+            p.command(Command(p.id, kind, ts_mono=self.t))
+        t2 = pc()
+        cost["commands"] = t2 - t1
+
+        for p in self.pumps:
+            p.update(clk)
+        t3 = pc()
+        cost["logic"] = t3 - t2
+
+        now = self.t
+        for s, p, panel in zip(self.sensors, self.pumps, self.panels):
+            panel.update({f"{s.id}:HI": s.point.value > 9.0, f"{p.id}:TRIP": p.state == "FAULT"}, now)
+        t4 = pc()
+        cost["alarms"] = t4 - t3
+
+        log = self.logger.log
+        for pt in published:
+            log(clk, "INFO", "publish", point_id=pt.id, value=pt.value, quality=pt.quality.value)
+        cost["logging"] = pc() - t4
+
+        self.publishes += len(published)
+        self.scans += 1
+        return cost
+
+    def close(self) -> None:
+        self.logger.close()
@@ -0,0 +1,174 @@
+# benchmarks/run.py
+"""
+Scan-performance benchmarks.
+
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --sizes 1000 10000 --baseline bench.json --tolerance 0.15
+
+Runs synthetic plants of increasing size plus micro-benchmarks, writes JSON, and with
+--baseline exits non-zero when a metric is slower than the baseline by more than the tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence
+
+from benchmarks.micro import run_micro
+from benchmarks.plants import PHASES, SyntheticPlant
+from core.clock import SimClock
+
+try:
+    import resource
+except ImportError: #Windows
+    resource = None
+
+def percentile(sorted_vals: Sequence[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, int(round(pct / 100.0 * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #Linux reports KiB, macOS bytes
+    return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+
+def measure_plant(n_devices: int, scans: int, log_dir: str, warmup: int = 5, alloc_scans: int = 5) -> Dict[str, Any]:
+    """Scan time percentiles, mean per-phase cost and allocation figures for one plant size."""
+    build_t0 = time.perf_counter()
+    plant = SyntheticPlant(n_devices, log_dir)
+    build_s = time.perf_counter() - build_t0
+    clk = SimClock(0.1)
+    try:
+        for _ in range(warmup):
+            plant.scan(clk)
+            clk.sleep_until_next_scan()
+
+        totals: List[float] = []
+        phase_sum = dict.fromkeys(PHASES, 0.0)
+        for _ in range(scans):
+            t0 = time.perf_counter()
+            cost = plant.scan(clk)
+            totals.append(time.perf_counter() - t0)
+            for k, v in cost.items():
+                phase_sum[k] += v
+            clk.sleep_until_next_scan()
+
+        #tracemalloc slows everything down, so allocations are measured on separate scans
+        tracemalloc.start()
+        peak_bytes = 0
+        blocks0 = sum(s.count for s in tracemalloc.take_snapshot().statistics("filename"))
+        for _ in range(alloc_scans):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            plant.scan(clk)
+            clk.sleep_until_next_scan()
+            _, peak = tracemalloc.get_traced_memory()
+            peak_bytes = max(peak_bytes, peak - base)
+        blocks1 = sum(s.count for s in tracemalloc.take_snapshot().statistics("filename"))
+        tracemalloc.stop()
+    finally:
+        plant.close()
+
+    totals.sort()
+    ms = 1000.0
+    return {
+        "devices": plant.n_devices,
+        "scans": scans,
+        "build_s": build_s,
+        "scan_ms": {
+            "mean": sum(totals) / len(totals) * ms,
+            "p50": percentile(totals, 50) * ms,
+            "p90": percentile(totals, 90) * ms,
+            "p99": percentile(totals, 99) * ms,
+            "max": totals[-1] * ms,
+        },
+        "phase_ms": {k: v / scans * ms for k, v in phase_sum.items()},
+        "publishes_per_scan": plant.publishes / plant.scans,
+        "alloc": {
+            "peak_bytes_per_scan": peak_bytes,             #transient high-water inside one scan
+            "net_blocks_per_scan": (blocks1 - blocks0) / alloc_scans, #retained across scans
+        },
+    }
+
+def run(sizes: Sequence[int], scans: int, micro_n: int = 20_000) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="otsim-bench-") as log_dir:
+        plants = {str(n): measure_plant(n, scans, log_dir) for n in sizes}
+        micro = run_micro(log_dir, micro_n)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "peak_rss_mb": peak_rss_mb(),
+        },
+        "plants": plants,
+        "micro": micro,
+    }
+
+# Baseline comparison
+
+def _metrics(result: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten the timing figures a regression check looks at (lower is better for all)."""
+    out: Dict[str, float] = {}
+    for size, r in result.get("plants", {}).items():
+        for k in ("p50", "p99"):
+            out[f"plant[{size}].scan_ms.{k}"] = r["scan_ms"][k]
+        for k, v in r["phase_ms"].items():
+            out[f"plant[{size}].phase_ms.{k}"] = v
+    for name, r in result.get("micro", {}).items():
+        out[f"micro.{name}.ns_per_op"] = r["ns_per_op"]
+    return out
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.10) -> List[Dict[str, Any]]:
+    """One row per metric present in both runs; 'regressed' when current > baseline * (1 + tolerance)."""
+    base, cur = _metrics(baseline), _metrics(current)
+    rows = []
+    for key in sorted(base.keys() & cur.keys()):
+        b, c = base[key], cur[key]
+        ratio = c / b if b > 0 else float("inf") if c > 0 else 1.0
+        rows.append({"metric": key, "baseline": b, "current": c, "ratio": ratio, "regressed": ratio > 1.0 + tolerance})
+    return rows
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[1])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    ap.add_argument("--scans", type=int, default=50)
+    ap.add_argument("--micro-n", type=int, default=20_000)
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--baseline", help="results JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown, 0.10 = 10%%")
+    args = ap.parse_args(argv)
+
+    result = run(args.sizes, args.scans, args.micro_n)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    for size, r in result["plants"].items():
+        s = r["scan_ms"]
+        phases = " ".join(f"{k}={v:.2f}" for k, v in r["phase_ms"].items())
+        print(f"{size:>7} devices  p50={s['p50']:.2f}ms p99={s['p99']:.2f}ms  [{phases}]")
+    for name, r in result["micro"].items():
+        print(f"  {name:<28} {r['ns_per_op']:>10.0f} ns/op")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = [r for r in compare(baseline, result, args.tolerance) if r["regressed"]]
+    for r in regressions:
+        print(f"REGRESSION {r['metric']}: {r['baseline']:.3f} -> {r['current']:.3f} (x{r['ratio']:.2f})")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# core/calc.py
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from graphlib import CycleError, TopologicalSorter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.point import Point, Quality
+from core.point_types import AnalogPoint
+from core.policy_points import analog_value, is_good
+
+#Worst quality wins when inputs are combined
+_RANK = {Quality.GOOD: 0, Quality.MANUAL: 1, Quality.STALE: 2, Quality.BAD: 3}
+
+def worst_quality(points: Iterable[Any]) -> Quality:
+    worst = Quality.GOOD
+    for p in points:
+        q = p.quality if p is not None else Quality.BAD
+        if _RANK.get(q, 3) > _RANK[worst]:
+            worst = q
+    return worst
+
+def vote_average(min_good: int = 1) -> Callable[..., Tuple[float, Quality]]:
+    """
+    Formula for redundant transmitters (use with points=True): average of the GOOD inputs.
+    Output is GOOD with at least min_good healthy inputs, STALE below that, BAD with none.
+    """
+    def vote(*pts: Any) -> Tuple[float, Quality]:
+        good = [analog_value(p) for p in pts if p is not None and is_good(p)]
+        if not good:
+            raise ValueError("no healthy inputs")
+        q = Quality.GOOD if len(good) >= min_good else Quality.STALE
+        return sum(good) / len(good), q
+    return vote
+
+@dataclass
+class CalcDef:
+    tag: str
+    inputs: Sequence[str]
+    fn: Callable[..., Any]
+    eu: Optional[str] = None
+    #points=False: fn(*eng_values) -> value, quality = worst of inputs
+    #points=True:  fn(*points) -> (value, quality), for voting/quality-aware formulas
+    points: bool = False
+
+class CalcEngine:
+    """
+    Derived tags computed from other tags through a dependency DAG.
+    - add() declares a tag, its inputs and a formula; compile() orders them topologically.
+    - update(now, changed) recomputes only calcs downstream of the changed tags, in order,
+      and stops propagating where an output didn't change.
+    - Inputs that aren't calcs are looked up through `source(tag) -> Point`.
+    """
+
+    def __init__(self, source: Callable[[str], Optional[Point]]) -> None:
+        self._source = source
+        self._defs: Dict[str, CalcDef] = {}
+        self._outputs: Dict[str, AnalogPoint] = {}
+        self._order: Dict[str, int] = {}            #topological rank
+        self._dependents: Dict[str, List[str]] = {} #input tag -> calcs that read it
+        self._seen: Dict[str, Any] = {}             #last raw input point seen (held, so identity is safe)
+        self._compiled = False
+        self._primed = False
+        self.evaluations = 0
+
+    def add(self, tag: str, inputs: Sequence[str], fn: Callable[..., Any],
+            eu: Optional[str] = None, points: bool = False) -> None:
+        if tag in self._defs:
+            raise ValueError(f"duplicate calc {tag!r}")
+        self._defs[tag] = CalcDef(tag, tuple(inputs), fn, eu, points)
+        self._compiled = False
+
+    def compile(self) -> None:
+        ts = TopologicalSorter({d.tag: [i for i in d.inputs if i in self._defs] for d in self._defs.values()})
+        try:
+            order = list(ts.static_order())
+        except CycleError as e:
+            raise ValueError(f"calc dependency cycle: {e.args[1]}") from None
+        self._order = {tag: i for i, tag in enumerate(order)}
+        self._primed = False
+        self._dependents = {}
+        for d in self._defs.values():
+            for i in d.inputs:
+                self._dependents.setdefault(i, []).append(d.tag)
+        self._compiled = True
+
+    # Access
+    def point(self, tag: str) -> Optional[AnalogPoint]:
+        return self._outputs.get(tag)
+
+    def _input(self, tag: str) -> Optional[Any]:
+        if tag in self._defs:
+            return self._outputs.get(tag)
+        return self._source(tag)
+
+    def raw_inputs(self) -> List[str]:
+        return [t for t in self._dependents if t not in self._defs]
+
+    def changed_inputs(self) -> List[str]:
+        """Raw inputs whose published Point object was replaced since the last call (COV publish)."""
+        changed = []
+        for tag in self.raw_inputs():
+            p = self._source(tag)
+            if self._seen.get(tag) is not p:
+                self._seen[tag] = p
+                changed.append(tag)
+        return changed
+
+    # Evaluation
+    def _evaluate(self, d: CalcDef, now: float) -> bool:
+        """Recompute one calc; True if its published output changed."""
+        pts = [self._input(i) for i in d.inputs]
+        prev = self._outputs.get(d.tag)
+        self.evaluations += 1
+        try:
+            if d.points:
+                value, q = d.fn(*pts)
+            else:
+                q = worst_quality(pts)
+                if any(p is None for p in pts):
+                    raise ValueError("missing input")
+                value = d.fn(*(analog_value(p) for p in pts))
+            value = float(value)
+        except Exception:
+            q = Quality.BAD
+            value = prev.value if prev is not None else 0.0
+
+        if prev is not None and prev.value == value and prev.quality == q:
+            return False
+        self._outputs[d.tag] = AnalogPoint(id=d.tag, value=value, ts_mono=now, quality=q, eu=d.eu, source="calc")
+        return True
+
+    def update(self, now: float, changed: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Recompute calcs affected by `changed` input tags (default: detect replaced input points).
+        Returns the calc tags whose output changed, in evaluation order.
+        """
+        if not self._compiled:
+            self.compile()
+        if not self._primed:
+            self._primed = True
+            changed = None
+            pending = [(self._order[t], t) for t in self._defs] #first run: everything
+            self.changed_inputs()
+        else:
+            pending = []
+        if changed is None and not pending:
+            changed = self.changed_inputs()
+
+        queued = {t for _, t in pending}
+        for tag in changed or ():
+            for dep in self._dependents.get(tag, ()):
+                if dep not in queued:
+                    queued.add(dep)
+                    pending.append((self._order[dep], dep))
+        heapq.heapify(pending)
+
+        updated = []
+        while pending:
+            _, tag = heapq.heappop(pending)
+            if self._evaluate(self._defs[tag], now):
+                updated.append(tag)
+                for dep in self._dependents.get(tag, ()):
+                    if dep not in queued:
+                        queued.add(dep)
+                        heapq.heappush(pending, (self._order[dep], dep))
+        return updated
@@ -0,0 +1,139 @@
+# core/calibration.py
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from math import sqrt
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.point import Limits, Scaling
+
+class Curve:
+    """Raw -> engineering conversion. Subclasses implement __call__; convert_many is the batch form."""
+
+    def __call__(self, raw: float) -> float:
+        raise NotImplementedError
+
+    def convert_many(self, src: Sequence[float], idxs: Sequence[int], dst: array) -> None:
+        f = self.__call__
+        for i in idxs:
+            dst[i] = f(src[i])
+
+class Linear(Curve):
+    """eng = raw * k + b (same as Scaling)"""
+
+    def __init__(self, k: float = 1.0, b: float = 0.0) -> None:
+        self.k = k
+        self.b = b
+
+    @classmethod
+    def from_scaling(cls, s: Scaling) -> "Linear":
+        return cls(s.k, s.b)
+
+    def __call__(self, raw: float) -> float:
+        return raw * self.k + self.b
+
+    def convert_many(self, src: Sequence[float], idxs: Sequence[int], dst: array) -> None:
+        k, b = self.k, self.b
+        for i in idxs:
+            dst[i] = src[i] * k + b
+
+class PiecewiseLinear(Curve):
+    """
+    Calibration table of (raw, eng) pairs, raw strictly increasing.
+    Between points: linear interpolation. Outside: extend the end segments (extrapolate=True)
+    or hold the end values.
+    """
+
+    def __init__(self, table: Sequence[Tuple[float, float]], extrapolate: bool = True) -> None:
+        if len(table) < 2:
+            raise ValueError("calibration table needs at least two points")
+        xs = [float(x) for x, _ in table]
+        if any(b <= a for a, b in zip(xs, xs[1:])):
+            raise ValueError("raw values must be strictly increasing")
+        self.xs = xs
+        self.ys = [float(y) for _, y in table]
+        self.extrapolate = extrapolate
+        #Per-segment slope/offset so conversion is one bisect and one multiply-add
+        self._k = [(y1 - y0) / (x1 - x0) for x0, x1, y0, y1 in zip(xs, xs[1:], self.ys, self.ys[1:])]
+        self._b = [y0 - k * x0 for k, x0, y0 in zip(self._k, xs, self.ys)]
+
+    def __call__(self, raw: float) -> float:
+        xs = self.xs
+        if not self.extrapolate:
+            if raw <= xs[0]:
+                return self.ys[0]
+            if raw >= xs[-1]:
+                return self.ys[-1]
+        seg = min(max(bisect_right(xs, raw) - 1, 0), len(self._k) - 1)
+        return raw * self._k[seg] + self._b[seg]
+
+class SqrtExtraction(Curve):
+    """
+    DP flow: flow = eng_hi * sqrt(fraction of DP span).
+    Below cutoff (fraction of span) the output is forced to 0 to suppress noise at no-flow.
+    """
+
+    def __init__(self, raw_lo: float, raw_hi: float, eng_hi: float, cutoff: float = 0.01) -> None:
+        if raw_hi <= raw_lo:
+            raise ValueError("raw_hi must be > raw_lo")
+        self.raw_lo = raw_lo
+        self.span = raw_hi - raw_lo
+        self.eng_hi = eng_hi
+        self.cutoff = cutoff
+
+    def __call__(self, raw: float) -> float:
+        frac = (raw - self.raw_lo) / self.span
+        if frac < self.cutoff:
+            return 0.0
+        return self.eng_hi * sqrt(frac)
+
+class Calibration(Curve):
+    """A curve followed by clamping to engineering Limits (either end may be open)."""
+
+    def __init__(self, curve: Curve, limits: Optional[Limits] = None) -> None:
+        self.curve = curve
+        self.lo = limits.lo if limits and limits.lo is not None else float("-inf")
+        self.hi = limits.hi if limits and limits.hi is not None else float("inf")
+
+    def __call__(self, raw: float) -> float:
+        v = self.curve(raw)
+        return self.lo if v < self.lo else self.hi if v > self.hi else v
+
+    def convert_many(self, src: Sequence[float], idxs: Sequence[int], dst: array) -> None:
+        self.curve.convert_many(src, idxs, dst)
+        lo, hi = self.lo, self.hi
+        for i in idxs:
+            v = dst[i]
+            if v < lo:
+                dst[i] = lo
+            elif v > hi:
+                dst[i] = hi
+
+class EngTable:
+    """
+    Raw and engineering values side by side for many channels.
+    Write raw values during input acquisition, call convert() once per scan, then read eng[].
+    Channels sharing a curve object are converted together in one convert_many() call.
+    """
+
+    def __init__(self) -> None:
+        self.raw = array("d")
+        self.eng = array("d")
+        self._groups: Dict[int, Tuple[Curve, List[int]]] = {}
+
+    def add(self, curve: Curve, raw: float = 0.0) -> int:
+        idx = len(self.raw)
+        self.raw.append(raw)
+        self.eng.append(curve(raw))
+        self._groups.setdefault(id(curve), (curve, []))[1].append(idx)
+        return idx
+
+    def set_raw(self, idx: int, raw: float) -> None:
+        self.raw[idx] = raw
+
+    def convert(self) -> array:
+        raw, eng = self.raw, self.eng
+        for curve, idxs in self._groups.values():
+            curve.convert_many(raw, idxs, eng)
+        return eng
@@ -1,6 +1,9 @@
 # core/clock.py
 from __future__ import annotations
 
+import heapq
+import math
+import threading
 import time
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Callable, Protocol
@@ -41,8 +44,8 @@ class RealTimeClock(ScanClock):
     
     def sleep_until_next_scan(self) -> None:
         now = time.monotonic()
-        #If the scan is early, we want to sleep until it is on time
-        if now < self._next_deadline:
+        #If the scan is early (or exactly on time), we want to sleep until it is on time
+        if now <= self._next_deadline:
             time.sleep(self._next_deadline - now)
             self._next_deadline += self.period_s
             return
@@ -57,18 +60,119 @@ class RealTimeClock(ScanClock):
             self._next_deadline += missed_ticks * self.period_s
         #Here we don't want to sleep at all. We need to run immediately and re-check on the next call.
 
+class ScaledClock(ScanClock):
+    """
+    Wall-clock metronome running at `speed` x real time (10.0 = ten times faster, 0.1 = ten times slower).
+    - now() is simulated monotonic seconds; wall_now() is the start wall time plus simulated elapsed
+      time, so HMI/Modbus clients see both move together.
+    - period_s is in simulated seconds; the real sleep is period_s / speed.
+    - set_speed() can be called at runtime (from any thread); now() stays continuous.
+    - Overrun policy "skip" behaves like RealTimeClock. "degrade" also multiplies speed by
+      degrade_factor (not below min_speed), and steps back towards the requested speed after
+      recover_after_scans on-time scans.
+    """
+
+    def __init__(
+            self,
+            period_s: float,
+            speed: float = 1.0,
+            on_overrun: Optional[Callable[[float, float], None]] = None,
+            overrun_policy: str = "skip",
+            degrade_factor: float = 0.5,
+            min_speed: float = 0.01,
+            recover_after_scans: int = 50,
+            start_s: float = 0.0,
+    ) -> None:
+        if period_s <= 0:
+            raise ValueError("period_s must be > 0")
+        if speed <= 0:
+            raise ValueError("speed must be > 0")
+        if overrun_policy not in ("skip", "degrade"):
+            raise ValueError("overrun_policy must be 'skip' or 'degrade'")
+        if not 0.0 < degrade_factor < 1.0:
+            raise ValueError("degrade_factor must be between 0 and 1 (exclusive)")
+        self.period_s = period_s
+        self.overrun_policy = overrun_policy
+        self.degrade_factor = degrade_factor
+        self.min_speed = min_speed
+        self.recover_after_scans = recover_after_scans
+        self._on_overrun = on_overrun or (lambda behind_s, now_s: None)
+        self._lock = threading.Lock()
+
+        self._target_speed = speed  #what the operator asked for
+        self._on_time = 0
+        self._start_s = start_s
+        self._start_wall = datetime.now(timezone.utc)
+        #(sim seconds, real monotonic, speed we are actually running at): replaced as one tuple
+        #under _lock, so now() can read it from any thread without mixing old and new anchors
+        self._anchor = (start_s, time.monotonic(), speed)
+        #First deadline aligned to the simulated period grid
+        self._next_deadline = start_s + self.period_s
+
+    @property
+    def speed(self) -> float:
+        return self._anchor[2]
+
+    def set_speed(self, speed: float) -> None:
+        if speed <= 0:
+            raise ValueError("speed must be > 0")
+        with self._lock:
+            self._target_speed = speed
+            self._rescale(speed)
+
+    def _rescale(self, speed: float) -> None:
+        #Re-anchor so simulated time is continuous across the change (caller holds _lock)
+        sim, real0, old = self._anchor
+        real = time.monotonic()
+        self._anchor = (sim + (real - real0) * old, real, speed)
+
+    def now(self) -> float:
+        sim, real, speed = self._anchor
+        return sim + (time.monotonic() - real) * speed
+
+    def wall_now(self) -> datetime:
+        return self._start_wall + timedelta(seconds=self.now() - self._start_s)
+
+    def sleep_until_next_scan(self) -> None:
+        now = self.now()
+        if now <= self._next_deadline:
+            time.sleep((self._next_deadline - now) / self.speed)
+            self._next_deadline += self.period_s
+            self._on_time += 1
+            if self._on_time >= self.recover_after_scans and self.speed < self._target_speed:
+                with self._lock:
+                    self._rescale(min(self._target_speed, self.speed / self.degrade_factor))
+                self._on_time = 0
+            return
+
+        #Overrun: report, optionally slow down, then skip to the next future tick (no catch-up burst)
+        behind = now - self._next_deadline
+        self._on_time = 0
+        self._on_overrun(behind, now)
+        if self.overrun_policy == "degrade" and self.speed > self.min_speed:
+            with self._lock:
+                self._rescale(max(self.min_speed, self.speed * self.degrade_factor))
+        missed_ticks = int(behind // self.period_s) + 1
+        self._next_deadline += missed_ticks * self.period_s
+
 class SimClock(ScanClock):
     """
     Stopwatch style clock for testing and replay.
     - Time is controlled; nothing actually sleeps.
     - This keeps us deterministic and fast.
+    - event_driven=True: components register wake-ups (wake_at/wake_in) and
+      sleep_until_next_scan() jumps to the first scan tick at or after the earliest one.
+      With nothing registered it falls back to a single period, so scans stay on the period grid.
     """
 
-    def __init__(self, period_s: float, start_s: float = 0.0) -> None:
+    def __init__(self, period_s: float, start_s: float = 0.0, event_driven: bool = False) -> None:
         if period_s <= 0:
             raise ValueError("period_s must be > 0")
         self.period_s = period_s
         self._t = start_s
+        self.event_driven = event_driven
+        self.skipped_scans = 0 #Scans jumped over in event-driven mode
+        self._wakeups: list[float] = []
 
     def now(self) -> float:
         return self._t
@@ -83,7 +187,34 @@ class SimClock(ScanClock):
         if n < 0:
             raise ValueError("n must be >= 0")
         self._t += n * self.period_s
+
+    def advance_to(self, t_s: float) -> None:
+        """Jump straight to t_s (used by replay to restore recorded scan times)."""
+        if t_s < self._t:
+            raise ValueError("SimClock cannot go backwards")
+        self._t = t_s
+
+    # Discrete-event scheduling
+    def wake_at(self, t_s: Optional[float]) -> None:
+        """Register the next time something can change (dwell done, COV interval open, etc.)."""
+        if t_s is not None and t_s > self._t:
+            heapq.heappush(self._wakeups, t_s)
+
+    def wake_in(self, dt_s: float) -> None:
+        self.wake_at(self._t + dt_s)
+
+    def next_wakeup(self) -> Optional[float]:
+        return self._wakeups[0] if self._wakeups else None
     
     def sleep_until_next_scan(self) -> None:
         #We do not want to sleep in this clock. We just need to advance time by one period.
-        self.tick(1)
\ No newline at end of file
+        if not self.event_driven or not self._wakeups:
+            self.tick(1)
+            return
+
+        #Jump to the first tick on the period grid that is at or after the earliest wake-up
+        ticks = max(1, math.ceil((self._wakeups[0] - self._t) / self.period_s - 1e-9))
+        self.skipped_scans += ticks - 1
+        self.tick(ticks)
+        while self._wakeups and self._wakeups[0] <= self._t + 1e-9:
+            heapq.heappop(self._wakeups)
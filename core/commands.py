@@ -18,7 +18,7 @@ class AckCode(str, Enum):
     CONFLICT = "CONFLICT" #LOCAL mode blocks RREMOTE example
     OUT_OF_RANGE = "OUT_OF_RANGE"
 
-@dataclass
+@dataclass(slots=True)
 class Command:
     target: str # Device ID
     kind: CommandKind
@@ -27,16 +27,22 @@ class Command:
     ts_mono: Optional[float] = None #Stamp with clk.now() at ingress
     request_id: Optional[str] = None #Optional for tracing
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Ack:
     ok: bool
     code: AckCode = AckCode.OK
     reason: Optional[str] = None
 
+#Shared results for the constant outcomes (Ack is immutable, so one instance serves every caller)
+ACK_OK = Ack(True)
+ACK_LOCKED = Ack(False, AckCode.CONFLICT, "Device is LOCKED")
+ACK_LOCAL = Ack(False, AckCode.CONFLICT, "Device in LOCAL mode")
+ACK_NO_VALUE = Ack(False, AckCode.INVALID, "SETPOINT requires a value")
+
 #Small, reusable validator for setpoints. 
 def validate_setpoint(value: Optional[float], lo: float, hi: float) -> Ack:
     if value is None:
-        return Ack(False, AckCode.INVALID, "SETPOINT requires a value")
+        return ACK_NO_VALUE
     if not (lo <= value <= hi):
         return Ack(False, AckCode.OUT_OF_RANGE, f"value {value} not in [{lo}, {hi}]")
-    return Ack(True, AckCode.OK, None)
\ No newline at end of file
+    return ACK_OK
\ No newline at end of file
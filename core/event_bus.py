@@ -0,0 +1,155 @@
+# core/event_bus.py
+from __future__ import annotations
+
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+#Event kinds (fixed layout: kind, t, source, value, code, data)
+EV_COV = 1          #source=point id, value=published value, code=quality index
+EV_ALARM = 2        #source=alarm key, value=1.0 active / 0.0 cleared
+EV_ACK = 3          #source=device id, value=1.0 ok / 0.0 rejected, data=Ack
+EV_TRANSITION = 4   #source=mechanism id, code=to_state.value, data=Transition
+
+Event = Tuple[int, int, float, Any, float, int, Any]   #(seq, kind, t, source, value, code, data)
+
+class Consumer:
+    """
+    One sink's cursor on the bus. Only its owner thread calls poll(), and only that thread
+    writes seq/consumed/dropped: the producer never touches a consumer.
+    """
+    __slots__ = ("name", "bus", "seq", "consumed", "dropped")
+
+    def __init__(self, name: str, bus: "EventBus", seq: int) -> None:
+        self.name = name
+        self.bus = bus
+        self.seq = seq          #next sequence to read
+        self.consumed = 0
+        self.dropped = 0        #events skipped because this consumer fell more than max_lag behind
+
+    @property
+    def lag(self) -> int:
+        """Events not yet read (can exceed max_lag until the next poll() skips ahead)."""
+        return self.bus.cursor - self.seq
+
+    def _skip_ahead(self) -> None:
+        floor = self.bus.cursor - self.bus.max_lag
+        if self.seq < floor:
+            self.dropped += floor - self.seq
+            self.seq = floor
+
+    def poll(self, max_batch: Optional[int] = None) -> Iterator[Event]:
+        """
+        Yield the events published since the last poll (at most max_batch), oldest first.
+        A consumer more than max_lag behind first skips ahead (counted in dropped). Slots are
+        read in place and checked again after the read: if the producer lapped a slot meanwhile,
+        the event is dropped rather than yielded torn.
+        """
+        bus = self.bus
+        budget = bus.max_batch if max_batch is None else min(max_batch, bus.max_batch)
+        mask, capacity = bus.mask, bus.capacity
+        kind, t, source, value, code, data = bus.kind, bus.t, bus.source, bus.value, bus.code, bus.data
+        self._skip_ahead()
+        while budget > 0 and self.seq < bus.cursor:
+            seq = self.seq
+            i = seq & mask
+            ev = (seq, kind[i], t[i], source[i], value[i], code[i], data[i])
+            #publish() of seq + capacity overwrites this slot before it bumps the cursor, so
+            #cursor == seq + capacity already means the copy may be torn
+            if seq + capacity <= bus.cursor:
+                self._skip_ahead()
+                continue
+            self.seq = seq + 1
+            self.consumed += 1
+            budget -= 1
+            yield ev
+
+    def drain(self, handler: Callable[[Event], None], max_batch: Optional[int] = None) -> int:
+        n = 0
+        for ev in self.poll(max_batch):
+            handler(ev)
+            n += 1
+        return n
+
+class EventBus:
+    """
+    Single-producer / multi-consumer ring buffer (disruptor style).
+    - Slots are preallocated columns; publish() writes one slot and bumps the cursor, with no
+      per-sink work on the scan thread.
+    - Each consumer keeps its own sequence and reads batches at its own pace.
+    - The producer never waits for or writes to consumers. A consumer that finds itself more
+      than max_lag behind skips ahead on its next poll (the skipped events count as dropped), so
+      a stalled sink can never block the producer or the other sinks.
+    max_lag + max_batch must fit in the ring so a batch read on time is never overwritten.
+    """
+
+    def __init__(self, capacity: int = 65536, max_lag: Optional[int] = None, max_batch: int = 1024) -> None:
+        if capacity < 2 or capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        max_lag = capacity // 2 if max_lag is None else max_lag
+        if max_lag + max_batch > capacity:
+            raise ValueError("max_lag + max_batch must be <= capacity")
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.max_lag = max_lag
+        self.max_batch = max_batch
+        self.kind = array("b", bytes(capacity))
+        self.t = array("d", bytes(8 * capacity))
+        self.value = array("d", bytes(8 * capacity))
+        self.code = array("q", bytes(8 * capacity))
+        self.source: List[Any] = [None] * capacity
+        self.data: List[Any] = [None] * capacity
+        self.cursor = 0         #sequence of the next event to publish
+        self._consumers: Dict[str, Consumer] = {}
+
+    def subscribe(self, name: str, from_start: bool = False) -> Consumer:
+        """New consumer; it sees events published from now on (or everything still in the ring)."""
+        if name in self._consumers:
+            raise ValueError(f"duplicate consumer {name!r}")
+        start = max(0, self.cursor - self.max_lag) if from_start else self.cursor
+        c = self._consumers[name] = Consumer(name, self, start)
+        return c
+
+    def unsubscribe(self, name: str) -> None:
+        self._consumers.pop(name, None)
+
+    def publish(self, kind: int, t: float, source: Any, value: float = 0.0, code: int = 0, data: Any = None) -> int:
+        seq = self.cursor
+        i = seq & self.mask
+        self.kind[i] = kind
+        self.t[i] = t
+        self.source[i] = source
+        self.value[i] = value
+        self.code[i] = code
+        self.data[i] = data
+        self.cursor = seq + 1
+        return seq
+
+    # Producer adapters
+    def on_publish(self, point: Any, now: float) -> None:
+        """SensorLevel(on_publish=bus.on_publish)"""
+        q = point.quality
+        self.publish(EV_COV, now, point.id, float(point.value), _QUALITY_CODES.get(getattr(q, "value", q), 0))
+
+    def alarm_edge(self, key: str, active: bool, t: float) -> None:
+        self.publish(EV_ALARM, t, key, 1.0 if active else 0.0)
+
+    def command_ack(self, device_id: str, ack: Any, t: float) -> None:
+        self.publish(EV_ACK, t, device_id, 1.0 if ack.ok else 0.0, data=ack)
+
+    def lifecycle_hook(self, mechanism_id: str) -> Callable[[Any], None]:
+        """lifecycle.add_hook(bus.lifecycle_hook("PUMP_1"))"""
+        def hook(tr: Any) -> None:
+            self.publish(EV_TRANSITION, tr.t, mechanism_id, 0.0, tr.to_state.value, tr)
+        return hook
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.cursor,
+            "capacity": self.capacity,
+            "consumers": {
+                c.name: {"lag": c.lag, "consumed": c.consumed, "dropped": c.dropped}
+                for c in self._consumers.values()
+            },
+        }
+
+_QUALITY_CODES = {"GOOD": 0, "MANUAL": 1, "STALE": 2, "BAD": 3}
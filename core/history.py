@@ -0,0 +1,166 @@
+# core/history.py
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+Series = Tuple[List[float], List[float]]
+
+class TagHistory:
+    """
+    Fixed-capacity ring of (time, value) samples for one tag.
+    Arrays are preallocated; append is O(1) and never allocates. Times must be non-decreasing
+    (scan time), which lets window queries binary search.
+    """
+    __slots__ = ("capacity", "times", "values", "head", "count")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 2:
+            raise ValueError("capacity must be >= 2")
+        self.capacity = capacity
+        self.times = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.head = 0   #next slot to write
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, t: float, v: float) -> None:
+        h = self.head
+        self.times[h] = t
+        self.values[h] = v
+        self.head = h + 1 if h + 1 < self.capacity else 0
+        if self.count < self.capacity:
+            self.count += 1
+
+    def _phys(self, i: int) -> int:
+        #logical index (0 = oldest) -> slot
+        return (self.head - self.count + i) % self.capacity
+
+    def _lower(self, t: float) -> int:
+        """First logical index with time >= t."""
+        lo, hi = 0, self.count
+        times, phys = self.times, self._phys
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if times[phys(mid)] < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _upper(self, t: float) -> int:
+        """First logical index with time > t."""
+        lo, hi = 0, self.count
+        times, phys = self.times, self._phys
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if times[phys(mid)] <= t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def window(self, t0: float, t1: float) -> Series:
+        """Raw samples with t0 <= t <= t1, oldest first."""
+        a, b = self._lower(t0), self._upper(t1)
+        start = self._phys(a) if a < self.count else 0
+        n = b - a
+        if n <= 0:
+            return [], []
+        end = start + n
+        if end <= self.capacity:
+            return self.times[start:end].tolist(), self.values[start:end].tolist()
+        wrap = end - self.capacity
+        return (
+            self.times[start:].tolist() + self.times[:wrap].tolist(),
+            self.values[start:].tolist() + self.values[:wrap].tolist(),
+        )
+
+    def query(self, t0: float, t1: float, max_points: int, method: str = "lttb") -> Series:
+        """Window [t0, t1] reduced to at most max_points with LTTB or min/max per bucket."""
+        xs, ys = self.window(t0, t1)
+        if method == "lttb":
+            return lttb(xs, ys, max_points)
+        if method == "minmax":
+            return minmax(xs, ys, max_points)
+        raise ValueError(f"unknown downsampling method {method!r}")
+
+def lttb(xs: List[float], ys: List[float], threshold: int) -> Series:
+    """Largest-Triangle-Three-Buckets: keeps the visual shape of a trend with few points."""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return xs, ys
+    out_x, out_y = [xs[0]], [ys[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        #Average of the next bucket is the third triangle vertex
+        nxt_lo = int((i + 1) * every) + 1
+        nxt_hi = min(int((i + 2) * every) + 1, n)
+        cnt = nxt_hi - nxt_lo
+        avg_x = sum(xs[nxt_lo:nxt_hi]) / cnt
+        avg_y = sum(ys[nxt_lo:nxt_hi]) / cnt
+
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        ax, ay = xs[a], ys[a]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        out_x.append(xs[best])
+        out_y.append(ys[best])
+        a = best
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
+
+def minmax(xs: List[float], ys: List[float], max_points: int) -> Series:
+    """Min and max of each pixel bucket, in time order (keeps spikes LTTB might smooth)."""
+    n = len(xs)
+    if max_points >= n or max_points < 2:
+        return xs, ys
+    buckets = max_points // 2
+    out_x: List[float] = []
+    out_y: List[float] = []
+    for b in range(buckets):
+        lo = b * n // buckets
+        hi = (b + 1) * n // buckets
+        if hi <= lo:
+            continue
+        seg = ys[lo:hi]
+        i_min = lo + seg.index(min(seg))
+        i_max = lo + seg.index(max(seg))
+        for j in sorted({i_min, i_max}):
+            out_x.append(xs[j])
+            out_y.append(ys[j])
+    return out_x, out_y
+
+class HistoryStore:
+    """
+    Short-term in-memory history for many tags.
+    Wire record() as a publish hook (e.g. SensorLevel(on_publish=store.record)).
+    """
+
+    def __init__(self, capacity: int = 36_000) -> None:
+        self.capacity = capacity    #36k samples = 1 h of 100 ms publishes
+        self._tags: Dict[str, TagHistory] = {}
+
+    def tag(self, tag: str) -> TagHistory:
+        h = self._tags.get(tag)
+        if h is None:
+            h = self._tags[tag] = TagHistory(self.capacity)
+        return h
+
+    def record(self, point: Any, t: Optional[float] = None) -> None:
+        """Append a published point; t defaults to point.ts_mono."""
+        self.tag(point.id).append(point.ts_mono if t is None else t, float(point.value))
+
+    def query(self, tag: str, t0: float, t1: float, max_points: int, method: str = "lttb") -> Series:
+        h = self._tags.get(tag)
+        if h is None:
+            return [], []
+        return h.query(t0, t1, max_points, method)
@@ -0,0 +1,225 @@
+# core/log_reader.py
+"""
+Columnar reader for CSVEventLogger files.
+
+Rows are parsed with the logger's fixed column layout (no DictReader, no per-row json) into
+chunks of typed columns:
+    mono_ts, value          array('d')  (value is NaN when empty or not numeric)
+    level, event, device,
+    point_id, quality       array('i')  codes into the reader's category tables (-1 = empty)
+    wall_ts, attrs_json     raw strings, decoded only on request (LogChunk.attrs(key))
+Filters on device, event, level and mono_ts range are applied while streaming, before a row is
+encoded. A log path expands to its rotated files (oldest first) followed by the live file;
+any of them may be gzip-compressed (".gz").
+"""
+from __future__ import annotations
+
+import csv
+import glob
+import gzip
+import json
+import os
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Union
+
+from core.logger_csv import CSVEventLogger
+
+COLUMNS = CSVEventLogger._columns
+_CATEGORICAL = ("level", "event", "device", "point_id", "quality")
+_NAN = float("nan")
+
+class Categories:
+    """String <-> code table for one categorical column; codes are stable across chunks."""
+    __slots__ = ("names", "index")
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def code(self, s: str) -> int:
+        if not s:
+            return -1
+        c = self.index.get(s)
+        if c is None:
+            c = self.index[s] = len(self.names)
+            self.names.append(s)
+        return c
+
+    def name(self, code: int) -> Optional[str]:
+        return None if code < 0 else self.names[code]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+class LogChunk:
+    """One block of rows as columns. Categorical columns hold codes into reader.categories."""
+    __slots__ = ("categories", "wall_ts", "mono_ts", "value", "attrs_json",
+                 "level", "event", "device", "point_id", "quality")
+
+    def __init__(self, categories: Dict[str, Categories]) -> None:
+        self.categories = categories
+        self.wall_ts: List[str] = []
+        self.mono_ts = array("d")
+        self.value = array("d")
+        self.attrs_json: List[str] = []
+        self.level = array("i")
+        self.event = array("i")
+        self.device = array("i")
+        self.point_id = array("i")
+        self.quality = array("i")
+
+    def __len__(self) -> int:
+        return len(self.mono_ts)
+
+    def column(self, name: str) -> List[Optional[str]]:
+        """A categorical column decoded back to strings."""
+        names = self.categories[name].names
+        return [names[c] if c >= 0 else None for c in getattr(self, name)]
+
+    def attrs(self, key: str, default: Any = None) -> List[Any]:
+        """
+        One attrs_json key for every row. Only rows whose raw JSON mentions the key are
+        decoded, and nothing is cached: ask for the keys you need.
+        """
+        needle = json.dumps(key, ensure_ascii=False) #CSVEventLogger writes ensure_ascii=False
+        out: List[Any] = []
+        for raw in self.attrs_json:
+            if raw and needle in raw:
+                out.append(json.loads(raw).get(key, default))
+            else:
+                out.append(default)
+        return out
+
+    def extend(self, other: "LogChunk") -> None:
+        for name in self.__slots__[1:]:
+            getattr(self, name).extend(getattr(other, name))
+
+def log_files(path: str) -> List[str]:
+    """path's rotated files, oldest first, then path itself (either may carry a .gz suffix)."""
+    plain = path[:-3] if path.endswith(".gz") else path
+    base, ext = os.path.splitext(plain)
+    ext = ext or ".csv"
+    pattern = f"{glob.escape(base)}.*{ext}"
+    rotated = set(glob.glob(pattern)) | set(glob.glob(pattern + ".gz"))
+    rotated.discard(plain)
+    rotated.discard(plain + ".gz")
+    #Rotated names carry {utc timestamp}.{seq:03d}, so name order is write order
+    files = sorted(rotated, key=lambda p: p[:-3] if p.endswith(".gz") else p)
+    files += [p for p in (plain, plain + ".gz") if os.path.exists(p)]
+    return files
+
+def _open_text(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", newline="", encoding="utf-8")
+    return open(path, newline="", encoding="utf-8")
+
+class LogReader:
+    """
+    Streams CSVEventLogger output as LogChunks of up to chunk_rows rows.
+    paths: one log path (expanded with log_files()) or an explicit sequence of files.
+    devices/events/levels: keep only rows whose column is in the set; t0 <= mono_ts < t1.
+    """
+
+    def __init__(
+            self,
+            paths: Union[str, Sequence[str]],
+            chunk_rows: int = 65536,
+            devices: Optional[Iterable[str]] = None,
+            events: Optional[Iterable[str]] = None,
+            levels: Optional[Iterable[str]] = None,
+            t0: Optional[float] = None,
+            t1: Optional[float] = None,
+    ) -> None:
+        self.paths = log_files(paths) if isinstance(paths, str) else list(paths)
+        self.chunk_rows = chunk_rows
+        self.devices: Optional[Set[str]] = set(devices) if devices is not None else None
+        self.events: Optional[Set[str]] = set(events) if events is not None else None
+        self.levels: Optional[Set[str]] = set(levels) if levels is not None else None
+        self.t0 = t0
+        self.t1 = t1
+        self.categories: Dict[str, Categories] = {c: Categories() for c in _CATEGORICAL}
+        self.rows_read = 0
+        self.rows_kept = 0
+        self._chunk = LogChunk(self.categories)
+
+    def chunks(self) -> Iterator[LogChunk]:
+        self._chunk = LogChunk(self.categories)
+        for path in self.paths:
+            with _open_text(path) as f:
+                yield from self._read_file(f)
+        if len(self._chunk):
+            yield self._chunk
+        self._chunk = LogChunk(self.categories)
+
+    def _read_file(self, f) -> Iterator[LogChunk]:
+        """Fill self._chunk from one file, yielding it when full; a partial chunk carries over."""
+        devices, events, levels, t0, t1 = self.devices, self.events, self.levels, self.t0, self.t1
+        cats = self.categories
+        lv_code, ev_code, dev_code = cats["level"].code, cats["event"].code, cats["device"].code
+        pt_code, q_code = cats["point_id"].code, cats["quality"].code
+        limit = self.chunk_rows
+        chunk = self._chunk
+        read = kept = 0
+        reader = csv.reader(f)
+        for row in reader:
+            if len(row) != 9:
+                continue #blank line or torn write
+            wall, mono, level, event, device, point_id, value, quality, attrs = row
+            if wall == "wall_ts":
+                continue #header (each rotated file has one)
+            read += 1
+            if events is not None and event not in events:
+                continue
+            if devices is not None and device not in devices:
+                continue
+            if levels is not None and level not in levels:
+                continue
+            try:
+                t = float(mono)
+            except ValueError:
+                continue
+            if (t0 is not None and t < t0) or (t1 is not None and t >= t1):
+                continue
+            if value:
+                try:
+                    v = float(value)
+                except ValueError:
+                    v = _NAN
+            else:
+                v = _NAN
+            chunk.wall_ts.append(wall)
+            chunk.mono_ts.append(t)
+            chunk.value.append(v)
+            chunk.attrs_json.append(attrs)
+            chunk.level.append(lv_code(level))
+            chunk.event.append(ev_code(event))
+            chunk.device.append(dev_code(device))
+            chunk.point_id.append(pt_code(point_id))
+            chunk.quality.append(q_code(quality))
+            kept += 1
+            if len(chunk.mono_ts) >= limit:
+                self.rows_read += read
+                self.rows_kept += kept
+                read = kept = 0
+                yield chunk
+                chunk = self._chunk = LogChunk(cats)
+        self.rows_read += read
+        self.rows_kept += kept
+
+    def read(self) -> LogChunk:
+        """Everything that passes the filters as one chunk."""
+        out = LogChunk(self.categories)
+        for chunk in self.chunks():
+            out.extend(chunk)
+        return out
+
+    def load_into(self, store: Any) -> int:
+        """Append numeric point rows to a core.history.HistoryStore. Returns samples appended."""
+        n = 0
+        for chunk in self.chunks():
+            names = self.categories["point_id"].names
+            for t, v, p in zip(chunk.mono_ts, chunk.value, chunk.point_id):
+                if p >= 0 and v == v:
+                    store.tag(names[p]).append(t, v)
+                    n += 1
+        return n
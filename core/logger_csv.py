@@ -24,10 +24,10 @@ class CSVEventLogger:
     def _open(self) -> None:
         os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
         new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
-        self._fp = open(self.path, "a", newline="", encdoing="utf-8")
+        self._fp = open(self.path, "a", newline="", encoding="utf-8")
         self._writer = csv.DictWriter(self._fp, fieldnames=self._columns)
         if self.write_header and new_file:
-            self.writer.writeheader()
+            self._writer.writeheader()
             self._fp.flush()
 
     def close(self) -> None:
@@ -55,7 +55,7 @@ class CSVEventLogger:
                 os.replace(self.path, rotated)
             except FileNotFoundError:
                 pass # race-safe
-            self.open()
+            self._open()
 
     # Logging
     def log(self, clk, level:str, event: str, **attrs: Any) -> None:
@@ -74,7 +74,6 @@ class CSVEventLogger:
             "point_id": attrs.pop("point_id", None),
             "value": attrs.pop("value", None),
             "quality": attrs.pop("quality", None),
-            "reason": attrs.pop("reason", None),
             "attrs_json": json.dumps(attrs, separators=(",", ":"), ensure_ascii=False) if attrs else "",
         }
 
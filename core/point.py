@@ -14,6 +14,9 @@ class Quality(str, Enum):
     #This is for an operator to override
     MANUAL = "MANUAL" 
 
+class StaleRead(Exception):
+    """Raised by a reader that could not refresh in time; the caller keeps its last value as STALE."""
+
 @dataclass
 class Scaling:
     """Raw + engineering scaling: eng = raw * k + b"""
@@ -45,18 +48,40 @@ class Point(Generic[T]):
 
     #Optional meta
     scaling: Optional[Scaling] = None
+    calibration: Optional[Any] = None #core.calibration curve; takes precedence over scaling
     cov: CovRule = field(default_factory=CovRule)
     limits: Limits = field(default_factory=Limits)
 
     #Internal: last publish time (monotonic)
     _last_pub_mono: float = field(default=0.0, repr=False)
+    #Internal: eng() cache, valid while value and the conversion are unchanged. The key is the
+    #calibration object (curves are built once) or the scaling's (k, b) values (Scaling is mutable)
+    _eng_raw: Any = field(default=None, repr=False, compare=False)
+    _eng_conv: Any = field(default=None, repr=False, compare=False)
+    _eng_val: Any = field(default=None, repr=False, compare=False)
 
     # Convenience methods
     def eng(self) -> Any:
-        """Return engineering value (scaled) if scaling is defined"""
-        if self.scaling and isinstance(self.value, (int,float)):
-            return self.value * self.scaling.k + self.scaling.b
-        return self.value
+        """Return engineering value (calibrated or scaled) if a conversion is defined"""
+        value = self.value
+        cal = self.calibration
+        if cal is not None:
+            if not isinstance(value, (int, float)):
+                return value
+            if value is self._eng_raw and cal is self._eng_conv:
+                return self._eng_val
+            eng = cal(value)
+            self._eng_raw, self._eng_conv, self._eng_val = value, cal, eng
+            return eng
+        sc = self.scaling
+        if sc is None or not isinstance(value, (int, float)):
+            return value
+        key = (sc.k, sc.b)
+        if value is self._eng_raw and key == self._eng_conv:
+            return self._eng_val
+        eng = value * sc.k + sc.b
+        self._eng_raw, self._eng_conv, self._eng_val = value, key, eng
+        return eng
     
     def mark_stale(self) -> None:
         self.quality = Quality.STALE
@@ -64,6 +89,12 @@ class Point(Generic[T]):
     def is_stale(self, now_mono: float, max_age_s: float) -> bool:
         return (now_mono - self.ts_mono) > max_age_s
     
+    def next_publish_at(self) -> Optional[float]:
+        """Earliest time the min_interval throttle lets a new publish through (None if unthrottled)."""
+        if self.cov.min_interval_s > 0:
+            return self._last_pub_mono + self.cov.min_interval_s
+        return None
+
     def should_publish(self, prev: Optional["Point[T]"], now_mono: float) -> bool:
         """Decide if this update is worth emitting (COV + throttle + quality change)"""
         #We want to always publish on any quality change
@@ -77,12 +108,13 @@ class Point(Generic[T]):
         
         #For any numerical types, we apply deadband
         if isinstance(self.value, (int, float)) and prev and isinstance(prev.value, (int, float)):
-            dv = abs(self.eng() - prev.eng())
+            prev_eng = prev.eng()
+            dv = abs(self.eng() - prev_eng)
             threshold = 0.0
             if self.cov.deadband_abs:
                 threshold = max(threshold, self.cov.deadband_abs)
             if self.cov.deadband_pct and prev.value != 0:
-                threshold = max(threshold, abs(prev.eng()) * (self.cov.deadband_pct / 100.0))
+                threshold = max(threshold, abs(prev_eng) * (self.cov.deadband_pct / 100.0))
             if dv < threshold:
                 return False
             
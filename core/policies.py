@@ -24,6 +24,12 @@ def dwell_ok(is_true_now: bool, last_true_since: Optional[float], now_mono: floa
     ok = (now_mono - last_true_since) * 1000.0 >= dwell_ms
     return ok, last_true_since
 
+def dwell_due(last_true_since: Optional[float], dwell_ms: float) -> Optional[float]:
+    """When a running dwell timer will be satisfied (None if it isn't running). Use with SimClock.wake_at()."""
+    if last_true_since is None:
+        return None
+    return last_true_since + dwell_ms / 1000.0
+
 #Hysteresis for thresholds: Avoid chattering around a boundary
 def hysteresis_ok(current_ok: bool, measured: float, min_on: float, h_up: float, h_down: float) -> bool:
     """
@@ -0,0 +1,191 @@
+# core/totalizer.py
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+from core.policy_points import is_good
+
+class _Window:
+    """
+    Sliding window of B time buckets per meter; sums holds the running total of the ring.
+    covered/covered_sum track the scan time each bucket's deltas span, which is what rates
+    divide by (the oldest bucket's first delta can reach back before the bucket started).
+    """
+    __slots__ = ("length_s", "width_s", "ring", "sums", "cur", "bucket_start", "covered", "covered_sum")
+
+    def __init__(self, length_s: float, buckets: int) -> None:
+        self.length_s = length_s
+        self.width_s = length_s / buckets
+        self.ring: List[array] = [array("d") for _ in range(buckets)]
+        self.sums = array("d")
+        self.cur = 0
+        self.bucket_start: Optional[float] = None
+        self.covered = array("d", bytes(8 * buckets))
+        self.covered_sum = 0.0
+
+    def grow(self) -> None:
+        for b in self.ring:
+            b.append(0.0)
+        self.sums.append(0.0)
+
+    def advance(self, now: float) -> None:
+        if self.bucket_start is None:
+            self.bucket_start = now
+            return
+        steps = int((now - self.bucket_start) // self.width_s)
+        if steps <= 0:
+            return
+        n = len(self.sums)
+        if steps >= len(self.ring):
+            #Idle longer than the whole window: everything expired
+            for b in self.ring:
+                b[:] = array("d", bytes(8 * n))
+            self.sums[:] = array("d", bytes(8 * n))
+            self.covered[:] = array("d", bytes(8 * len(self.ring)))
+            self.covered_sum = 0.0
+        else:
+            sums = self.sums
+            for _ in range(steps):
+                self.cur = (self.cur + 1) % len(self.ring)
+                old = self.ring[self.cur]
+                for i in range(n):
+                    sums[i] -= old[i]
+                self.ring[self.cur] = array("d", bytes(8 * n))
+                self.covered_sum -= self.covered[self.cur]
+                self.covered[self.cur] = 0.0
+        self.bucket_start += steps * self.width_s
+
+    def expired(self, now: float) -> List[int]:
+        """Ring slots advance(now) would clear (every slot once the window has gone idle)."""
+        if self.bucket_start is None:
+            return []
+        steps = min(max(int((now - self.bucket_start) // self.width_s), 0), len(self.ring))
+        return [(self.cur + k) % len(self.ring) for k in range(1, steps + 1)]
+
+class Totalizer:
+    """
+    Totals and rates for many counters (CounterPoint or anything CounterLike) in one pass per scan.
+    - Deltas handle wrap-around for wrap_bits-wide counters (16/32-bit registers); without
+      wrap_bits a decrease counts as 0 (counter reset), like counter_delta.
+    - Intervals where either end is not GOOD quality contribute 0, like counter_delta.
+    - Rates come from sliding windows (default 1 s, 1 min, 1 h) kept as bucket rings, so memory
+      is fixed per meter no matter the scan rate.
+    """
+
+    def __init__(self, windows_s: Sequence[float] = (1.0, 60.0, 3600.0), buckets: int = 12) -> None:
+        self.ids: List[str] = []
+        self._sources: List[Any] = []
+        self.scale = array("d")         #engineering units per count
+        self.modulus = array("q")       #2**bits, or 0 when the counter doesn't wrap
+        self.prev = array("q")
+        self.prev_good = array("b")     #0 = no previous GOOD sample
+        self.totals = array("d")
+        self.wraps = array("q")
+        self._windows = [_Window(w, buckets) for w in windows_s]
+        self._last_t: Optional[float] = None
+        self._index: Dict[str, int] = {}
+
+    def add(self, id: str, source: Any, wrap_bits: Optional[int] = None, scale: float = 1.0) -> int:
+        """source: a CounterLike point (updated in place) or a callable returning the current point."""
+        if id in self._index:
+            raise ValueError(f"duplicate meter {id!r}")
+        idx = len(self.ids)
+        self._index[id] = idx
+        self.ids.append(id)
+        self._sources.append(source)
+        self.scale.append(scale)
+        self.modulus.append(1 << wrap_bits if wrap_bits else 0)
+        self.prev.append(0)
+        self.prev_good.append(0)
+        self.totals.append(0.0)
+        self.wraps.append(0)
+        for w in self._windows:
+            w.grow()
+        return idx
+
+    def update(self, now: float) -> None:
+        dt = 0.0 if self._last_t is None else now - self._last_t
+        self._last_t = now
+        windows = self._windows
+        for w in windows:
+            w.advance(now)
+            w.covered[w.cur] += dt
+            w.covered_sum += dt
+        cur_buckets = [(w.ring[w.cur], w.sums) for w in windows]
+
+        prev, prev_good, modulus, scale = self.prev, self.prev_good, self.modulus, self.scale
+        totals, wraps = self.totals, self.wraps
+        for i, src in enumerate(self._sources):
+            p = src() if callable(src) else src
+            good = is_good(p)
+            if not good:
+                prev_good[i] = 0
+                continue
+            v = int(p.value)
+            if prev_good[i]:
+                d = v - prev[i]
+                if d < 0:
+                    m = modulus[i]
+                    if m:
+                        d += m
+                        wraps[i] += 1
+                    else:
+                        d = 0
+                if d:
+                    inc = d * scale[i]
+                    totals[i] += inc
+                    for bucket, sums in cur_buckets:
+                        bucket[i] += inc
+                        sums[i] += inc
+            prev[i] = v
+            prev_good[i] = 1
+
+    # Queries
+    def total(self, id: str) -> float:
+        return self.totals[self._index[id]]
+
+    def rate(self, id: str, window_s: float, now: float) -> float:
+        """
+        Average rate per second over the window_s window as of now: the counts in buckets not
+        yet expired at now, divided by the scan time they span plus the time since the last
+        update() (no counts seen yet). The span is less than window_s while the window is young.
+        """
+        idx = self._index[id]
+        w = self._window(window_s)
+        gone = w.expired(now)
+        if len(gone) == len(w.ring):
+            return 0.0
+        counts = w.sums[idx] - sum(w.ring[j][idx] for j in gone)
+        return counts / self._span(w, gone, now)
+
+    def rate_array(self, window_s: float, now: float) -> array:
+        """Per-second rates of every meter over one window as of now, in meter order (for reports)."""
+        w = self._window(window_s)
+        gone = w.expired(now)
+        if len(gone) == len(w.ring):
+            return array("d", bytes(8 * len(w.sums)))
+        sums = array("d", w.sums)
+        for j in gone:
+            for i, c in enumerate(w.ring[j]):
+                sums[i] -= c
+        span = self._span(w, gone, now)
+        return array("d", [s / span for s in sums])
+
+    def _window(self, window_s: float) -> _Window:
+        for w in self._windows:
+            if w.length_s == window_s:
+                return w
+        raise KeyError(f"no {window_s}s window configured")
+
+    def _span(self, w: _Window, gone: List[int], now: float) -> float:
+        since_update = 0.0 if self._last_t is None else max(now - self._last_t, 0.0)
+        return max(w.covered_sum - sum(w.covered[j] for j in gone) + since_update, 1e-9)
+
+    def rates(self, id: str, now: float) -> Dict[str, float]:
+        """Per-second, per-minute and per-hour rates from the 1 s / 1 min / 1 h windows."""
+        return {
+            "per_s": self.rate(id, 1.0, now),
+            "per_min": self.rate(id, 60.0, now) * 60.0,
+            "per_h": self.rate(id, 3600.0, now) * 3600.0,
+        }
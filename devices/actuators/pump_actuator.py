@@ -1,16 +1,18 @@
 # devices\actuators\pump_actuator.py
 
 from dataclasses import dataclass
-from core.commands import Ack, AckCode, CommandKind
+from core.commands import ACK_OK, Ack, AckCode, CommandKind
 from devices.base import BaseActuator
 
+_ACK_START_STOP_ONLY = Ack(False, AckCode.INVALID, "Only START/STOP supported.")
+
 @dataclass(kw_only=True)
 class OnOffPump(BaseActuator):
     def _on_command(self, cmd) -> Ack:
         if cmd.kind in (CommandKind.START, CommandKind.STOP):
             self._last_cmd = cmd
-            return Ack(True)
-        return Ack(False, AckCode.INVALID, "Only START/STOP supported.")
+            return ACK_OK
+        return _ACK_START_STOP_ONLY
         
     
     def update(self, clk):
@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Protocol, Iterable, Callable, Dict, List, Optional, Any
 
-from core.commands import Command, Ack, AckCode
+from core.commands import ACK_LOCAL, ACK_LOCKED, Command, Ack, AckCode
 from core.policies import all_true
 from core.point import Point
 
@@ -71,9 +71,9 @@ class CommandMixin:
 
     def _accept_if_remote(self) -> Ack | None:
         if getattr(self, "mode", Mode.REMOTE) == Mode.LOCKED:
-            return _ack(False, AckCode.CONFLICT, "Device is LOCKED")
+            return ACK_LOCKED
         if getattr(self, "mode", Mode.REMOTE) == Mode.LOCAL:
-            return _ack(False, AckCode.CONFLICT, "Device in LOCAL mode")
+            return ACK_LOCAL
         return None
     
 # A generic actuator base
@@ -0,0 +1,154 @@
+# devices/groups.py
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from core.commands import AckCode, Command, CommandKind
+from devices.base import BaseActuator, DeviceCore, Mode
+
+#Columnar codes: index into these tuples
+ACK_CODES = tuple(AckCode)
+MODES = tuple(Mode)
+_ACK_INDEX = {c: i for i, c in enumerate(ACK_CODES)}
+_MODE_INDEX = {m: i for i, m in enumerate(MODES)}
+_INVALID = _ACK_INDEX[AckCode.INVALID]
+
+@dataclass
+class BulkResult:
+    """Per-device outcome of a group command, in group order."""
+    ids: List[str]
+    ok: array       #'b': 1 accepted, 0 rejected
+    codes: array    #'b': index into ACK_CODES
+
+    def rejected(self) -> List[str]:
+        return [i for i, ok in zip(self.ids, self.ok) if not ok]
+
+@dataclass
+class GroupStatus:
+    """status() of every device in a group as columns; states are codes into the states table."""
+    ids: List[str]
+    modes: array            #'b': index into MODES
+    states: array           #'b': index into state_names (-1 for devices without a state)
+    state_names: List[str]
+    permissives_ok: array   #'b'
+    interlocks_ok: array    #'b'
+
+    def state_of(self, idx: int) -> Optional[str]:
+        s = self.states[idx]
+        return None if s < 0 else self.state_names[s]
+
+class _Group:
+    __slots__ = ("name", "ids", "pattern", "meta", "members")
+
+    def __init__(self, name: str, ids: Optional[Set[str]], pattern: Optional[str], meta: Optional[Dict[str, Any]]) -> None:
+        self.name = name
+        self.ids = ids
+        self.pattern = pattern
+        self.meta = meta
+        self.members: List[DeviceCore] = []
+
+    def matches(self, dev: DeviceCore) -> bool:
+        if self.ids is not None and dev.id not in self.ids:
+            return False
+        if self.pattern is not None and not fnmatchcase(dev.id, self.pattern):
+            return False
+        if self.meta:
+            return all(dev.meta.get(k) == v for k, v in self.meta.items())
+        return True
+
+class DeviceGroups:
+    """
+    Named device groups with bulk operations.
+    - Groups are static id lists, fnmatch patterns on device ids ("AREA2:*", "P_3??"),
+      meta filters ({"station": 3}) or a combination; membership is resolved when a group is
+      defined and kept up to date as devices are added.
+    - command() goes through each device's own command(), so mode arbitration and any
+      subclass behaviour apply exactly as for a single command.
+    - Results are columns (arrays of codes) rather than one Ack/dict per device.
+    """
+
+    def __init__(self, devices: Iterable[DeviceCore] = ()) -> None:
+        self._devices: Dict[str, DeviceCore] = {}
+        self._groups: Dict[str, _Group] = {}
+        for d in devices:
+            self.add_device(d)
+
+    def add_device(self, dev: DeviceCore) -> None:
+        if dev.id in self._devices:
+            raise ValueError(f"duplicate device {dev.id!r}")
+        self._devices[dev.id] = dev
+        for g in self._groups.values():
+            if g.matches(dev):
+                g.members.append(dev)
+
+    def define(self, name: str, ids: Optional[Iterable[str]] = None, pattern: Optional[str] = None,
+               meta: Optional[Dict[str, Any]] = None) -> int:
+        """Define (or redefine) a group. Returns its member count."""
+        if ids is None and pattern is None and not meta:
+            raise ValueError("a group needs ids, a pattern or a meta filter")
+        id_list = None
+        if ids is not None:
+            id_list = list(ids)
+            missing = [i for i in id_list if i not in self._devices]
+            if missing:
+                raise KeyError(f"unknown devices in group {name!r}: {missing[:5]}")
+        g = _Group(name, set(id_list) if id_list is not None else None, pattern, meta)
+        g.members = [d for d in self._devices.values() if g.matches(d)]
+        self._groups[name] = g
+        return len(g.members)
+
+    def members(self, name: str) -> List[DeviceCore]:
+        return self._groups[name].members
+
+    # Bulk operations
+    def set_mode(self, name: str, mode: Mode) -> int:
+        members = self._groups[name].members
+        for d in members:
+            d.set_mode(mode)
+        return len(members)
+
+    def command(self, name: str, kind: CommandKind, value: Optional[float] = None,
+                source: str = "REMOTE", ts_mono: Optional[float] = None,
+                request_id: Optional[str] = None) -> BulkResult:
+        members = self._groups[name].members
+        n = len(members)
+        ok = array("b", bytes(n))
+        codes = array("b", bytes(n))
+        for i, d in enumerate(members):
+            if not isinstance(d, BaseActuator):
+                codes[i] = _INVALID #sensors take no commands
+                continue
+            ack = d.command(Command(d.id, kind, value, source, ts_mono, request_id))
+            ok[i] = 1 if ack.ok else 0
+            codes[i] = _ACK_INDEX[ack.code]
+        return BulkResult([d.id for d in members], ok, codes)
+
+    def status(self, name: str) -> GroupStatus:
+        members = self._groups[name].members
+        n = len(members)
+        modes = array("b", bytes(n))
+        states = array("b", bytes(n))
+        perm = array("b", bytes(n))
+        inter = array("b", bytes(n))
+        names: List[str] = []
+        index: Dict[str, int] = {}
+        for i, d in enumerate(members):
+            modes[i] = _MODE_INDEX[d.mode]
+            st = getattr(d, "state", None)
+            if st is None:
+                states[i] = -1
+            else:
+                k = index.get(st)
+                if k is None:
+                    k = index[st] = len(names)
+                    names.append(st)
+                states[i] = k
+            if isinstance(d, BaseActuator):
+                perm[i] = 1 if d._permissives_ok() else 0
+                inter[i] = 1 if d._interlocks_ok() else 0
+            else:
+                perm[i] = inter[i] = 1
+        return GroupStatus([d.id for d in members], modes, states, names, perm, inter)
@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import Callable, Optional
 from math import isnan
 
-from core.point import Quality, CovRule
+from core.point import Quality, CovRule, StaleRead
 from core.point_types import AnalogPoint
 from devices.base import BaseSensor
 
@@ -20,6 +20,9 @@ class SensorLevel(BaseSensor):
     deadband_pct: Optional[float] = None
     min_interval_s : Optional[float] = None
 
+    # Optional publish hook: on_publish(point, now), e.g. HistoryStore.record
+    on_publish: Optional[Callable[[AnalogPoint, float], None]] = None
+
     # Public, last **published** point exposed to the world/tests
     point: AnalogPoint = field(init=False, repr=False)
     # Private trackers
@@ -59,6 +62,10 @@ class SensorLevel(BaseSensor):
                 # v = self._last_sample_value if self._last_sample_value is not None else 0.0
                 raise ValueError("NaN")
             q = Quality.GOOD
+        except StaleRead:
+            # Reader missed its deadline: hold the last published value, flagged STALE
+            q = Quality.STALE
+            v = self._last_pub.value
         except Exception:
             # On read error, mark BAD and keep last good value if possible
             q = Quality.BAD
@@ -79,6 +86,8 @@ class SensorLevel(BaseSensor):
             self.point = newp
             self._points[0] = self.point
             self._last_pub = newp
+            if self.on_publish:
+                self.on_publish(newp, now)
             return
         
         #Normal COV: Only publish when ruels say so, comparing to last *published*
@@ -107,5 +116,7 @@ class SensorLevel(BaseSensor):
             self.point = published
             self._points[0] = self.point
             self._last_pub = published
+            if self.on_publish:
+                self.on_publish(published, now)
         
         #else: keep last published point unchanged
\ No newline at end of file
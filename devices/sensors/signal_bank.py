@@ -0,0 +1,136 @@
+# devices/sensors/signal_bank.py
+
+from array import array
+from math import cos, log, nan, pi, sin, sqrt
+from typing import Dict, List, Optional
+
+_M64 = (1 << 64) - 1
+_TWO_PI = 2.0 * pi
+_U53 = 1.0 / (1 << 53)
+
+def _mix64(x: int) -> int:
+    """splitmix64 finalizer: a stateless, counter-based RNG step."""
+    x = (x + 0x9E3779B97F4A7C15) & _M64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _M64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _M64
+    return x ^ (x >> 31)
+
+class ChannelReader:
+    """Binds a sensor to one bank channel; use as SensorLevel.read_fn."""
+    __slots__ = ("_values", "_idx")
+
+    def __init__(self, values: array, idx: int) -> None:
+        self._values = values
+        self._idx = idx
+
+    def __call__(self) -> float:
+        return self._values[self._idx]
+
+class SignalBank:
+    """
+    Synthetic values for many simulated channels, generated in one pass per scan.
+
+    value(t) = base + drift*t + step (after step_at) + ramp (after ramp_at)
+               + sine + gaussian noise + occasional spike; dropout yields NaN
+    (SensorLevel already maps NaN to Quality.BAD).
+
+    Randomness is counter-based (splitmix64 keyed on channel seed and scan number), so each
+    channel has its own reproducible stream: adding channels or reordering reads never
+    changes another channel's values.
+    Call sample(clk.now()) once at the top of the scan; sensors read through reader(idx).
+    """
+
+    _PARAMS = (
+        "base", "drift_per_s", "step_at", "step_size", "ramp_at", "ramp_per_s",
+        "sine_amp", "sine_period_s", "noise_sd", "spike_prob", "spike_size", "dropout_prob",
+    )
+
+    def __init__(self, seed: int = 0) -> None:
+        self.seed = seed
+        for name in self._PARAMS:
+            setattr(self, name, array("d"))
+        self.values = array("d")
+        self._chan_seed: List[int] = []
+        self._t: Optional[float] = None
+        self._scan = -1
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add_channel(
+            self,
+            base: float = 0.0,
+            drift_per_s: float = 0.0,
+            step_at: Optional[float] = None,
+            step_size: float = 0.0,
+            ramp_at: Optional[float] = None,
+            ramp_per_s: float = 0.0,
+            sine_amp: float = 0.0,
+            sine_period_s: float = 0.0,
+            noise_sd: float = 0.0,
+            spike_prob: float = 0.0,
+            spike_size: float = 0.0,
+            dropout_prob: float = 0.0,
+            seed: Optional[int] = None,
+    ) -> int:
+        idx = len(self.values)
+        values = (
+            base, drift_per_s, step_at, step_size, ramp_at, ramp_per_s,
+            sine_amp, sine_period_s, noise_sd, spike_prob, spike_size, dropout_prob,
+        )
+        for name, v in zip(self._PARAMS, values):
+            #"never" is stored as +inf so the generator loop stays branch-light
+            getattr(self, name).append(float("inf") if v is None else float(v))
+        self.values.append(base)
+        key = seed if seed is not None else (self.seed << 32) ^ idx
+        self._chan_seed.append(_mix64(key & _M64))
+        return idx
+
+    def set(self, idx: int, **params: float) -> None:
+        """Change a channel at runtime, e.g. set(i, dropout_prob=1.0) to inject a fault."""
+        for name, v in params.items():
+            if name not in self._PARAMS:
+                raise KeyError(name)
+            getattr(self, name)[idx] = float("inf") if v is None else float(v)
+
+    def reader(self, idx: int) -> ChannelReader:
+        if not 0 <= idx < len(self.values):
+            raise IndexError(idx)
+        return ChannelReader(self.values, idx)
+
+    def sample(self, t: float) -> array:
+        """Generate every channel for time t (cached: repeated calls in one scan are free)."""
+        if t == self._t:
+            return self.values
+        self._t = t
+        self._scan += 1
+        scan4 = self._scan << 2
+        out = self.values
+        mix = _mix64
+        for i, (b, dr, st_at, st, rp_at, rp, amp, per, sd, spk_p, spk, drop) in enumerate(zip(
+                self.base, self.drift_per_s, self.step_at, self.step_size, self.ramp_at, self.ramp_per_s,
+                self.sine_amp, self.sine_period_s, self.noise_sd, self.spike_prob, self.spike_size,
+                self.dropout_prob)):
+            v = b + dr * t
+            if t >= st_at:
+                v += st
+            if t > rp_at:
+                v += rp * (t - rp_at)
+            if amp and per > 0.0:
+                v += amp * sin(_TWO_PI * t / per)
+            if sd or spk_p or drop:
+                key = self._chan_seed[i] + scan4
+                if drop and (mix(key) >> 11) * _U53 < drop:
+                    out[i] = nan
+                    continue
+                if sd:
+                    u1 = ((mix(key + 1) >> 11) + 1) * _U53
+                    u2 = (mix(key + 2) >> 11) * _U53
+                    v += sd * sqrt(-2.0 * log(u1)) * cos(_TWO_PI * u2)
+                if spk_p and (mix(key + 3) >> 11) * _U53 < spk_p:
+                    v += spk
+            out[i] = v
+        return out
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"channels": len(self.values), "t": self._t, "scan": self._scan}
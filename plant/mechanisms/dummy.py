@@ -21,6 +21,8 @@ class DummyMechanism:
     tag_trip: str = "DUMMY:TRIP_FB"             # bool trip feedback
     tag_status: str = "DUMMY:STATUS"            # str status for HMI
 
+    _last_enable: bool = field(default=False, init=False, repr=False)
+
     def __post_init__(self):
         self.commands = CommandQueue(debounce_s=self.cmd_debounce_s)
         self.alarms.add(Alarm("trip", "Dummy tripped", severity=Severity.TRIP, latching=True))
@@ -36,13 +38,37 @@ class DummyMechanism:
         if cmd.type == CommandType.START:
             self.lifecycle.request_start(t, "enable true")
         elif cmd.type == CommandType.STOP:
-            self.lifecycle.request_stop(T, "enable false")
+            self.lifecycle.request_stop(t, "enable false")
         elif cmd.type == CommandType.ACK:
             self.alarms.ack_all()
     
     def tick(self, clock, dt: float):
-        t = getattr(clock, "now", 0.0)
+        now = getattr(clock, "now", 0.0)
+        t = now() if callable(now) else now
 
         #1) read inputs
         enable = bool(self.io.read(self.tag_enable, False))
-        
\ No newline at end of file
+        trip = bool(self.io.read(self.tag_trip, False))
+        if enable != self._last_enable:
+            self._last_enable = enable
+            self.on_enable_change(t, enable)
+
+        #2) one command per tick
+        self._handle_one_command(t)
+
+        #3) alarms and trip handling
+        self.alarms.update({"trip": trip}, t)
+        if trip:
+            self.lifecycle.trip_fault(t, "trip feedback")
+        elif self.lifecycle.state == MachineState.FAULT and not self.alarms.alarms["trip"].latched:
+            self.lifecycle.clear_fault(t, "trip cleared and acked")
+
+        #4) pretend the equipment confirms in one tick
+        if self.lifecycle.state == MachineState.STARTING:
+            self.lifecycle.confirm_started(t)
+        elif self.lifecycle.state == MachineState.STOPPING:
+            self.lifecycle.confirm_stopped(t)
+
+        #5) write outputs
+        self.io.write(self.tag_running, self.lifecycle.is_runing)
+        self.io.write(self.tag_status, self.lifecycle.state.name)
@@ -0,0 +1,224 @@
+# plant/physics/hydraulics.py
+from __future__ import annotations
+
+from array import array
+from math import sqrt
+from typing import Any, Callable, Dict, List, Optional, Union
+
+G = 9.81        #m/s^2
+RHO = 1000.0    #kg/m^3 (water)
+
+class Handle:
+    """
+    Read-only view of one element of a network array.
+    Callable, so it can be passed straight in as SensorLevel.read_fn.
+    """
+    __slots__ = ("_arr", "_idx")
+
+    def __init__(self, arr: array, idx: int) -> None:
+        self._arr = arr
+        self._idx = idx
+
+    def __call__(self) -> float:
+        return self._arr[self._idx]
+
+    @property
+    def value(self) -> float:
+        return self._arr[self._idx]
+
+Ref = Union[int, str]
+
+class HydraulicNetwork:
+    """
+    Tanks connected by pumps and valves, stored as parallel arrays (one entry per element).
+    - Tank head = elevation + level. Pumps follow a quadratic curve H = h0 * (1 - (Q/q_max)^2).
+    - Valves pass Q = cv * opening * sign(dh) * sqrt(|dh|), positive from a to b.
+    - Actuator states come in through bind_pump()/bind_valve() and are sampled once per step.
+    - Levels, flows and pressures are exposed as Handles that sensors read.
+    The arrays are only ever mutated in place, so Handles stay valid as the network grows.
+    """
+
+    def __init__(self) -> None:
+        # Tanks
+        self.tank_ids: List[str] = []
+        self.area = array("d")
+        self.elevation = array("d")
+        self.max_level = array("d")
+        self.level = array("d")
+        self.pressure_kpa = array("d")     #hydrostatic pressure at the tank floor
+        self.boundary_flow = array("d")    #external inflow(+)/demand(-) in m^3/s
+
+        # Pumps
+        self.pump_ids: List[str] = []
+        self.pump_src = array("l")
+        self.pump_dst = array("l")
+        self.pump_h0 = array("d")          #shutoff head (m)
+        self.pump_qmax = array("d")        #flow at zero head (m^3/s)
+        self.pump_on = array("b")
+        self.pump_flow = array("d")
+
+        # Valves
+        self.valve_ids: List[str] = []
+        self.valve_a = array("l")
+        self.valve_b = array("l")
+        self.valve_cv = array("d")
+        self.valve_opening = array("d")    #0..1
+        self.valve_flow = array("d")
+
+        self._pump_inputs: List[tuple] = []     #(pump idx, source)
+        self._valve_inputs: List[tuple] = []    #(valve idx, source)
+        self._index: Dict[str, Dict[str, int]] = {"tank": {}, "pump": {}, "valve": {}}
+        self._scratch = array("d")
+
+    # Building
+    def add_tank(self, id: str, area_m2: float, level_m: float = 0.0,
+                 max_level_m: Optional[float] = None, elevation_m: float = 0.0) -> int:
+        if area_m2 <= 0:
+            raise ValueError("area_m2 must be > 0")
+        idx = self._register("tank", id, self.tank_ids)
+        self.area.append(area_m2)
+        self.elevation.append(elevation_m)
+        self.max_level.append(max_level_m if max_level_m is not None else float("inf"))
+        self.level.append(level_m)
+        self.pressure_kpa.append(RHO * G * level_m / 1000.0)
+        self.boundary_flow.append(0.0)
+        self._scratch.append(0.0)
+        return idx
+
+    def add_pump(self, id: str, src: Ref, dst: Ref, shutoff_head_m: float, q_max_m3s: float) -> int:
+        if shutoff_head_m <= 0 or q_max_m3s <= 0:
+            raise ValueError("pump curve needs shutoff_head_m > 0 and q_max_m3s > 0")
+        idx = self._register("pump", id, self.pump_ids)
+        self.pump_src.append(self._ref("tank", src))
+        self.pump_dst.append(self._ref("tank", dst))
+        self.pump_h0.append(shutoff_head_m)
+        self.pump_qmax.append(q_max_m3s)
+        self.pump_on.append(0)
+        self.pump_flow.append(0.0)
+        return idx
+
+    def add_valve(self, id: str, a: Ref, b: Ref, cv: float, opening: float = 1.0) -> int:
+        idx = self._register("valve", id, self.valve_ids)
+        self.valve_a.append(self._ref("tank", a))
+        self.valve_b.append(self._ref("tank", b))
+        self.valve_cv.append(cv)
+        self.valve_opening.append(opening)
+        self.valve_flow.append(0.0)
+        return idx
+
+    def _register(self, kind: str, id: str, ids: List[str]) -> int:
+        if id in self._index[kind]:
+            raise ValueError(f"duplicate {kind} id {id!r}")
+        self._index[kind][id] = len(ids)
+        ids.append(id)
+        return len(ids) - 1
+
+    def _ref(self, kind: str, ref: Ref) -> int:
+        return ref if isinstance(ref, int) else self._index[kind][ref]
+
+    # Actuator inputs
+    def bind_pump(self, pump: Ref, source: Any) -> None:
+        """source: a callable returning bool, or an actuator whose state == "RUNNING" means on."""
+        self._pump_inputs.append((self._ref("pump", pump), source))
+
+    def bind_valve(self, valve: Ref, source: Callable[[], float]) -> None:
+        """source returns the opening fraction 0..1."""
+        self._valve_inputs.append((self._ref("valve", valve), source))
+
+    def set_pump(self, pump: Ref, on: bool) -> None:
+        self.pump_on[self._ref("pump", pump)] = 1 if on else 0
+
+    def set_valve(self, valve: Ref, opening: float) -> None:
+        self.valve_opening[self._ref("valve", valve)] = min(1.0, max(0.0, opening))
+
+    def sample_inputs(self) -> None:
+        pump_on = self.pump_on
+        for idx, src in self._pump_inputs:
+            on = src() if callable(src) else src.state == "RUNNING"
+            pump_on[idx] = 1 if on else 0
+        opening = self.valve_opening
+        for idx, src in self._valve_inputs:
+            opening[idx] = min(1.0, max(0.0, float(src())))
+
+    # Point-store handles
+    def level_of(self, tank: Ref) -> Handle:
+        return Handle(self.level, self._ref("tank", tank))
+
+    def pressure_of(self, tank: Ref) -> Handle:
+        return Handle(self.pressure_kpa, self._ref("tank", tank))
+
+    def pump_flow_of(self, pump: Ref) -> Handle:
+        return Handle(self.pump_flow, self._ref("pump", pump))
+
+    def valve_flow_of(self, valve: Ref) -> Handle:
+        return Handle(self.valve_flow, self._ref("valve", valve))
+
+    # Dynamics
+    def state(self) -> array:
+        """Integrated state vector (tank levels)."""
+        return self.level
+
+    def derivative(self, t: float, y: array, out: array) -> None:
+        """
+        d(level)/dt for every tank at levels y, written into out.
+        Link flows evaluated at y are left in pump_flow/valve_flow.
+        """
+        elev, area = self.elevation, self.area
+        for i in range(len(out)):
+            out[i] = self.boundary_flow[i]
+
+        src, dst, h0, qmax = self.pump_src, self.pump_dst, self.pump_h0, self.pump_qmax
+        pump_on, pump_flow = self.pump_on, self.pump_flow
+        for p in range(len(pump_flow)):
+            a, b = src[p], dst[p]
+            q = 0.0
+            if pump_on[p] and y[a] > 0.0:
+                lift = (elev[b] + y[b]) - (elev[a] + y[a])
+                if lift < h0[p]:
+                    q = qmax[p] * sqrt(1.0 - lift / h0[p]) if lift > 0.0 else qmax[p]
+            pump_flow[p] = q
+            out[a] -= q
+            out[b] += q
+
+        va, vb, cv, opening, valve_flow = self.valve_a, self.valve_b, self.valve_cv, self.valve_opening, self.valve_flow
+        for v in range(len(valve_flow)):
+            a, b = va[v], vb[v]
+            dh = (elev[a] + y[a]) - (elev[b] + y[b])
+            q = 0.0
+            if opening[v] > 0.0 and dh != 0.0:
+                if dh > 0.0 and y[a] > 0.0:
+                    q = cv[v] * opening[v] * sqrt(dh)
+                elif dh < 0.0 and y[b] > 0.0:
+                    q = -cv[v] * opening[v] * sqrt(-dh)
+            valve_flow[v] = q
+            out[a] -= q
+            out[b] += q
+
+        for i in range(len(out)):
+            out[i] /= area[i]
+
+    def set_state(self, y: array) -> None:
+        """Commit integrated levels (clamped to [0, max_level]) and refresh pressures."""
+        level, max_level, pressure = self.level, self.max_level, self.pressure_kpa
+        k = RHO * G / 1000.0
+        for i in range(len(level)):
+            h = y[i]
+            if h < 0.0:
+                h = 0.0
+            elif h > max_level[i]:
+                h = max_level[i]
+            level[i] = h
+            pressure[i] = k * h
+
+    def step(self, dt: float, t: float = 0.0) -> None:
+        """One explicit Euler step of the whole network (sample inputs -> flows -> levels)."""
+        self.sample_inputs()
+        dydt = self._scratch
+        self.derivative(t, self.level, dydt)
+        level = self.level
+        for i in range(len(level)):
+            dydt[i] = level[i] + dydt[i] * dt
+        self.set_state(dydt)
+
+    def total_volume(self) -> float:
+        return sum(h * a for h, a in zip(self.level, self.area))
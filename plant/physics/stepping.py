@@ -0,0 +1,249 @@
+# plant/physics/stepping.py
+"""
+Simulation stepping layer: advances process models at their own rate inside each scan.
+
+A model exposes its state as a flat float vector:
+    state() -> array('d')                   current state (read only)
+    derivative(t, y, out) -> None           dy/dt at (t, y), written into out
+    set_state(y) -> None                    commit the integrated state
+    sample_inputs() -> None                 optional; read actuator states once per scan
+HydraulicNetwork already follows this shape.
+"""
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, MutableSequence, Optional, Protocol, Sequence, Tuple
+
+Derivative = Callable[[float, Sequence[float], MutableSequence[float]], None]
+
+class Model(Protocol):
+    def state(self) -> Sequence[float]: ...
+    def derivative(self, t: float, y: Sequence[float], out: MutableSequence[float]) -> None: ...
+    def set_state(self, y: Sequence[float]) -> None: ...
+
+# Integrators
+
+class Euler:
+    """Explicit Euler: one derivative call per step, first order."""
+    name = "euler"
+    adaptive = False
+
+    def step(self, f: Derivative, t: float, y: array, h: float) -> Tuple[array, float]:
+        k = array("d", bytes(8 * len(y)))
+        f(t, y, k)
+        return array("d", [yi + h * ki for yi, ki in zip(y, k)]), 0.0
+
+class RK4:
+    """Classic fourth order Runge-Kutta: four derivative calls per step."""
+    name = "rk4"
+    adaptive = False
+
+    def step(self, f: Derivative, t: float, y: array, h: float) -> Tuple[array, float]:
+        n = len(y)
+        k1, k2, k3, k4 = (array("d", bytes(8 * n)) for _ in range(4))
+        f(t, y, k1)
+        f(t + h / 2, array("d", [yi + h / 2 * a for yi, a in zip(y, k1)]), k2)
+        f(t + h / 2, array("d", [yi + h / 2 * a for yi, a in zip(y, k2)]), k3)
+        f(t + h, array("d", [yi + h * a for yi, a in zip(y, k3)]), k4)
+        return array("d", [
+            yi + h / 6 * (a + 2 * b + 2 * c + d) for yi, a, b, c, d in zip(y, k1, k2, k3, k4)
+        ]), 0.0
+
+class Adaptive:
+    """
+    Bogacki-Shampine 3(2) with step-size control.
+    step() returns the scaled error norm: <= 1.0 means the step meets rtol/atol.
+    """
+    name = "adaptive"
+    adaptive = True
+    order = 3
+
+    def __init__(self, rtol: float = 1e-6, atol: float = 1e-9, h_min: float = 1e-6) -> None:
+        self.rtol = rtol
+        self.atol = atol
+        self.h_min = h_min
+
+    def step(self, f: Derivative, t: float, y: array, h: float) -> Tuple[array, float]:
+        n = len(y)
+        k1, k2, k3, k4 = (array("d", bytes(8 * n)) for _ in range(4))
+        f(t, y, k1)
+        f(t + h / 2, array("d", [yi + h / 2 * a for yi, a in zip(y, k1)]), k2)
+        f(t + 3 * h / 4, array("d", [yi + 3 * h / 4 * b for yi, b in zip(y, k2)]), k3)
+        y3 = array("d", [yi + h * (2 * a + 3 * b + 4 * c) / 9 for yi, a, b, c in zip(y, k1, k2, k3)])
+        f(t + h, y3, k4)
+        err = 0.0
+        for yi, yn, a, b, c, d in zip(y, y3, k1, k2, k3, k4):
+            y2 = yi + h * (7 * a / 24 + b / 4 + c / 3 + d / 8)
+            scale = self.atol + self.rtol * max(abs(yi), abs(yn))
+            e = abs(yn - y2) / scale
+            if e > err:
+                err = e
+        return y3, err
+
+INTEGRATORS: Dict[str, Callable[[], Any]] = {"euler": Euler, "rk4": RK4, "adaptive": Adaptive}
+
+def make_integrator(spec: Any) -> Any:
+    return INTEGRATORS[spec]() if isinstance(spec, str) else spec
+
+# Metrics
+
+@dataclass
+class StepStats:
+    scans: int = 0
+    steps: int = 0              #accepted sub-steps
+    rejected: int = 0           #adaptive steps retried with a smaller h
+    last_err: float = 0.0       #scaled error norm of the last accepted step (adaptive only)
+    max_err: float = 0.0
+    cpu_s: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "scans": self.scans, "steps": self.steps, "rejected": self.rejected,
+            "last_err": self.last_err, "max_err": self.max_err, "cpu_s": self.cpu_s,
+        }
+
+# Steppers
+
+@dataclass
+class ModelStepper:
+    """
+    Sub-steps one model inside each scan.
+    - Fixed integrators take ceil(dt / substep_s) equal steps.
+    - Adaptive starts from substep_s and lets the error controller pick h (capped at the scan).
+    """
+    model: Any
+    integrator: Any = "rk4"
+    substep_s: float = 0.01
+    name: str = ""
+    stats: StepStats = field(default_factory=StepStats)
+
+    _h: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.substep_s <= 0:
+            raise ValueError("substep_s must be > 0")
+        self.integrator = make_integrator(self.integrator)
+        self._h = self.substep_s
+
+    def _sample_inputs(self) -> None:
+        sample = getattr(self.model, "sample_inputs", None)
+        if sample:
+            sample()
+
+    def _load(self) -> array:
+        return array("d", self.model.state())
+
+    def _derivative(self, t: float, y: Sequence[float], out: MutableSequence[float]) -> None:
+        self.model.derivative(t, y, out)
+
+    def _commit(self, y: array) -> None:
+        self.model.set_state(y)
+
+    def advance(self, t0: float, dt: float) -> None:
+        c0 = time.perf_counter()
+        self._sample_inputs()
+        y = self._load()
+        integ, st, f = self.integrator, self.stats, self._derivative
+        if integ.adaptive:
+            t, t_end = t0, t0 + dt
+            h = self._h
+            while t_end - t > 1e-12:
+                h_try = min(h, t_end - t)
+                y_new, err = integ.step(f, t, y, h_try)
+                if err <= 1.0 or h_try <= integ.h_min:
+                    t += h_try
+                    y = y_new
+                    st.steps += 1
+                    st.last_err = err
+                    st.max_err = max(st.max_err, err)
+                    #Only full-size steps grow h; a short end-of-scan remainder leaves it alone
+                    if h_try >= h:
+                        grow = 5.0 if err == 0.0 else min(5.0, 0.9 * err ** (-1.0 / integ.order))
+                        h = min(dt, h * grow)
+                else:
+                    st.rejected += 1
+                    h = max(integ.h_min, h_try * max(0.2, 0.9 * err ** (-1.0 / integ.order)))
+            self._h = h
+        else:
+            n = max(1, math.ceil(dt / self.substep_s - 1e-9))
+            h = dt / n
+            for i in range(n):
+                y, _ = integ.step(f, t0 + i * h, y, h)
+            st.steps += n
+        self._commit(y)
+        st.scans += 1
+        st.cpu_s += time.perf_counter() - c0
+
+@dataclass
+class ModelBatch(ModelStepper):
+    """
+    Several similar models integrated as one concatenated state vector, so every integrator
+    stage is a single array pass. Each model sees its own slice through a memoryview.
+    Adaptive batches step at the pace of the stiffest member.
+    """
+    model: List[Any] = field(default_factory=list)
+
+    _offsets: List[Tuple[int, int]] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        pos = 0
+        for m in self.model:
+            n = len(m.state())
+            self._offsets.append((pos, pos + n))
+            pos += n
+
+    def _sample_inputs(self) -> None:
+        for m in self.model:
+            sample = getattr(m, "sample_inputs", None)
+            if sample:
+                sample()
+
+    def _load(self) -> array:
+        y = array("d")
+        for m in self.model:
+            y.extend(m.state())
+        return y
+
+    def _derivative(self, t: float, y: Sequence[float], out: MutableSequence[float]) -> None:
+        yv, ov = memoryview(y), memoryview(out)
+        for m, (a, b) in zip(self.model, self._offsets):
+            m.derivative(t, yv[a:b], ov[a:b])
+
+    def _commit(self, y: array) -> None:
+        yv = memoryview(y)
+        for m, (a, b) in zip(self.model, self._offsets):
+            m.set_state(yv[a:b])
+
+class SimulationStepper:
+    """
+    Owns every process model and advances them once per control scan.
+    Accuracy and CPU cost are set per model (integrator, substep_s, tolerances),
+    independently of the scan period.
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[ModelStepper] = []
+
+    def add(self, model: Any, integrator: Any = "rk4", substep_s: float = 0.01, name: str = "") -> ModelStepper:
+        entry = ModelStepper(model, integrator, substep_s, name or f"model{len(self._entries)}")
+        self._entries.append(entry)
+        return entry
+
+    def add_batch(self, models: List[Any], integrator: Any = "rk4", substep_s: float = 0.01, name: str = "") -> ModelBatch:
+        entry = ModelBatch(models, integrator, substep_s, name or f"batch{len(self._entries)}")
+        self._entries.append(entry)
+        return entry
+
+    def advance(self, clk, dt: Optional[float] = None) -> None:
+        """Advance every model from clk.now() by one scan (clk.period_s unless dt is given)."""
+        t0 = clk.now()
+        dt = clk.period_s if dt is None else dt
+        for entry in self._entries:
+            entry.advance(t0, dt)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        return {e.name: e.stats.as_dict() for e in self._entries}
@@ -0,0 +1,136 @@
+# plant/plant_core/alarm_rules.py
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.policies import dwell_due, dwell_ok, hysteresis_ok
+from plant.plant_core.alarms import Alarm, AlarmPanel, Severity
+
+KINDS = ("HIHI", "HI", "LO", "LOLO")
+
+Edge = Tuple[str, bool]     #(alarm key, active)
+
+@dataclass(frozen=True)
+class AnalogAlarm:
+    """
+    Declarative limit alarm on one analog point.
+    - HI/HIHI raise at value >= limit and clear at value <= limit - deadband;
+      LO/LOLO raise at value <= limit and clear at value >= limit + deadband (hysteresis_ok).
+    - on_delay_s/off_delay_s: the new condition must hold continuously that long before the
+      alarm changes state (dwell_ok).
+    """
+    key: str
+    kind: str
+    limit: float
+    deadband: float = 0.0
+    on_delay_s: float = 0.0
+    off_delay_s: float = 0.0
+    text: str = ""
+    severity: Severity = Severity.ALARM
+    latching: bool = True
+
+class _Rule:
+    __slots__ = ("d", "sign", "source", "raw", "active", "since", "due")
+
+    def __init__(self, d: AnalogAlarm, source: Any) -> None:
+        self.d = d
+        self.sign = 1.0 if d.kind in ("HI", "HIHI") else -1.0
+        self.source = source    #anything with .point (SensorLevel) or the point itself
+        self.raw = False        #condition after the deadband, before the delays
+        self.active = False     #debounced alarm state, what the panel sees
+        self.since: Optional[float] = None  #when raw started to differ from active
+        self.due: Optional[float] = None    #pending delay timer
+
+class AlarmRules:
+    """
+    Derives analog alarm edges from point changes instead of rebuilding a full signals dict.
+    - Sources report changes through on_publish(point, now) (the SensorLevel hook) or
+      touch(point_id); only alarms on changed points, plus alarms whose on/off delay comes due,
+      are evaluated, so the cost of update() follows activity, not the number of alarms.
+    - Points whose quality is not GOOD hold their alarms' current state.
+    - Only edges are passed to the panel (AlarmPanel.apply).
+    """
+
+    def __init__(self, panel: Optional[AlarmPanel] = None) -> None:
+        self.panel = panel
+        self._by_point: Dict[str, List[_Rule]] = {}
+        self._changed: Set[str] = set()
+        self._timers: List[Tuple[float, int, _Rule]] = []  #heap of (due, tiebreak, rule)
+        self._tiebreak = count()
+        self.evaluations = 0
+
+    def add(self, point_id: str, source: Any, *alarms: AnalogAlarm) -> None:
+        """Bind alarm definitions to a point (source: a SensorLevel or any object with .point)."""
+        rules = self._by_point.setdefault(point_id, [])
+        for d in alarms:
+            if d.kind not in KINDS:
+                raise ValueError(f"unknown alarm kind {d.kind!r} (expected one of {KINDS})")
+            if d.deadband < 0 or d.on_delay_s < 0 or d.off_delay_s < 0:
+                raise ValueError(f"{d.key}: deadband and delays must be >= 0")
+            rules.append(_Rule(d, source))
+            if self.panel is not None and d.key not in self.panel.alarms:
+                self.panel.add(Alarm(d.key, d.text or f"{point_id} {d.kind}", d.severity, d.latching))
+        self._changed.add(point_id) #first update() evaluates them
+
+    # Change notification
+    def on_publish(self, point: Any, now: float) -> None:
+        """SensorLevel(on_publish=rules.on_publish)"""
+        self._changed.add(point.id)
+
+    def touch(self, point_id: str) -> None:
+        self._changed.add(point_id)
+
+    # Evaluation
+    def evaluate(self, now: float) -> List[Edge]:
+        """Edges for this scan: alarms on changed points, then delay timers that came due."""
+        edges: List[Edge] = []
+        if self._changed:
+            by_point = self._by_point
+            for pid in self._changed:
+                for r in by_point.get(pid, ()):
+                    self._eval(r, now, edges)
+            self._changed.clear()
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            due, _, r = heapq.heappop(timers)
+            if r.due == due:
+                self._eval(r, now, edges)
+        return edges
+
+    def update(self, now: float) -> List[Edge]:
+        """evaluate() and apply the edges to the panel."""
+        edges = self.evaluate(now)
+        if self.panel is not None:
+            self.panel.apply(edges, now)
+        return edges
+
+    def _eval(self, r: _Rule, now: float, edges: List[Edge]) -> None:
+        self.evaluations += 1
+        d = r.d
+        src = r.source
+        p = getattr(src, "point", src)
+        q = p.quality
+        if getattr(q, "value", q) == "GOOD":
+            s = r.sign
+            r.raw = hysteresis_ok(r.raw, s * p.value, s * d.limit, 0.0, d.deadband)
+        delay_ms = 1000.0 * (d.on_delay_s if r.raw else d.off_delay_s)
+        ok, r.since = dwell_ok(r.raw != r.active, r.since, now, delay_ms)
+        due = dwell_due(r.since, delay_ms)
+        if ok or (due is not None and now >= due):
+            r.active = r.raw
+            r.since = r.due = None
+            edges.append((d.key, r.active))
+        elif due != r.due:
+            r.due = due
+            if due is not None:
+                heapq.heappush(self._timers, (due, next(self._tiebreak), r))
+
+    def state(self, key: str) -> Optional[bool]:
+        for rules in self._by_point.values():
+            for r in rules:
+                if r.d.key == key:
+                    return r.active
+        return None
@@ -3,7 +3,7 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, Optional, Tuple
 
 class Severity(Enum):
     INFO = auto()
@@ -11,7 +11,7 @@ class Severity(Enum):
     ALARM = auto()
     TRIP = auto()
 
-@dataclass
+@dataclass(slots=True)
 class Alarm:
     key: str
     text: str
@@ -52,6 +52,8 @@ class Alarm:
 @dataclass
 class AlarmPanel:
     alarms: Dict[str, Alarm] = field(default_factory=dict)
+    #latched alarms that already cleared, waiting for an ack (see apply())
+    _standing: Dict[str, Alarm] = field(default_factory=dict, init=False, repr=False)
 
     def add(self, alarm: Alarm) -> None:
         self.alarms[alarm.key] = alarm
@@ -60,6 +62,26 @@ class AlarmPanel:
         for key, a in self.alarms.items():
             a.update(bool(signals.get(key, False)), t)
 
+    def apply(self, edges: Iterable[Tuple[str, bool]], t: float) -> None:
+        """
+        Edge-only alternative to update(): only alarms whose condition changed are passed in.
+        Latched alarms that cleared are kept aside and unlatch here once acked, as they would on
+        the next update(). last_t is the time of the last edge rather than of the last scan.
+        """
+        alarms, standing = self.alarms, self._standing
+        for key, active in edges:
+            a = alarms[key]
+            a.update(active, t)
+            if a.latched and not a.active:
+                standing[key] = a
+        if standing:
+            for key, a in list(standing.items()):
+                if a.active or not a.latched:
+                    del standing[key]
+                elif a.acked:
+                    a.update(False, t)
+                    del standing[key]
+
     def any_trip(self) -> bool:
         return any(a.active and a.severity == Severity.TRIP for a in self.alarms.values())
     
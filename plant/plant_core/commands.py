@@ -13,7 +13,7 @@ class CommandType(Enum):
     CLOSE = auto()
     ACK = auto()
 
-@dataclass
+@dataclass(slots=True)
 class Command:
     type: CommandType
     t: float        #plant clock seconds
@@ -33,6 +33,12 @@ class CommandQueue:
         self._last_t = cmd.t
         return True
     
+    def debounce_until(self) -> Optional[float]:
+        """Plant time at which the debounce window closes again (None if no window is open)."""
+        if self._last_t is None or self._debounce_s <= 0:
+            return None
+        return self._last_t + self._debounce_s
+
     def pop(self) -> Optional[Command]:
         return self._q.popleft() if self._q else None
 
@@ -0,0 +1,190 @@
+# plant/plant_core/kpi.py
+from __future__ import annotations
+
+from array import array
+from functools import partial
+from typing import Dict, List, Optional, Sequence
+
+from plant.plant_core.state import Lifecycle, MachineState, Transition
+
+#Per-mechanism counters kept in every bucket
+RUN_S, AVAIL_S, OBS_S, STARTS, START_S, STOPS, STOP_S, FAULTS = range(8)
+_NM = 8
+
+_RUNNING = MachineState.RUNNING.value
+_FAULT = MachineState.FAULT.value
+
+class _KpiWindow:
+    """
+    Rolling window of B buckets; each bucket holds _NM counters per mechanism (flat array).
+    Time in state is accrued lazily: on a transition, and for everyone when a bucket closes.
+    """
+    __slots__ = ("length_s", "width_s", "ring", "sums", "cur", "bucket_start", "since")
+
+    def __init__(self, length_s: float, buckets: int) -> None:
+        self.length_s = length_s
+        self.width_s = length_s / buckets
+        self.ring: List[array] = [array("d") for _ in range(buckets)]
+        self.sums = array("d")
+        self.cur = 0
+        self.bucket_start: Optional[float] = None
+        self.since = array("d")     #per mechanism: time accrued up to
+
+    def grow(self, now: float) -> None:
+        zeros = array("d", bytes(8 * _NM))
+        for b in self.ring:
+            b.extend(zeros)
+        self.sums.extend(zeros)
+        self.since.append(now)
+        if self.bucket_start is None:
+            self.bucket_start = now
+
+    def add(self, i: int, metric: int, v: float) -> None:
+        k = i * _NM + metric
+        self.ring[self.cur][k] += v
+        self.sums[k] += v
+
+    def accrue(self, i: int, state: int, t: float) -> None:
+        dt = t - self.since[i]
+        if dt <= 0:
+            return
+        self.since[i] = t
+        self.add(i, OBS_S, dt)
+        if state != _FAULT:
+            self.add(i, AVAIL_S, dt)
+        if state == _RUNNING:
+            self.add(i, RUN_S, dt)
+
+    def advance(self, now: float, states: array) -> None:
+        if self.bucket_start is None:
+            return
+        steps = int((now - self.bucket_start) // self.width_s)
+        if steps <= 0:
+            return
+        n_buckets = len(self.ring)
+        if steps > n_buckets:
+            #Anything older than the window is dropped without being bucketed
+            skip = steps - n_buckets
+            self.bucket_start += skip * self.width_s
+            for i in range(len(self.since)):
+                if self.since[i] < self.bucket_start:
+                    self.since[i] = self.bucket_start
+            steps = n_buckets
+        size = len(self.sums)
+        for _ in range(steps):
+            end = self.bucket_start + self.width_s
+            for i, state in enumerate(states):
+                self.accrue(i, state, end)
+            self.cur = (self.cur + 1) % n_buckets
+            old = self.ring[self.cur]
+            sums = self.sums
+            for k in range(size):
+                sums[k] -= old[k]
+            self.ring[self.cur] = array("d", bytes(8 * size))
+            self.bucket_start = end
+
+class EquipmentKPIs:
+    """
+    Streaming equipment KPIs for many mechanisms, in constant memory per mechanism.
+    - attach(id, lifecycle) adds a transition hook (existing hooks keep running); nothing else
+      is needed per scan.
+    - Per rolling window: uptime, availability (time not in FAULT), mean start time
+      (STARTING -> RUNNING), mean stop time (STOPPING -> STOPPED), fault count and MTBF
+      (running time per fault). Windows are bucketed: the oldest bucket drops out whole.
+    - plant() sums the same counters over every mechanism, so plant-wide figures don't need
+      the event log.
+    """
+
+    def __init__(self, windows_s: Sequence[float] = (3600.0, 86400.0), buckets: int = 12) -> None:
+        self.ids: List[str] = []
+        self.states = array("b")
+        self.state_since = array("d")
+        self._windows = [_KpiWindow(w, buckets) for w in windows_s]
+        self._index: Dict[str, int] = {}
+
+    def attach(self, id: str, lifecycle: Lifecycle, now: Optional[float] = None) -> int:
+        if id in self._index:
+            raise ValueError(f"duplicate mechanism {id!r}")
+        t = lifecycle.entered_at if now is None else now
+        idx = len(self.ids)
+        self._index[id] = idx
+        self.ids.append(id)
+        self.states.append(lifecycle.state.value)
+        self.state_since.append(lifecycle.entered_at)
+        for w in self._windows:
+            w.grow(t)
+        lifecycle.add_hook(partial(self.record, idx))
+        return idx
+
+    def update(self, now: float) -> None:
+        """Roll windows forward. Optional: record() and queries do it too."""
+        for w in self._windows:
+            w.advance(now, self.states)
+
+    def record(self, idx: int, tr: Transition) -> None:
+        t = tr.t
+        self.update(t)
+        prev = self.states[idx]
+        dur = t - self.state_since[idx]
+        frm, to = tr.from_state, tr.to_state
+        for w in self._windows:
+            w.accrue(idx, prev, t)
+            if frm == MachineState.STARTING and to == MachineState.RUNNING:
+                w.add(idx, STARTS, 1.0)
+                w.add(idx, START_S, dur)
+            elif frm == MachineState.STOPPING and to == MachineState.STOPPED:
+                w.add(idx, STOPS, 1.0)
+                w.add(idx, STOP_S, dur)
+            if to == MachineState.FAULT:
+                w.add(idx, FAULTS, 1.0)
+        self.states[idx] = to.value
+        self.state_since[idx] = t
+
+    # Queries
+    def _window(self, window_s: float) -> _KpiWindow:
+        for w in self._windows:
+            if w.length_s == window_s:
+                return w
+        raise KeyError(f"no {window_s}s window configured")
+
+    def _totals(self, w: _KpiWindow, idxs: Sequence[int], now: float) -> List[float]:
+        tot = [0.0] * _NM
+        sums = w.sums
+        for i in idxs:
+            base = i * _NM
+            for m in range(_NM):
+                tot[m] += sums[base + m]
+            #Open interval of the current state, not yet accrued
+            dt = now - w.since[i]
+            if dt > 0:
+                state = self.states[i]
+                tot[OBS_S] += dt
+                if state != _FAULT:
+                    tot[AVAIL_S] += dt
+                if state == _RUNNING:
+                    tot[RUN_S] += dt
+        return tot
+
+    @staticmethod
+    def _report(tot: List[float]) -> Dict[str, float]:
+        obs = tot[OBS_S]
+        return {
+            "uptime": tot[RUN_S] / obs if obs > 0 else 0.0,
+            "availability": tot[AVAIL_S] / obs if obs > 0 else 1.0,
+            "run_s": tot[RUN_S],
+            "starts": tot[STARTS],
+            "mean_start_s": tot[START_S] / tot[STARTS] if tot[STARTS] else 0.0,
+            "stops": tot[STOPS],
+            "mean_stop_s": tot[STOP_S] / tot[STOPS] if tot[STOPS] else 0.0,
+            "faults": tot[FAULTS],
+            "mtbf_s": tot[RUN_S] / tot[FAULTS] if tot[FAULTS] else float("inf"),
+        }
+
+    def kpis(self, id: str, window_s: float, now: float) -> Dict[str, float]:
+        self.update(now)
+        return self._report(self._totals(self._window(window_s), (self._index[id],), now))
+
+    def plant(self, window_s: float, now: float) -> Dict[str, float]:
+        """Same figures over every attached mechanism (uptime/availability are time-weighted)."""
+        self.update(now)
+        return self._report(self._totals(self._window(window_s), range(len(self.ids)), now))
@@ -0,0 +1,167 @@
+# plant/plant_core/staleness.py
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from plant.plant_core.alarms import Alarm, AlarmPanel, Severity
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel (level 0: 256 slots of one tick, then 64-slot levels of
+    coarser granularity). schedule() is O(1); advance() touches only slots that come due,
+    cascading coarse slots down as their time approaches.
+    """
+
+    def __init__(self, tick_s: float, level_bits: Tuple[int, ...] = (8, 6, 6, 6)) -> None:
+        if tick_s <= 0:
+            raise ValueError("tick_s must be > 0")
+        self.tick_s = tick_s
+        self._bits = level_bits
+        self._shift = [sum(level_bits[:i]) for i in range(len(level_bits))]
+        self._levels: List[List[List[Tuple[int, Hashable]]]] = [
+            [[] for _ in range(1 << b)] for b in level_bits
+        ]
+        self._overflow: List[Tuple[int, Hashable]] = []
+        self._span = 1 << sum(level_bits)
+        self.tick = 0   #last processed tick
+
+    def to_tick(self, t: float) -> int:
+        return math.ceil(t / self.tick_s - 1e-9)
+
+    def schedule(self, due_tick: int, key: Hashable) -> None:
+        if due_tick <= self.tick:
+            due_tick = self.tick + 1
+        self._place(due_tick, key)
+
+    def _place(self, due_tick: int, key: Hashable) -> None:
+        #due_tick == self.tick only happens while cascading: level 0's current slot is next
+        delta = due_tick - self.tick
+        if delta >= self._span:
+            self._overflow.append((due_tick, key))
+            return
+        for lvl, bits in enumerate(self._bits):
+            shift = self._shift[lvl]
+            if delta < (1 << (shift + bits)):
+                slot = (due_tick >> shift) & ((1 << bits) - 1)
+                self._levels[lvl][slot].append((due_tick, key))
+                return
+
+    def advance(self, to_tick: int) -> List[Hashable]:
+        """Move to to_tick and return every key that came due on the way."""
+        fired: List[Hashable] = []
+        level0 = self._levels[0]
+        mask0 = len(level0) - 1
+        while self.tick < to_tick:
+            self.tick += 1
+            t = self.tick
+            if t & mask0 == 0:
+                self._cascade(t)
+            slot = level0[t & mask0]
+            if slot:
+                level0[t & mask0] = []
+                for due, key in slot:
+                    if due <= t:
+                        fired.append(key)
+                    else:
+                        self.schedule(due, key)
+        return fired
+
+    def _cascade(self, t: int) -> None:
+        #On each level wrap, redistribute the next coarse slot into finer levels
+        for lvl in range(1, len(self._levels)):
+            shift, bits = self._shift[lvl], self._bits[lvl]
+            slot_idx = (t >> shift) & ((1 << bits) - 1)
+            entries = self._levels[lvl][slot_idx]
+            self._levels[lvl][slot_idx] = []
+            for due, key in entries:
+                self._place(due, key)
+            if slot_idx != 0:
+                break
+        else:
+            pending, self._overflow = self._overflow, []
+            for due, key in pending:
+                self._place(due, key)
+
+class _Watch:
+    __slots__ = ("source", "max_age_s", "alarm_key", "last_seen", "armed", "stale")
+
+    def __init__(self, source: Any, max_age_s: float, alarm_key: Optional[str]) -> None:
+        self.source = source
+        self.max_age_s = max_age_s
+        self.alarm_key = alarm_key
+        self.last_seen = 0.0
+        self.armed = False
+        self.stale = False
+
+class StalenessWatchdog:
+    """
+    Flags tags STALE when no fresh sample arrived within max_age_s, without scanning every tag.
+    - touch(tag, now) records a fresh sample (wire it to a publish hook). It doesn't touch the
+      wheel: when a tag's slot fires, a tag that was refreshed meanwhile is simply re-armed for
+      last_seen + max_age_s. So each tag has at most one wheel entry.
+    - On expiry: point.mark_stale(), on_stale(point, now) for the quality-change publish, and
+      the tag's alarm (if any) goes active on the AlarmPanel. A later touch clears the alarm.
+    """
+
+    def __init__(
+            self,
+            tick_s: float,
+            on_stale: Optional[Callable[[Any, float], None]] = None,
+            alarms: Optional[AlarmPanel] = None,
+    ) -> None:
+        self._wheel = TimingWheel(tick_s)
+        self._watches: Dict[str, _Watch] = {}
+        self._on_stale = on_stale
+        self._alarms = alarms
+        self.expiries = 0
+
+    def watch(self, tag: str, source: Any, max_age_s: float, now: float = 0.0,
+              alarm_key: Optional[str] = None) -> None:
+        """source: the Point, or a callable returning the current Point (e.g. lambda: sensor.point)."""
+        w = _Watch(source, max_age_s, alarm_key)
+        self._watches[tag] = w
+        if alarm_key and self._alarms is not None and alarm_key not in self._alarms.alarms:
+            self._alarms.add(Alarm(alarm_key, f"{tag} stale", severity=Severity.WARN, latching=False))
+        self.touch(tag, now)
+
+    def touch(self, tag: str, now: float) -> None:
+        w = self._watches.get(tag)
+        if w is None:
+            return
+        w.last_seen = now
+        if w.stale:
+            w.stale = False
+            if w.alarm_key and self._alarms is not None:
+                self._alarms.alarms[w.alarm_key].update(False, now)
+        if not w.armed:
+            w.armed = True
+            self._wheel.schedule(self._wheel.to_tick(now + w.max_age_s), tag)
+
+    def is_stale(self, tag: str) -> bool:
+        return self._watches[tag].stale
+
+    def advance(self, now: float) -> List[str]:
+        """Process wheel slots up to now. Returns tags that went stale in this call."""
+        went_stale = []
+        wheel = self._wheel
+        for tag in wheel.advance(int(now / wheel.tick_s + 1e-9)):
+            w = self._watches.get(tag)
+            if w is None or not w.armed:
+                continue
+            due = w.last_seen + w.max_age_s
+            if due > now + 1e-9:
+                wheel.schedule(wheel.to_tick(due), tag) #refreshed since scheduling
+                continue
+            w.armed = False
+            w.stale = True
+            self.expiries += 1
+            went_stale.append(tag)
+            point = w.source() if callable(w.source) else w.source
+            if point is not None:
+                point.mark_stale()
+                if self._on_stale:
+                    self._on_stale(point, now)
+            if w.alarm_key and self._alarms is not None:
+                self._alarms.alarms[w.alarm_key].update(True, now)
+        return went_stale
@@ -1,9 +1,12 @@
 # plant/plant_core/state.py
 
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Optional
+from typing import Callable, Deque, Optional
+
+HISTORY_LEN = 32    #transitions kept per lifecycle
 
 class MachineState(Enum):
     IDLE = auto()
@@ -13,11 +16,12 @@ class MachineState(Enum):
     STOPPED = auto()
     FAULT = auto()
 
-@dataclass
+@dataclass(slots=True)
 class Transition:
     from_state: MachineState
     to_state: MachineState
     reason: str = ""
+    t: float = 0.0      #plant clock seconds
 
 @dataclass
 class Lifecycle:
@@ -26,12 +30,43 @@ class Lifecycle:
     cycles: int = 0     #count of successful RUNNING-STOPPED cycles
     last_reason: str = ""      #human note for observability
 
+    #Bounded ring of recent transitions, oldest first
+    history: Deque[Transition] = field(default_factory=lambda: deque(maxlen=HISTORY_LEN), repr=False, compare=False)
+    #Called with every transition; use add_hook() to add one without replacing what is there
+    on_transition: Optional[Callable[[Transition], None]] = field(default=None, repr=False, compare=False)
+
     def _enter(self, to_state: MachineState, t: float, reason: str = "") -> Transition:
-        tr = Transition(self.state, to_state, reason)
+        tr = Transition(self.state, to_state, reason, t)
         self.state = to_state
         self.entered_at = t
         self.last_reason = reason
+        self.history.append(tr)
+        if self.on_transition:
+            self.on_transition(tr)
         return tr
+
+    #Same as enter_at
+    @property
+    def entered_at(self) -> float:
+        return self.enter_at
+
+    @entered_at.setter
+    def entered_at(self, t: float) -> None:
+        self.enter_at = t
+
+    def add_hook(self, hook: Callable[[Transition], None]) -> None:
+        """Call hook on every transition, after any hook already installed."""
+        prev = self.on_transition
+        if prev is None:
+            self.on_transition = hook
+        else:
+            def chained(tr: Transition) -> None:
+                prev(tr)
+                hook(tr)
+            self.on_transition = chained
+
+    def time_in_state(self, now: float) -> float:
+        return now - self.entered_at
     
     #Intent: called when operator/HMI issues a start
     def request_start(self, t: float, reason: str = "") -> Optional[Transition]:
@@ -0,0 +1,151 @@
+# runtime/acquisition.py
+from __future__ import annotations
+
+import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from core.point import StaleRead
+
+#read_block(addresses) -> one value per address, in the same order
+BlockReader = Callable[[Sequence[str]], Sequence[float]]
+
+_FRESH, _STALE, _ERROR = 0, 1, 2
+
+class _Source:
+    __slots__ = (
+        "name", "read_block", "blocking", "addresses", "values", "status", "error",
+        "pending", "reads", "timeouts", "errors", "last_ms",
+    )
+
+    def __init__(self, name: str, read_block: BlockReader, blocking: bool) -> None:
+        self.name = name
+        self.read_block = read_block
+        self.blocking = blocking
+        self.addresses: List[str] = []
+        self.values = array("d")
+        self.status = array("b")
+        self.error: Optional[BaseException] = None
+        self.pending: Optional[Future] = None   #a read still running past its deadline
+        self.reads = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.last_ms = 0.0
+
+    def _apply(self, values: Sequence[float]) -> None:
+        if len(values) != len(self.addresses):
+            raise ValueError(f"{self.name}: block read returned {len(values)} values for {len(self.addresses)} addresses")
+        vals, status = self.values, self.status
+        for i, v in enumerate(values):
+            vals[i] = v
+            status[i] = _FRESH
+
+    def _mark(self, code: int, error: Optional[BaseException] = None) -> None:
+        self.error = error
+        status = self.status
+        for i in range(len(status)):
+            status[i] = code
+
+class InputHandle:
+    """read_fn for one address: fresh value, StaleRead after a missed deadline, or the read error."""
+    __slots__ = ("_src", "_idx")
+
+    def __init__(self, src: _Source, idx: int) -> None:
+        self._src = src
+        self._idx = idx
+
+    def __call__(self) -> float:
+        src = self._src
+        code = src.status[self._idx]
+        if code == _FRESH:
+            return src.values[self._idx]
+        if code == _STALE:
+            raise StaleRead(f"{src.name} missed the scan deadline")
+        raise IOError(f"{src.name} block read failed: {src.error!r}")
+
+class BulkInputStage:
+    """
+    Scan input stage: one block read per source instead of one read_fn call per sensor.
+    - Sensors bind() to (source, address) and get a handle to use as read_fn.
+    - Blocking sources run on a bounded thread pool; scan() waits at most deadline_s for them.
+    - A source that misses the deadline leaves its sensors STALE on their last value; while its
+      read is still hung it isn't resubmitted (so a dead gateway can't eat the pool).
+    - Non-blocking sources (in-process simulators) are read inline.
+    """
+
+    def __init__(self, deadline_s: float = 0.05, max_workers: int = 4) -> None:
+        if deadline_s <= 0:
+            raise ValueError("deadline_s must be > 0")
+        self.deadline_s = deadline_s
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-input")
+        self._sources: Dict[str, _Source] = {}
+
+    def add_source(self, name: str, read_block: BlockReader, blocking: bool = True) -> None:
+        if name in self._sources:
+            raise ValueError(f"duplicate source {name!r}")
+        self._sources[name] = _Source(name, read_block, blocking)
+
+    def bind(self, source: str, address: str) -> InputHandle:
+        src = self._sources[source]
+        src.addresses.append(address)
+        src.values.append(0.0)
+        src.status.append(_STALE) #nothing read yet
+        return InputHandle(src, len(src.addresses) - 1)
+
+    def scan(self) -> None:
+        """Refresh every source, bounded by deadline_s. Call before the sensors' update()."""
+        start = time.monotonic()
+        futures: Dict[Future, _Source] = {}
+        for src in self._sources.values():
+            if not src.addresses:
+                continue
+            if not src.blocking:
+                t0 = time.perf_counter()
+                try:
+                    src._apply(src.read_block(tuple(src.addresses)))
+                except Exception as e:
+                    src.errors += 1
+                    src._mark(_ERROR, e)
+                src.reads += 1
+                src.last_ms = (time.perf_counter() - t0) * 1000.0
+                continue
+            if src.pending is not None:
+                if not src.pending.done():
+                    src.timeouts += 1
+                    src._mark(_STALE)
+                    continue
+                src.pending = None #late result is discarded; only on-time data is used
+            futures[self._pool.submit(src.read_block, tuple(src.addresses))] = src
+
+        if futures:
+            remaining = self.deadline_s - (time.monotonic() - start)
+            done, not_done = wait(futures, timeout=max(0.0, remaining))
+            elapsed_ms = (time.monotonic() - start) * 1000.0
+            for fut in done:
+                src = futures[fut]
+                src.reads += 1
+                src.last_ms = elapsed_ms
+                try:
+                    src._apply(fut.result())
+                except Exception as e:
+                    src.errors += 1
+                    src._mark(_ERROR, e)
+            for fut in not_done:
+                src = futures[fut]
+                src.timeouts += 1
+                src.pending = fut
+                src.last_ms = elapsed_ms
+                src._mark(_STALE)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            s.name: {
+                "points": len(s.addresses), "reads": s.reads, "timeouts": s.timeouts,
+                "errors": s.errors, "last_ms": s.last_ms, "hung": s.pending is not None,
+            }
+            for s in self._sources.values()
+        }
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,302 @@
+# runtime/checkpoint.py
+"""
+Incremental checkpoints of simulation state and warm restart.
+
+Files:
+    <path>      base snapshot, JSON {"seq", "t", "state": {key: state}} (replaced atomically)
+    <path>.log  JSON lines {"seq", "t", "d": {key: state}} with only the entries that changed
+The writer thread folds log records into its own copy of the state and compacts (new base,
+empty log) every compact_after records. Loading reads the base, then replays newer log records;
+a torn last line from a crash is ignored, and a new Checkpointer cuts it off before appending.
+"""
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from core.commands import Command as DeviceCommand, CommandKind
+from core.point import Quality
+from core.point_types import AnalogPoint
+from core.policies import LatchedTrip
+from devices.base import BaseActuator, Mode
+from devices.sensors.sensor_level import SensorLevel
+from plant.plant_core.alarms import Alarm, AlarmPanel
+from plant.plant_core.commands import Command, CommandQueue, CommandType
+from plant.plant_core.state import Lifecycle, MachineState
+
+#get() -> JSON-able state as lists of scalars (lists, so it compares equal after a JSON round trip)
+Getter = Callable[[], Any]
+Setter = Callable[[Any], None]
+
+# State adapters for the built-in stateful objects
+
+def _alarm(a: Alarm) -> Tuple[Getter, Setter]:
+    def get():
+        return [a.active, a.latched, a.acked, a.first_t, a.last_t]
+    def set(s):
+        a.active, a.latched, a.acked, a.first_t, a.last_t = s
+    return get, set
+
+def _lifecycle(lc: Lifecycle) -> Tuple[Getter, Setter]:
+    def get():
+        return [lc.state.name, lc.entered_at, lc.cycles, lc.last_reason]
+    def set(s):
+        lc.state, lc.entered_at, lc.cycles, lc.last_reason = MachineState[s[0]], s[1], s[2], s[3]
+    return get, set
+
+def _latched_trip(lt: LatchedTrip) -> Tuple[Getter, Setter]:
+    def get():
+        return [lt._tripped]
+    def set(s):
+        lt._tripped = s[0]
+    return get, set
+
+def _command_queue(q: CommandQueue) -> Tuple[Getter, Setter]:
+    def get():
+        return [q._last_t, [[c.type.name, c.t, c.source, c.note] for c in q._q]]
+    def set(s):
+        q._last_t = s[0]
+        q.clear()
+        for name, t, source, note in s[1]:
+            q._q.append(Command(CommandType[name], t, source, note))
+    return get, set
+
+def _sensor(sen: SensorLevel) -> Tuple[Getter, Setter]:
+    def get():
+        p = sen.point
+        return [p.value, p.ts_mono, p.quality.value, p._last_pub_mono]
+    def set(s):
+        p = AnalogPoint(id=sen.id, value=s[0], ts_mono=s[1], quality=Quality(s[2]), eu=sen.eu, cov=sen.cov)
+        p._last_pub_mono = s[3]
+        sen.point = sen._last_pub = sen._points[0] = p
+    return get, set
+
+def _actuator(act: BaseActuator) -> Tuple[Getter, Setter]:
+    def get():
+        c = act._last_cmd
+        cmd = None if c is None else [c.target, c.kind.value, c.value, c.source, c.ts_mono, c.request_id]
+        return [act.mode.value, act.state, act._entered_at, cmd]
+    def set(s):
+        act.mode, act.state, act._entered_at = Mode(s[0]), s[1], s[2]
+        c = s[3]
+        act._last_cmd = None if c is None else DeviceCommand(c[0], CommandKind(c[1]), c[2], c[3], c[4], c[5])
+    return get, set
+
+_ADAPTERS: List[Tuple[type, Callable[[Any], Tuple[Getter, Setter]]]] = [
+    (Alarm, _alarm),
+    (Lifecycle, _lifecycle),
+    (LatchedTrip, _latched_trip),
+    (CommandQueue, _command_queue),
+    (SensorLevel, _sensor),
+    (BaseActuator, _actuator),
+]
+
+class Checkpointer:
+    """
+    Periodic incremental checkpoints from a consistent end-of-scan snapshot.
+    - track(key, obj, poll=...) registers an object (Alarm/AlarmPanel, Lifecycle, LatchedTrip,
+      CommandQueue, SensorLevel, actuators); track_state(key, get, set) covers anything else,
+      e.g. dwell timers held by a mechanism.
+    - Every entry picks how changes are found: poll=True entries are compared with their last
+      checkpointed state at every capture (cost grows with the number of entries); poll=False
+      entries are only read after mark_dirty(key), so capture cost follows activity. Large
+      plants should poll only what has no natural place to call mark_dirty().
+    - capture(now) runs on the scan thread between scans and only builds small state lists;
+      serialization and file IO happen on the writer thread, so the scan never waits on disk.
+    - restore() applies the last checkpoint to the tracked objects (warm restart).
+    """
+
+    def __init__(self, path: str, interval_s: float = 5.0, compact_after: int = 1000, fsync: bool = False) -> None:
+        self.path = path
+        self.interval_s = interval_s
+        self.compact_after = compact_after
+        self.fsync = fsync
+        self._entries: Dict[str, Tuple[Getter, Setter, bool]] = {}
+        self._last: Dict[str, Any] = {}
+        self._dirty: Set[str] = set()
+        self._polled: List[str] = []
+        self._next_t: Optional[float] = None
+        self._saved = load(path)
+        _trim_torn_tail(path + ".log")
+        self._seq = self._saved["seq"] if self._saved else 0
+        self.captures = 0
+        self.entries_written = 0
+
+        self._q: "queue.Queue[Optional[Tuple[int, float, Dict[str, Any]]]]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._writer, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    # Registration
+    def track(self, key: str, obj: Any, *, poll: bool) -> None:
+        if isinstance(obj, AlarmPanel):
+            for akey, alarm in obj.alarms.items():
+                self.track(f"{key}/{akey}", alarm, poll=poll)
+            return
+        for cls, adapter in _ADAPTERS:
+            if isinstance(obj, cls):
+                get, set = adapter(obj)
+                self.track_state(key, get, set, poll=poll)
+                return
+        raise TypeError(f"no checkpoint adapter for {type(obj).__name__}; use track_state()")
+
+    def track_state(self, key: str, get: Getter, set: Setter, *, poll: bool) -> None:
+        if key in self._entries:
+            raise ValueError(f"duplicate checkpoint key {key!r}")
+        self._entries[key] = (get, set, poll)
+        if poll:
+            self._polled.append(key)
+        self._dirty.add(key) #first capture writes everything
+
+    def mark_dirty(self, key: str) -> None:
+        self._dirty.add(key)
+
+    # Capture (scan thread)
+    def maybe_capture(self, now: float) -> bool:
+        """capture(now) if interval_s has passed since the last one. Call at end of scan."""
+        if self._next_t is not None and now < self._next_t:
+            return False
+        self.capture(now)
+        return True
+
+    def capture(self, now: float) -> int:
+        """Queue the entries that changed since the last checkpoint. Returns how many."""
+        if self._error is not None:
+            raise RuntimeError("checkpoint writer failed") from self._error
+        self._next_t = now + self.interval_s
+        delta: Dict[str, Any] = {}
+        last, entries, dirty = self._last, self._entries, self._dirty
+        for key in self._polled:
+            s = entries[key][0]()
+            if key not in last or last[key] != s:
+                last[key] = delta[key] = s
+        for key in dirty:
+            if key not in delta and key in entries:
+                s = entries[key][0]()
+                if key not in last or last[key] != s:
+                    last[key] = delta[key] = s
+        dirty.clear()
+        self.captures += 1
+        if delta:
+            self._seq += 1
+            self.entries_written += len(delta)
+            self._q.put((self._seq, now, delta))
+        return len(delta)
+
+    # Writer thread
+    def _writer(self) -> None:
+        state: Dict[str, Any] = dict(self._saved["state"]) if self._saved else {}
+        pending = 0
+        log = open(self.path + ".log", "a", encoding="utf-8")
+        try:
+            while True:
+                item = self._q.get()
+                try:
+                    if item is None:
+                        return
+                    seq, t, delta = item
+                    log.write(json.dumps({"seq": seq, "t": t, "d": delta}, separators=(",", ":")) + "\n")
+                    log.flush()
+                    if self.fsync:
+                        os.fsync(log.fileno())
+                    state.update(delta)
+                    pending += 1
+                    if pending >= self.compact_after:
+                        _write_base(self.path, seq, t, state, self.fsync)
+                        log.close()
+                        log = open(self.path + ".log", "w", encoding="utf-8")
+                        pending = 0
+                except BaseException as e:
+                    self._error = e
+                    return
+                finally:
+                    self._q.task_done()
+        finally:
+            log.close()
+
+    def flush(self) -> None:
+        """Block until every queued checkpoint is on disk."""
+        self._q.join()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._q.put(None)
+            self._thread.join()
+
+    # Warm restart
+    def restore(self) -> Optional[float]:
+        """
+        Apply the last checkpoint to tracked objects. Returns the plant time it was taken at
+        (None without a checkpoint). Keys no longer tracked are ignored.
+        """
+        snap = self._saved
+        if snap is None:
+            return None
+        for key, s in snap["state"].items():
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1](s)
+                self._last[key] = s
+                self._dirty.discard(key)
+        return snap["t"]
+
+def _write_base(path: str, seq: int, t: float, state: Dict[str, Any], fsync: bool) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"seq": seq, "t": t, "state": state}, f, separators=(",", ":"))
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def _trim_torn_tail(log_path: str) -> None:
+    """Cut a log back to its last complete line, so new records don't join a torn one."""
+    if not os.path.exists(log_path):
+        return
+    with open(log_path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        #Walk back to the previous newline (torn lines are at most one record long)
+        pos = size
+        while pos > 0:
+            step = min(65536, pos)
+            f.seek(pos - step)
+            nl = f.read(step).rfind(b"\n")
+            if nl >= 0:
+                f.truncate(pos - step + nl + 1)
+                return
+            pos -= step
+        f.truncate(0)
+
+def load(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Base snapshot plus newer log records: {"seq", "t", "state"}, or None if nothing is saved.
+    An unterminated last line (torn write) is ignored; any other unreadable line is skipped,
+    so the records after it still apply.
+    """
+    snap: Optional[Dict[str, Any]] = None
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            snap = json.load(f)
+    log_path = path + ".log"
+    if os.path.exists(log_path):
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue #torn write at crash time (or a line damaged by one)
+                if snap is None:
+                    snap = {"seq": 0, "t": 0.0, "state": {}}
+                if rec["seq"] <= snap["seq"]:
+                    continue #already folded into the base
+                snap["state"].update(rec["d"])
+                snap["seq"], snap["t"] = rec["seq"], rec["t"]
+    return snap
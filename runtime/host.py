@@ -0,0 +1,175 @@
+# runtime/host.py
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.clock import SimClock
+
+ScanFn = Callable[[SimClock], None]
+
+class Tenant:
+    """One plant instance: its own virtual clock plus scheduling/accounting counters."""
+    __slots__ = (
+        "id", "scan_fn", "clock", "period_s", "origin", "tick", "next_due",
+        "cpu_s", "scans", "late_scans", "missed_ticks", "max_lateness_s", "deferred",
+    )
+
+    def __init__(self, id: str, scan_fn: ScanFn, period_s: float, first_due: float) -> None:
+        self.id = id
+        self.scan_fn = scan_fn
+        self.clock = SimClock(period_s)
+        self.period_s = period_s
+        self.origin = first_due     #deadlines are origin + tick * period_s (no float drift)
+        self.tick = 0
+        self.next_due = first_due
+        self.cpu_s = 0.0            #CPU spent inside scan_fn
+        self.scans = 0
+        self.late_scans = 0         #scans started after their deadline
+        self.missed_ticks = 0       #whole periods skipped because the host fell behind
+        self.max_lateness_s = 0.0
+        self.deferred = False       #left over by the last pass's budget: runs first next pass
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "id": self.id,
+            "scans": self.scans,
+            "cpu_s": self.cpu_s,
+            "late_scans": self.late_scans,
+            "missed_ticks": self.missed_ticks,
+            "max_lateness_s": self.max_lateness_s,
+        }
+
+class TenantHost:
+    """
+    Multiplexes many independent plants on one thread.
+    - Each tenant has its own SimClock; the host decides when it scans.
+    - Due tenants run least-CPU-first, so a heavy tenant can't starve light ones.
+    - max_scans_per_pass caps work per pass; tenants left over keep their deadline and run
+      first next pass (ahead of everything else due, so the budget can't starve a heavy one). Late starts and skipped periods are counted per tenant
+      (overrun policy matches RealTimeClock: skip to the next tick, don't catch up).
+    """
+
+    def __init__(self, max_scans_per_pass: Optional[int] = None, timer: Callable[[], float] = time.monotonic) -> None:
+        self.max_scans_per_pass = max_scans_per_pass
+        self._timer = timer
+        self._tenants: Dict[str, Tenant] = {}
+        self._heap: List[Tuple[float, int, Tenant]] = []
+        self._seq = 0
+        self._epoch: Optional[float] = None  #wall time of host t=0 (realtime mode)
+        self._virtual_t = 0.0               #host time reached so far (virtual mode)
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def _push(self, tenant: Tenant) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (tenant.next_due, self._seq, tenant))
+
+    # Tenants
+    def add(self, tenant_id: str, scan_fn: ScanFn, period_s: float, offset_s: float = 0.0) -> Tenant:
+        """Register a plant. offset_s staggers first deadlines so tenants don't all fire together."""
+        if tenant_id in self._tenants:
+            raise ValueError(f"tenant {tenant_id!r} already exists")
+        if period_s <= 0:
+            raise ValueError("period_s must be > 0")
+        tenant = Tenant(tenant_id, scan_fn, period_s, offset_s)
+        self._tenants[tenant_id] = tenant
+        self._push(tenant)
+        return tenant
+
+    def remove(self, tenant_id: str) -> None:
+        #Lazy removal: the heap entry is dropped when it surfaces
+        self._tenants.pop(tenant_id)
+
+    def tenant(self, tenant_id: str) -> Tenant:
+        return self._tenants[tenant_id]
+
+    def next_due(self) -> Optional[float]:
+        while self._heap and self._tenants.get(self._heap[0][2].id) is not self._heap[0][2]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    # Scheduling
+    def run_due(self, now: float) -> int:
+        """Run one pass over every tenant due at host time `now`. Returns scans executed."""
+        due: List[Tenant] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, tenant = heapq.heappop(heap)
+            if self._tenants.get(tenant.id) is tenant:
+                due.append(tenant)
+        if not due:
+            return 0
+
+        due.sort(key=lambda tn: (not tn.deferred, tn.cpu_s))
+        budget = self.max_scans_per_pass
+        run, deferred = (due, []) if budget is None else (due[:budget], due[budget:])
+
+        perf = time.perf_counter
+        for tenant in run:
+            tenant.deferred = False
+            lateness = now - tenant.next_due
+            if lateness > 0:
+                tenant.late_scans += 1
+                if lateness > tenant.max_lateness_s:
+                    tenant.max_lateness_s = lateness
+
+            t0 = perf()
+            tenant.scan_fn(tenant.clock)
+            tenant.cpu_s += perf() - t0
+            tenant.scans += 1
+            tenant.clock.sleep_until_next_scan()
+
+            tenant.tick += 1
+            tenant.next_due = tenant.origin + tenant.tick * tenant.period_s
+            if tenant.next_due <= now:
+                missed = int((now - tenant.next_due) // tenant.period_s) + 1
+                tenant.missed_ticks += missed
+                tenant.tick += missed
+                tenant.next_due = tenant.origin + tenant.tick * tenant.period_s
+                tenant.clock.tick(missed) #virtual time keeps pace with host time
+            self._push(tenant)
+
+        for tenant in deferred:
+            tenant.deferred = True
+            self._push(tenant)
+        return len(run)
+
+    def run_for(self, duration_s: float, realtime: bool = True) -> int:
+        """
+        Drive the host for duration_s of host time.
+        realtime=False jumps host time straight to the next deadline (soak/training farms).
+        """
+        if realtime:
+            start = self._timer()
+            if self._epoch is None:
+                self._epoch = start
+            end = start + duration_s
+            total = 0
+            while True:
+                now = self._timer()
+                if now >= end:
+                    return total
+                total += self.run_due(now - self._epoch)
+                nxt = self.next_due()
+                wake = end if nxt is None else min(nxt + self._epoch, end)
+                wait = wake - self._timer()
+                if wait > 0:
+                    time.sleep(wait)
+        else:
+            now = self._virtual_t
+            end = now + duration_s
+            total = 0
+            while True:
+                nxt = self.next_due()
+                if nxt is None or nxt >= end:
+                    self._virtual_t = end
+                    return total
+                now = max(now, nxt)
+                total += self.run_due(now)
+
+    # Accounting
+    def stats(self) -> List[Dict[str, float]]:
+        return [tn.stats() for tn in self._tenants.values()]
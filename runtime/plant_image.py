@@ -0,0 +1,341 @@
+# runtime/plant_image.py
+"""
+Plant images: a declarative plant config validated and compiled once into a binary file,
+so later starts skip parsing, validation and rule compilation.
+
+Config (JSON):
+    {"devices": [
+        {"id": "LT_1", "type": "level_sensor", "eu": "m",
+         "cov": {"deadband_abs": 0.05, "deadband_pct": null, "min_interval_s": 0.5}},
+        {"id": "P_1", "type": "onoff_pump", "mode": "REMOTE",
+         "permissives": [{"tag": "LT_1", "op": ">=", "value": 1.0}],
+         "interlocks":  [{"tag": "LT_1", "op": "<",  "value": 9.8}]}],
+     "alarms": [
+        {"key": "LT_1:HI", "text": "Level high", "severity": "WARN", "latching": false,
+         "tag": "LT_1", "op": ">", "value": 9.0}]}
+
+Image layout (little endian):
+    header  : b"OTPI" | u16 format version | 32-byte sha256 of the canonical config | u32 sections
+    table   : per section 8s name, 1s array typecode, 3x pad, u64 byte offset, u64 item count
+    payload : each section's array bytes, 8-byte aligned
+Strings live in one utf-8 blob plus an offsets array. load_or_compile() caches images by a hash
+of the config file, so a changed config (or image format) compiles a new image and an unchanged
+one is just mapped.
+"""
+from __future__ import annotations
+
+import gc
+import hashlib
+import json
+import math
+import mmap
+import operator
+import os
+import struct
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.point import CovRule
+from core.policy_points import is_good
+from devices.actuators.pump_actuator import OnOffPump
+from devices.base import Mode
+from devices.sensors.sensor_level import SensorLevel
+from plant.plant_core.alarms import Alarm, AlarmPanel, Severity
+
+MAGIC = b"OTPI"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sH32sI")
+_SECTION = struct.Struct("<8s1s3xQQ")
+
+DEVICE_TYPES = {"level_sensor": 1, "onoff_pump": 2}
+OPS = (">=", ">", "<=", "<")
+_OP_FNS = (operator.ge, operator.gt, operator.le, operator.lt)
+_MODES = tuple(Mode)
+_SEVERITIES = tuple(Severity)
+RULE_PERMISSIVE, RULE_INTERLOCK = 0, 1
+_REQUIRED = ("str_off", "str_blob", "dev_id", "dev_type", "dev_eu", "dev_mode", "db_abs", "db_pct",
+             "min_int", "r_dev", "r_kind", "r_tag", "r_op", "r_val", "a_key", "a_text", "a_sev",
+             "a_latch", "a_tag", "a_op", "a_val")
+
+class ConfigError(ValueError):
+    """The plant config is invalid; the message names the offending entry."""
+
+def config_hash(config: Dict[str, Any]) -> bytes:
+    """sha256 of the canonical JSON form plus the image format version."""
+    canon = json.dumps(config, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(f"{VERSION}:".encode() + canon.encode("utf-8")).digest()
+
+# Compile
+
+class _Strings:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.items: List[str] = []
+
+    def __call__(self, s: str) -> int:
+        i = self.ids.get(s)
+        if i is None:
+            i = self.ids[s] = len(self.items)
+            self.items.append(s)
+        return i
+
+def _num(v: Any, what: str, required: bool = False) -> float:
+    """A finite number; an optional setting left out is stored as NaN."""
+    if v is None:
+        if required:
+            raise ConfigError(f"{what} is missing")
+        return math.nan
+    if isinstance(v, bool) or not isinstance(v, (int, float)):
+        raise ConfigError(f"{what} must be a number, got {v!r}")
+    if not math.isfinite(v):
+        raise ConfigError(f"{what} must be finite, got {v!r}")
+    return float(v)
+
+def _obj(v: Any, what: str) -> Dict[str, Any]:
+    if not isinstance(v, dict):
+        raise ConfigError(f"{what} must be an object, got {type(v).__name__}")
+    return v
+
+def _str(v: Any, what: str) -> str:
+    if not isinstance(v, str):
+        raise ConfigError(f"{what} must be a string, got {type(v).__name__}")
+    return v
+
+def _list(v: Any, what: str) -> List[Any]:
+    if v is None:
+        return []
+    if not isinstance(v, list):
+        raise ConfigError(f"{what} must be a list, got {type(v).__name__}")
+    return v
+
+def _reject_constant(name: str) -> Any:
+    raise ConfigError(f"{name} is not allowed in a plant config (numbers must be finite)")
+
+def compile_config(config: Dict[str, Any]) -> bytes:
+    """Validate a plant config and return its image bytes."""
+    strings = _Strings()
+    dev_id, dev_type, dev_eu, dev_mode = array("i"), array("b"), array("i"), array("b")
+    db_abs, db_pct, min_int = array("d"), array("d"), array("d")
+    r_dev, r_kind, r_tag, r_op, r_val = array("i"), array("b"), array("i"), array("b"), array("d")
+    a_key, a_text, a_sev, a_latch, a_tag, a_op, a_val = (
+        array("i"), array("i"), array("b"), array("b"), array("i"), array("b"), array("d"))
+
+    devices = _obj(config, "config").get("devices")
+    if not isinstance(devices, list) or not devices:
+        raise ConfigError("config needs a non-empty 'devices' list")
+    index: Dict[str, Tuple[int, int]] = {}
+    for n, d in enumerate(devices):
+        did = _obj(d, f"devices[{n}]").get("id")
+        if not isinstance(did, str) or not did:
+            raise ConfigError(f"devices[{n}]: missing id")
+        if did in index:
+            raise ConfigError(f"devices[{n}]: duplicate id {did!r}")
+        t = DEVICE_TYPES.get(d.get("type"))
+        if t is None:
+            raise ConfigError(f"{did}: unknown type {d.get('type')!r}")
+        index[did] = (len(dev_id), t)
+        dev_id.append(strings(did))
+        dev_type.append(t)
+
+    def rule_target(owner: str, r: Any) -> Tuple[int, int, float]:
+        tag, op = _obj(r, f"{owner}: rule").get("tag"), r.get("op")
+        if tag not in index or index[tag][1] != DEVICE_TYPES["level_sensor"]:
+            raise ConfigError(f"{owner}: rule tag {tag!r} is not a configured sensor")
+        if op not in OPS:
+            raise ConfigError(f"{owner}: unknown op {op!r} (expected one of {OPS})")
+        return index[tag][0], OPS.index(op), _num(r.get("value"), f"{owner}: rule value", required=True)
+
+    for d in devices:
+        did = d["id"]
+        idx, t = index[did]
+        cov = _obj(d.get("cov") or {}, f"{did}: cov")
+        dev_eu.append(strings(_str(d.get("eu", "m"), f"{did}: eu")))
+        try:
+            dev_mode.append(_MODES.index(Mode(d.get("mode", "REMOTE"))))
+        except ValueError:
+            raise ConfigError(f"{did}: unknown mode {d.get('mode')!r}") from None
+        db_abs.append(_num(cov.get("deadband_abs"), f"{did}: deadband_abs"))
+        db_pct.append(_num(cov.get("deadband_pct"), f"{did}: deadband_pct"))
+        min_int.append(_num(cov.get("min_interval_s"), f"{did}: min_interval_s"))
+        for kind, key in ((RULE_PERMISSIVE, "permissives"), (RULE_INTERLOCK, "interlocks")):
+            rules = _list(d.get(key), f"{did}: {key}")
+            if rules and t != DEVICE_TYPES["onoff_pump"]:
+                raise ConfigError(f"{did}: {key} only apply to actuators")
+            for r in rules:
+                tag, op, v = rule_target(did, r)
+                r_dev.append(idx); r_kind.append(kind); r_tag.append(tag); r_op.append(op); r_val.append(v)
+
+    keys = set()
+    for n, a in enumerate(_list(config.get("alarms"), "alarms")):
+        key = _obj(a, f"alarms[{n}]").get("key")
+        if not isinstance(key, str) or not key or key in keys:
+            raise ConfigError(f"alarms[{n}]: missing or duplicate key {key!r}")
+        keys.add(key)
+        try:
+            sev = _SEVERITIES.index(Severity[a.get("severity", "ALARM")])
+        except KeyError:
+            raise ConfigError(f"{key}: unknown severity {a.get('severity')!r}") from None
+        latching = a.get("latching", True)
+        if not isinstance(latching, bool):
+            raise ConfigError(f"{key}: latching must be true or false, got {latching!r}")
+        tag, op, v = rule_target(key, a)
+        a_key.append(strings(key)); a_text.append(strings(_str(a.get("text", key), f"{key}: text"))); a_sev.append(sev)
+        a_latch.append(1 if latching else 0); a_tag.append(tag); a_op.append(op); a_val.append(v)
+
+    blob = bytearray()
+    offsets = array("q", [0])
+    for s in strings.items:
+        blob += s.encode("utf-8")
+        offsets.append(len(blob))
+
+    sections = {
+        "str_off": offsets, "str_blob": array("B", bytes(blob)),
+        "dev_id": dev_id, "dev_type": dev_type, "dev_eu": dev_eu, "dev_mode": dev_mode,
+        "db_abs": db_abs, "db_pct": db_pct, "min_int": min_int,
+        "r_dev": r_dev, "r_kind": r_kind, "r_tag": r_tag, "r_op": r_op, "r_val": r_val,
+        "a_key": a_key, "a_text": a_text, "a_sev": a_sev, "a_latch": a_latch,
+        "a_tag": a_tag, "a_op": a_op, "a_val": a_val,
+    }
+    head = _HEADER.size + _SECTION.size * len(sections)
+    table, payload = bytearray(), bytearray()
+    for name, arr in sections.items():
+        payload += bytes(-(head + len(payload)) % 8)
+        table += _SECTION.pack(name.encode(), arr.typecode.encode(), head + len(payload), len(arr))
+        payload += arr.tobytes()
+    return _HEADER.pack(MAGIC, VERSION, config_hash(config), len(sections)) + bytes(table) + bytes(payload)
+
+# Load
+
+class PlantImage:
+    """
+    A compiled plant. Numeric tables are memoryviews straight onto the image bytes (no copy
+    when opened from a file); strings are decoded once.
+    """
+
+    def __init__(self, data: Any) -> None:
+        self._data = data
+        buf = memoryview(data)
+        magic, version, digest, n = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a plant image")
+        if version != VERSION:
+            raise ValueError(f"plant image format {version}, expected {VERSION}")
+        self.content_hash = digest.hex()
+        self.sections: Dict[str, memoryview] = {}
+        for i in range(n):
+            name, code, off, count = _SECTION.unpack_from(buf, _HEADER.size + i * _SECTION.size)
+            code = code.decode()
+            size = array(code).itemsize
+            if off + count * size > len(buf):
+                raise ValueError("truncated plant image")
+            self.sections[name.rstrip(b"\0").decode()] = buf[off:off + count * size].cast(code)
+        missing = set(_REQUIRED) - self.sections.keys()
+        if missing:
+            raise ValueError(f"plant image is missing sections {sorted(missing)}")
+        off, blob = self.sections["str_off"], self.sections["str_blob"].tobytes()
+        self.strings = [blob[off[i]:off[i + 1]].decode("utf-8") for i in range(len(off) - 1)]
+        self.device_ids = [self.strings[i] for i in self.sections["dev_id"]]
+
+    def __getitem__(self, name: str) -> memoryview:
+        return self.sections[name]
+
+    def __len__(self) -> int:
+        return len(self.device_ids)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PlantImage":
+        return cls(compile_config(config))
+
+    @classmethod
+    def open(cls, path: str) -> "PlantImage":
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def instantiate(self, read_fns: Optional[Dict[str, Callable[[], float]]] = None) -> "LoadedPlant":
+        """Build the device objects. read_fns maps sensor id -> read_fn (default reads 0.0)."""
+        #Tens of thousands of long-lived objects: cyclic GC passes here are pure overhead
+        was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._instantiate(read_fns or {})
+        finally:
+            if was_enabled:
+                gc.enable()
+
+    def _instantiate(self, read_fns: Dict[str, Callable[[], float]]) -> "LoadedPlant":
+        s = self.sections
+        ids, strings = self.device_ids, self.strings
+        devices: List[Any] = []
+        for i, did in enumerate(ids):
+            mode = _MODES[s["dev_mode"][i]]
+            if s["dev_type"][i] == DEVICE_TYPES["level_sensor"]:
+                a, p, m = s["db_abs"][i], s["db_pct"][i], s["min_int"][i]
+                cov = CovRule(
+                    deadband_abs=0.01 if a != a else a,
+                    deadband_pct=None if p != p else p,
+                    min_interval_s=0.5 if m != m else m,
+                )
+                kw = {"read_fn": read_fns[did]} if did in read_fns else {}
+                devices.append(SensorLevel(id=did, eu=strings[s["dev_eu"][i]], cov=cov, mode=mode, **kw))
+            else:
+                devices.append(OnOffPump(id=did, mode=mode))
+
+        for dev, kind, tag, op, v in zip(s["r_dev"], s["r_kind"], s["r_tag"], s["r_op"], s["r_val"]):
+            check = _rule(devices[tag], op, v)
+            if kind == RULE_PERMISSIVE:
+                devices[dev].add_permissive(check)
+            else:
+                devices[dev].add_interlock(check)
+
+        panel = AlarmPanel()
+        conditions: List[Tuple[str, Callable[[], bool]]] = []
+        for k, txt, sev, latch, tag, op, v in zip(
+                s["a_key"], s["a_text"], s["a_sev"], s["a_latch"], s["a_tag"], s["a_op"], s["a_val"]):
+            key = strings[k]
+            panel.add(Alarm(key, strings[txt], _SEVERITIES[sev], bool(latch)))
+            conditions.append((key, _rule(devices[tag], op, v)))
+        return LoadedPlant(dict(zip(ids, devices)), panel, conditions)
+
+def _rule(sensor: SensorLevel, op: int, v: float) -> Callable[[], bool]:
+    #BAD/STALE source fails the check (permissives block, interlocks trip, alarms go active only on GOOD data)
+    fn = _OP_FNS[op]
+    def check() -> bool:
+        p = sensor.point
+        return is_good(p) and fn(p.value, v)
+    check.rule = (sensor, OPS[op], v) #lets runtime.codegen inline the comparison
+    return check
+
+class LoadedPlant:
+    """Devices and alarms built from an image; signals() evaluates every alarm condition."""
+
+    def __init__(self, devices: Dict[str, Any], alarms: AlarmPanel,
+                 conditions: List[Tuple[str, Callable[[], bool]]]) -> None:
+        self.devices = devices
+        self.alarms = alarms
+        self._conditions = conditions
+
+    def signals(self) -> Dict[str, bool]:
+        return {key: cond() for key, cond in self._conditions}
+
+def load_or_compile(config_path: str, cache_dir: str) -> PlantImage:
+    """
+    Open the cached image for this config file, compiling (and caching) it first if needed.
+    The cache key is a hash of the file bytes, so a hit doesn't even parse the JSON.
+    """
+    with open(config_path, "rb") as f:
+        raw = f.read()
+    key = hashlib.sha256(f"{VERSION}:".encode() + raw).hexdigest()
+    path = os.path.join(cache_dir, key + ".otimg")
+    if os.path.exists(path):
+        try:
+            return PlantImage.open(path)
+        except (ValueError, struct.error):
+            pass #corrupt or old format: rebuild
+    data = compile_config(json.loads(raw, parse_constant=_reject_constant))
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return PlantImage.open(path)
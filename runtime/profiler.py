@@ -0,0 +1,252 @@
+# runtime/profiler.py
+"""
+Scan profiler: always-on timers with rolling histograms, plus a cProfile capture of the next
+few scans when a scan overruns or the rolling p99 goes over budget.
+
+    prof = ScanProfiler(p99_budget_s=0.08, capture_dir="captures", metrics_path="scan_metrics.jsonl")
+    clk = RealTimeClock(0.1, on_overrun=prof.on_overrun)
+    while True:
+        prof.begin_scan()
+        with prof.timer("phase/inputs"):
+            for s in sensors:
+                prof.update(s, clk)         #timed as device/<id>
+        ...
+        prof.end_scan()
+        clk.sleep_until_next_scan()
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import math
+import os
+import pstats
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+
+#Log-scale buckets: 8 per octave starting at 1 us, 256 buckets reach ~4.3 ks
+_SUB = 8
+_NB = 256
+_BASE_S = 1e-6
+
+def _bucket(dt_s: float) -> int:
+    if dt_s <= _BASE_S:
+        return 0
+    i = int(math.log2(dt_s / _BASE_S) * _SUB) + 1
+    return i if i < _NB else _NB - 1
+
+def _bucket_upper_s(i: int) -> float:
+    return _BASE_S * 2.0 ** (i / _SUB)
+
+class _Timer:
+    """One named timer: current and previous window histograms plus lifetime count/total/max."""
+    __slots__ = ("name", "cur", "prev", "count", "total_s", "max_s", "_starts")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.cur = array("q", bytes(8 * _NB))
+        self.prev = array("q", bytes(8 * _NB))
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self._starts: List[float] = [] #one per open with-block, so nested use times each block
+
+    def record(self, dt_s: float) -> None:
+        self.cur[_bucket(dt_s)] += 1
+        self.count += 1
+        self.total_s += dt_s
+        if dt_s > self.max_s:
+            self.max_s = dt_s
+
+    def __enter__(self) -> "_Timer":
+        self._starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.record(time.perf_counter() - self._starts.pop())
+
+    def roll(self) -> None:
+        self.prev, self.cur = self.cur, self.prev
+        self.cur[:] = array("q", bytes(8 * _NB))
+
+    def percentile(self, pct: float) -> float:
+        """Upper bucket edge at pct over the last two windows (0.0 with no samples)."""
+        cur, prev = self.cur, self.prev
+        n = sum(cur) + sum(prev)
+        if n == 0:
+            return 0.0
+        rank = pct / 100.0 * n
+        seen = 0
+        for i in range(_NB):
+            seen += cur[i] + prev[i]
+            if seen >= rank:
+                return _bucket_upper_s(i)
+        return _bucket_upper_s(_NB - 1)
+
+    def summary(self) -> Dict[str, float]:
+        ms = 1000.0
+        return {
+            "count": self.count,
+            "mean_ms": self.total_s / self.count * ms if self.count else 0.0,
+            "p50_ms": self.percentile(50) * ms,
+            "p99_ms": self.percentile(99) * ms,
+            "max_ms": self.max_s * ms,
+        }
+
+class ScanProfiler:
+    """
+    Timers are named by convention "scan", "phase/<name>", "device/<id>", "subsystem/<name>".
+    - Histograms roll every window_scans scans; percentiles cover the last two windows.
+    - A capture (cProfile of the next capture_scans scans) is armed by on_overrun() (wire it as
+      RealTimeClock's on_overrun) or when the rolling scan p99 exceeds p99_budget_s.
+      cooldown_scans stops a persistently slow plant from being profiled back to back.
+    - Each rolled window is appended as one JSON line to metrics_path and/or passed to sink
+      (e.g. a function that POSTs it). Captures are written to capture_dir as .prof files.
+    """
+
+    def __init__(
+            self,
+            window_scans: int = 1000,
+            capture_scans: int = 5,
+            p99_budget_s: Optional[float] = None,
+            cooldown_scans: int = 1000,
+            min_samples: int = 100,
+            capture_dir: Optional[str] = None,
+            metrics_path: Optional[str] = None,
+            sink: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        self.window_scans = window_scans
+        self.capture_scans = capture_scans
+        self.p99_budget_s = p99_budget_s
+        self.cooldown_scans = cooldown_scans
+        self.min_samples = min_samples
+        self.capture_dir = capture_dir
+        self.metrics_path = metrics_path
+        self.sink = sink
+
+        self._timers: Dict[str, _Timer] = {}
+        self._scan = self.timer("scan")
+        self._scan_t0 = 0.0
+        self.scans = 0
+        self.overruns = 0
+
+        self._armed: Optional[str] = None   #reason of a pending capture
+        self._prof: Optional[cProfile.Profile] = None
+        self._capture_left = 0
+        self._capture_reason = ""
+        self._cooldown_until = 0
+        self.captures: List[Dict[str, Any]] = []
+
+    # Timers
+    def timer(self, name: str) -> _Timer:
+        """The named timer (created once); use as a context manager or call record()."""
+        t = self._timers.get(name)
+        if t is None:
+            t = self._timers[name] = _Timer(name)
+        return t
+
+    def record(self, name: str, dt_s: float) -> None:
+        self.timer(name).record(dt_s)
+
+    def update(self, device: Any, clk: Any) -> None:
+        """device.update(clk), timed as device/<id>."""
+        t = self.timer("device/" + device.id)
+        t0 = time.perf_counter()
+        device.update(clk)
+        t.record(time.perf_counter() - t0)
+
+    # Scan boundaries
+    def begin_scan(self) -> None:
+        if self._armed is not None and self._prof is None:
+            self._start_capture(self._armed)
+        self._scan_t0 = time.perf_counter()
+
+    def end_scan(self) -> None:
+        dt = time.perf_counter() - self._scan_t0
+        self._scan.record(dt)
+        self.scans += 1
+
+        if self._prof is not None:
+            self._capture_left -= 1
+            if self._capture_left <= 0:
+                self._finish_capture()
+        elif (
+            self.p99_budget_s is not None
+            and self._scan.count >= self.min_samples
+            and dt > self.p99_budget_s
+            and self._scan.percentile(99) > self.p99_budget_s
+        ):
+            self.arm("p99")
+
+        if self.scans % self.window_scans == 0:
+            snap = self.snapshot()
+            for t in self._timers.values():
+                t.roll()
+            self.export(snap)
+
+    # Capture
+    def on_overrun(self, behind_s: float, now_s: float) -> None:
+        self.overruns += 1
+        self.arm("overrun")
+
+    def arm(self, reason: str) -> bool:
+        """Request a capture of the next capture_scans scans (ignored while cooling down)."""
+        if self._armed is not None or self._prof is not None or self.scans < self._cooldown_until:
+            return False
+        self._armed = reason
+        return True
+
+    def _start_capture(self, reason: str) -> None:
+        self._armed = None
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError: #another profiler/tracer is active
+            self._cooldown_until = self.scans + self.cooldown_scans
+            return
+        self._prof = prof
+        self._capture_reason = reason
+        self._capture_left = self.capture_scans
+
+    def _finish_capture(self) -> None:
+        prof, self._prof = self._prof, None
+        prof.disable()
+        self._cooldown_until = self.scans + self.cooldown_scans
+        out = io.StringIO()
+        pstats.Stats(prof, stream=out).sort_stats("cumulative").print_stats(15)
+        capture: Dict[str, Any] = {
+            "kind": "capture",
+            "reason": self._capture_reason,
+            "scan": self.scans,
+            "scans": self.capture_scans,
+            "wall_ts": time.time(),
+            "top": out.getvalue(),
+            "path": None,
+        }
+        if self.capture_dir:
+            os.makedirs(self.capture_dir, exist_ok=True)
+            path = os.path.join(self.capture_dir, f"scan-{self.scans:09d}-{self._capture_reason}.prof")
+            prof.dump_stats(path)
+            capture["path"] = path
+        self.captures.append(capture)
+        self.export(capture)
+
+    # Export
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "kind": "window",
+            "wall_ts": time.time(),
+            "scans": self.scans,
+            "overruns": self.overruns,
+            "timers": {name: t.summary() for name, t in self._timers.items()},
+        }
+
+    def export(self, record: Optional[Dict[str, Any]] = None) -> None:
+        record = record or self.snapshot()
+        if self.metrics_path:
+            with open(self.metrics_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        if self.sink:
+            self.sink(record)
@@ -0,0 +1,457 @@
+# runtime/replay.py
+"""
+Deterministic record/replay of scan inputs.
+
+File layout (little endian):
+    header  : b"OTRP" | u8 version | f64 period_s
+    records : u8 opcode followed by its payload
+        SCAN  u32 scan index, f64 clk.now() at scan start
+        STR   u16 byte length, utf-8 bytes (ids are assigned in order of appearance)
+        READ  u16 channel id, value
+        CMD   u16 channel id, u16 class id, u8 field count, values...
+        OUT   u16 channel id, value
+    value   : u8 type tag followed by its payload (see _encode_value)
+Strings (tags, command classes, enum members) are written once and referred to by id,
+so a steady-state scan costs a handful of bytes per input. Command classes and enums are
+stored by name and only resolved through the REPLAY_TYPES allowlist (see register_type()).
+"""
+from __future__ import annotations
+
+import dataclasses
+import struct
+from array import array
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from core.clock import SimClock
+from core.commands import AckCode, Command as DeviceCommand, CommandKind
+from core.point import Quality, StaleRead
+from devices.base import Mode
+from plant.plant_core.commands import Command as PlantCommand, CommandType
+from plant.plant_core.state import MachineState
+
+MAGIC = b"OTRP"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sBd")
+_SCAN = struct.Struct("<Id")
+_U16 = struct.Struct("<H")
+_CMD = struct.Struct("<HHB")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_ENUM = struct.Struct("<HH")
+
+_OP_SCAN, _OP_STR, _OP_READ, _OP_CMD, _OP_OUT = 1, 2, 3, 4, 5
+
+#Value type tags
+_V_NONE, _V_TRUE, _V_FALSE, _V_INT, _V_FLOAT, _V_STR, _V_ENUM, _V_ERROR, _V_STALE = b"NTFidseXS"
+
+_FLUSH_BYTES = 64 * 1024
+
+
+class ReplayError(RuntimeError):
+    """Raised when the replayed run asks for an input that was never recorded."""
+
+
+class RecordedReadError(RuntimeError):
+    """Re-raised during replay where the original read_fn raised."""
+
+
+_READ_ERROR = object()  #Marker for a read that raised while recording
+_READ_STALE = object()  #Marker for a read that raised StaleRead while recording
+
+
+def _qualname(obj: type) -> str:
+    return f"{obj.__module__}:{obj.__qualname__}"
+
+
+#Command dataclasses and enums a recording may contain, by "module:qualname".
+#Recordings are data: names are never imported, only looked up here.
+REPLAY_TYPES: Dict[str, type] = {}
+
+
+def register_type(cls: type) -> type:
+    """Allow a command dataclass or enum in recordings (usable as a class decorator)."""
+    if not (dataclasses.is_dataclass(cls) or issubclass(cls, Enum)):
+        raise TypeError(f"{cls.__name__} is neither a dataclass nor an Enum")
+    REPLAY_TYPES[_qualname(cls)] = cls
+    return cls
+
+
+for _cls in (DeviceCommand, PlantCommand, CommandKind, CommandType, AckCode, Quality, Mode, MachineState):
+    register_type(_cls)
+
+
+def _registered_name(cls: type) -> str:
+    name = _qualname(cls)
+    if REPLAY_TYPES.get(name) is not cls:
+        raise TypeError(f"{name} is not registered for replay (see register_type)")
+    return name
+
+
+def _resolve(name: str) -> type:
+    cls = REPLAY_TYPES.get(name)
+    if cls is None:
+        raise ValueError(f"recording refers to unregistered type {name!r}; see register_type()")
+    return cls
+
+
+class InputRecorder:
+    """
+    Logs every input read and command, keyed by scan index, into a compact binary file.
+    - Call begin_scan(clk) at the top of each scan.
+    - Wrap inputs with wrap_read()/wrap_io(); push commands through record_command().
+    - record_output() captures a baseline the replay can be checked against.
+    """
+
+    def __init__(self, path: str, period_s: float) -> None:
+        self.path = path
+        self.scan = -1
+        self._fp = open(path, "wb")
+        self._buf = bytearray(_HEADER.pack(MAGIC, VERSION, period_s))
+        self._strings: Dict[str, int] = {}
+        self.errors: List[Tuple[int, str, str]] = []    #(scan, tag, reason) of reads not recorded
+
+    # Scan framing
+    def begin_scan(self, clk) -> int:
+        self.scan += 1
+        self._buf.append(_OP_SCAN)
+        self._buf += _SCAN.pack(self.scan, clk.now())
+        if len(self._buf) >= _FLUSH_BYTES:
+            self._flush()
+        return self.scan
+
+    # Inputs
+    def wrap_read(self, tag: str, fn: Callable[[], float]) -> Callable[[], float]:
+        """
+        Wrap a SensorLevel.read_fn so each call (or failure) is recorded.
+        A value that cannot be recorded is passed through and noted in .errors, so a recorder
+        problem never shows up as a BAD read (the replay stops at that read instead).
+        """
+        def read() -> float:
+            try:
+                v = fn()
+            except StaleRead:
+                self._record(_OP_READ, tag, _READ_STALE)
+                raise
+            except Exception:
+                self._record(_OP_READ, tag, _READ_ERROR)
+                raise
+            try:
+                self._record(_OP_READ, tag, v)
+            except (TypeError, OverflowError, struct.error) as e:
+                self.errors.append((self.scan, tag, str(e)))
+            return v
+        return read
+
+    def wrap_io(self, io: Any) -> "RecordingIO":
+        return RecordingIO(io, self)
+
+    def record_read(self, tag: str, value: Any) -> None:
+        self._record(_OP_READ, tag, value)
+
+    def record_command(self, channel: str, cmd: Any) -> None:
+        """Record a dataclass command (core or plant Command) as it arrives."""
+        values = [getattr(cmd, f.name) for f in dataclasses.fields(cmd)]
+        cls = _registered_name(type(cmd))
+        payload = bytearray()
+        for v in values:
+            self._encode_value(v, payload)
+        head = _CMD.pack(self._sid(channel), self._sid(cls), len(values))
+        buf = self._buf
+        buf.append(_OP_CMD)
+        buf += head
+        buf += payload
+
+    # Baseline
+    def record_output(self, tag: str, value: Any) -> None:
+        self._record(_OP_OUT, tag, value)
+
+    # Life cycle
+    def close(self) -> None:
+        if self._fp:
+            self._flush()
+            self._fp.close()
+            self._fp = None
+
+    def __enter__(self) -> "InputRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Encoding
+    def _flush(self) -> None:
+        self._fp.write(self._buf)
+        self._buf = bytearray()
+
+    def _sid(self, s: str) -> int:
+        sid = self._strings.get(s)
+        if sid is None:
+            sid = len(self._strings)
+            if sid > 0xFFFF:
+                raise OverflowError("too many distinct strings for the replay string table")
+            self._strings[s] = sid
+            raw = s.encode("utf-8")
+            self._buf.append(_OP_STR)
+            self._buf += _U16.pack(len(raw))
+            self._buf += raw
+        return sid
+
+    def _record(self, op: int, tag: str, value: Any) -> None:
+        #Encode first: a value that can't be encoded must not leave a partial record.
+        #String table entries (complete records) go to the buffer ahead of the record using them.
+        payload = bytearray()
+        self._encode_value(value, payload)
+        chan = self._sid(tag)
+        buf = self._buf
+        buf.append(op)
+        buf += _U16.pack(chan)
+        buf += payload
+
+    def _encode_value(self, v: Any, buf: bytearray) -> None:
+        if v is None:
+            buf.append(_V_NONE)
+        elif v is _READ_ERROR:
+            buf.append(_V_ERROR)
+        elif v is _READ_STALE:
+            buf.append(_V_STALE)
+        elif v is True:
+            buf.append(_V_TRUE)
+        elif v is False:
+            buf.append(_V_FALSE)
+        elif isinstance(v, Enum):
+            ids = _ENUM.pack(self._sid(_registered_name(type(v))), self._sid(v.name))
+            buf.append(_V_ENUM)
+            buf += ids
+        elif isinstance(v, int):
+            packed = _I64.pack(v)
+            buf.append(_V_INT)
+            buf += packed
+        elif isinstance(v, float):
+            buf.append(_V_FLOAT)
+            buf += _F64.pack(v)
+        elif isinstance(v, str):
+            sid = _U16.pack(self._sid(v))
+            buf.append(_V_STR)
+            buf += sid
+        else:
+            raise TypeError(f"cannot record value of type {type(v).__name__}")
+
+
+class RecordingIO:
+    """io proxy: read(tag, default) is recorded, write(tag, value) passes through."""
+
+    def __init__(self, io: Any, recorder: InputRecorder) -> None:
+        self._io = io
+        self._rec = recorder
+
+    def read(self, tag: str, default: Any = None) -> Any:
+        v = self._io.read(tag, default)
+        self._rec.record_read(tag, v)
+        return v
+
+    def write(self, tag: str, value: Any) -> None:
+        self._io.write(tag, value)
+
+
+class _Channel:
+    """Recorded samples of one tag, consumed in order with a cursor."""
+    __slots__ = ("scans", "values", "pos")
+
+    def __init__(self) -> None:
+        self.scans = array("I")
+        self.values: List[Any] = []
+        self.pos = 0
+
+    def take(self, scan: int, tag: str) -> Any:
+        pos = self.pos
+        if pos >= len(self.scans) or self.scans[pos] != scan:
+            raise ReplayError(f"no recorded input for {tag!r} at scan {scan}")
+        self.pos = pos + 1
+        return self.values[pos]
+
+    def take_if(self, scan: int) -> Tuple[bool, Any]:
+        """(True, value) if a sample was recorded at scan, else (False, None); skips older samples."""
+        scans, pos = self.scans, self.pos
+        while pos < len(scans) and scans[pos] < scan:
+            pos += 1
+        if pos < len(scans) and scans[pos] == scan:
+            self.pos = pos + 1
+            return True, self.values[pos]
+        self.pos = pos
+        return False, None
+
+    def take_all(self, scan: int) -> List[Any]:
+        out = []
+        scans, pos = self.scans, self.pos
+        while pos < len(scans) and scans[pos] == scan:
+            out.append(self.values[pos])
+            pos += 1
+        self.pos = pos
+        return out
+
+
+class InputReplayer:
+    """
+    Feeds a recording back through a SimClock, as fast as the CPU allows.
+    - scans(clk) restores each recorded scan time and yields the scan index.
+    - reader()/io() stand in for read_fn and io; commands() returns what arrived this scan.
+    - check_output() compares against the recorded baseline; misses go to .mismatches.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as fp:
+            data = fp.read()
+        magic, version, self.period_s = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay recording")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+
+        self.scan_times = array("d")
+        self.scan = -1
+        self.mismatches: List[Tuple[int, str, Any, Any]] = []
+        self._reads: Dict[str, _Channel] = {}
+        self._outputs: Dict[str, _Channel] = {}
+        self._commands: Dict[str, _Channel] = {}
+        self._parse(data, _HEADER.size)
+
+    @property
+    def n_scans(self) -> int:
+        return len(self.scan_times)
+
+    # Driving
+    def clock(self) -> SimClock:
+        start = self.scan_times[0] if self.scan_times else 0.0
+        return SimClock(self.period_s, start_s=start)
+
+    def scans(self, clk: SimClock) -> Iterator[int]:
+        for i, t in enumerate(self.scan_times):
+            if t != clk.now():
+                clk.advance_to(t)
+            self.scan = i
+            yield i
+
+    # Inputs
+    def reader(self, tag: str) -> Callable[[], float]:
+        chan = self._reads.get(tag) or _Channel()
+        def read() -> float:
+            v = chan.take(self.scan, tag)
+            if v is _READ_ERROR:
+                raise RecordedReadError(f"{tag} read failed in the recorded run")
+            if v is _READ_STALE:
+                raise StaleRead(f"{tag} read was stale in the recorded run")
+            return v
+        return read
+
+    def io(self, sink: Any = None) -> "ReplayIO":
+        return ReplayIO(self, sink)
+
+    def read(self, tag: str) -> Any:
+        chan = self._reads.get(tag)
+        if chan is None:
+            raise ReplayError(f"no recorded input for {tag!r}")
+        return chan.take(self.scan, tag)
+
+    def commands(self, channel: str) -> List[Any]:
+        chan = self._commands.get(channel)
+        return chan.take_all(self.scan) if chan else []
+
+    # Baseline
+    def check_output(self, tag: str, value: Any) -> bool:
+        chan = self._outputs.get(tag)
+        found, expected = chan.take_if(self.scan) if chan else (False, None)
+        if not found or expected != value:
+            self.mismatches.append((self.scan, tag, expected, value))
+            return False
+        return True
+
+    # Decoding
+    def _parse(self, data: bytes, off: int) -> None:
+        strings: List[str] = []
+        scan = -1
+        n = len(data)
+        unpack_u16 = _U16.unpack_from
+        while off < n:
+            op = data[off]
+            off += 1
+            if op == _OP_SCAN:
+                scan, t = _SCAN.unpack_from(data, off)
+                off += _SCAN.size
+                self.scan_times.append(t)
+            elif op == _OP_STR:
+                (length,) = unpack_u16(data, off)
+                off += 2
+                strings.append(data[off:off + length].decode("utf-8"))
+                off += length
+            elif op in (_OP_READ, _OP_OUT):
+                (chan_id,) = unpack_u16(data, off)
+                v, off = self._decode_value(data, off + 2, strings)
+                table = self._reads if op == _OP_READ else self._outputs
+                self._append(table, strings[chan_id], scan, v)
+            elif op == _OP_CMD:
+                chan_id, cls_id, count = _CMD.unpack_from(data, off)
+                off += _CMD.size
+                args = []
+                for _ in range(count):
+                    v, off = self._decode_value(data, off, strings)
+                    args.append(v)
+                cls = _resolve(strings[cls_id])
+                if not dataclasses.is_dataclass(cls):
+                    raise ValueError(f"corrupt recording: {strings[cls_id]} is not a command type")
+                cmd = cls(*args)
+                self._append(self._commands, strings[chan_id], scan, cmd)
+            else:
+                raise ValueError(f"corrupt recording: opcode {op} at byte {off - 1}")
+
+    @staticmethod
+    def _append(table: Dict[str, _Channel], tag: str, scan: int, v: Any) -> None:
+        chan = table.get(tag)
+        if chan is None:
+            chan = table[tag] = _Channel()
+        chan.scans.append(scan)
+        chan.values.append(v)
+
+    @staticmethod
+    def _decode_value(data: bytes, off: int, strings: List[str]) -> Tuple[Any, int]:
+        kind = data[off]
+        off += 1
+        if kind == _V_FLOAT:
+            return _F64.unpack_from(data, off)[0], off + 8
+        if kind == _V_TRUE:
+            return True, off
+        if kind == _V_FALSE:
+            return False, off
+        if kind == _V_NONE:
+            return None, off
+        if kind == _V_INT:
+            return _I64.unpack_from(data, off)[0], off + 8
+        if kind == _V_STR:
+            return strings[_U16.unpack_from(data, off)[0]], off + 2
+        if kind == _V_ENUM:
+            cls_id, member_id = _ENUM.unpack_from(data, off)
+            cls = _resolve(strings[cls_id])
+            if not issubclass(cls, Enum):
+                raise ValueError(f"corrupt recording: {strings[cls_id]} is not an enum")
+            return cls[strings[member_id]], off + 4
+        if kind == _V_ERROR:
+            return _READ_ERROR, off
+        if kind == _V_STALE:
+            return _READ_STALE, off
+        raise ValueError(f"corrupt recording: value tag {kind!r}")
+
+
+class ReplayIO:
+    """io stand-in: read() serves recorded values, write() goes to an optional sink."""
+
+    def __init__(self, replayer: InputReplayer, sink: Any = None) -> None:
+        self._rp = replayer
+        self._sink = sink
+
+    def read(self, tag: str, default: Any = None) -> Any:
+        return self._rp.read(tag)
+
+    def write(self, tag: str, value: Any) -> None:
+        if self._sink is not None:
+            self._sink.write(tag, value)
@@ -0,0 +1,209 @@
+# runtime/sweep.py
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence
+
+from core.clock import SimClock
+
+class Scenario(Protocol):
+    """What a build function returns: one headless plant."""
+    def scan(self, clk) -> None: ...
+    def metrics(self) -> Dict[str, Any]: ...     #publish counts, alarm counts, trip times, ...
+
+#build(params, seed) -> Scenario. Must be a module-level function so worker processes can pickle it.
+BuildFn = Callable[[Dict[str, Any], int], Scenario]
+
+# Parameter specs
+
+@dataclass
+class RunSpec:
+    run_id: str
+    params: Dict[str, Any]
+    seed: int
+
+@dataclass
+class ParamGrid:
+    """Full cartesian product of the axes, in axis order."""
+    axes: Dict[str, Sequence[Any]]
+
+    def combos(self) -> Iterator[Dict[str, Any]]:
+        names = list(self.axes)
+        for values in itertools.product(*(self.axes[n] for n in names)):
+            yield dict(zip(names, values))
+
+@dataclass
+class Uniform:
+    lo: float
+    hi: float
+
+@dataclass
+class RandomSample:
+    """n random draws: sequences are sampled with choice(), Uniform axes with uniform()."""
+    axes: Dict[str, Any]
+    n: int
+    seed: int = 0
+
+    def combos(self) -> Iterator[Dict[str, Any]]:
+        rng = random.Random(self.seed)
+        for _ in range(self.n):
+            yield {
+                name: rng.uniform(ax.lo, ax.hi) if isinstance(ax, Uniform) else rng.choice(ax)
+                for name, ax in self.axes.items()
+            }
+
+def run_seed(base_seed: int, run_id: str) -> int:
+    #String seeding is stable across processes and Python runs (unlike hash())
+    return random.Random(f"{base_seed}:{run_id}").getrandbits(32)
+
+# Worker side
+
+def _percentile(sorted_vals: List[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, int(round(pct / 100.0 * (len(sorted_vals) - 1))))
+    return sorted_vals[idx]
+
+def run_one(build: BuildFn, spec: RunSpec, n_scans: int, period_s: float) -> Dict[str, Any]:
+    """Build one plant and run it on a SimClock for n_scans. Returns one flat result row."""
+    clk = SimClock(period_s)
+    scenario = build(dict(spec.params), spec.seed)
+    durations = []
+    perf = time.perf_counter
+    for _ in range(n_scans):
+        t0 = perf()
+        scenario.scan(clk)
+        durations.append(perf() - t0)
+        clk.sleep_until_next_scan()
+
+    durations.sort()
+    row: Dict[str, Any] = {"run_id": spec.run_id, "seed": spec.seed}
+    row.update({f"param.{k}": v for k, v in spec.params.items()})
+    row.update(scenario.metrics())
+    row.update({
+        "scans": n_scans,
+        "scan_mean_ms": 1000.0 * sum(durations) / len(durations) if durations else 0.0,
+        "scan_p50_ms": 1000.0 * _percentile(durations, 50),
+        "scan_p99_ms": 1000.0 * _percentile(durations, 99),
+        "scan_max_ms": 1000.0 * (durations[-1] if durations else 0.0),
+    })
+    return row
+
+# Driver
+
+def _as_json(v: Any) -> Any:
+    return json.loads(json.dumps(v))
+
+@dataclass
+class SweepRunner:
+    """
+    Runs every combination of a ParamGrid/RandomSample headless on SimClock.
+    - Rows are streamed back as runs finish and journalled to <out_path>.journal.jsonl.
+    - Re-running with the same out_path skips runs already in the journal (resume).
+    - run() writes the final columnar file: {"columns": [...], "data": {col: [values...]}}.
+    - workers=0 runs inline in this process (handy for debugging).
+    """
+    build: BuildFn
+    spec: Any   #ParamGrid or RandomSample
+    out_path: str
+    n_scans: int
+    period_s: float = 0.1
+    workers: Optional[int] = None
+    base_seed: int = 0
+
+    _done: Dict[str, Dict[str, Any]] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def journal_path(self) -> str:
+        return self.out_path + ".journal.jsonl"
+
+    def runs(self) -> List[RunSpec]:
+        specs = []
+        for i, params in enumerate(self.spec.combos()):
+            run_id = f"r{i:06d}"
+            specs.append(RunSpec(run_id, params, run_seed(self.base_seed, run_id)))
+        return specs
+
+    def _load_journal(self) -> None:
+        """Read finished runs back; a torn last line is cut off so appends start on a fresh line."""
+        self._done.clear()
+        if not os.path.exists(self.journal_path):
+            return
+        good_end = 0
+        with open(self.journal_path, "rb+") as fp:
+            for raw in fp:
+                if not raw.endswith(b"\n"):
+                    break # torn last line from an interrupted write
+                good_end += len(raw)
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue # damaged by an older torn write; the run is simply redone
+                self._done[row["run_id"]] = row
+            if fp.seek(0, os.SEEK_END) > good_end:
+                fp.truncate(good_end)
+
+    def _check_journal(self, specs: List[RunSpec]) -> None:
+        """Journalled runs must be the same runs this spec produces, not just the same ids."""
+        by_id = {s.run_id: s for s in specs}
+        for run_id, row in self._done.items():
+            spec = by_id.get(run_id)
+            #Compare as the journal stores them (tuples come back as lists)
+            params = None if spec is None else _as_json({f"param.{k}": v for k, v in spec.params.items()})
+            if spec is None or row.get("seed") != spec.seed or \
+                    _as_json({k: v for k, v in row.items() if k.startswith("param.")}) != params:
+                raise ValueError(
+                    f"{self.journal_path} has run {run_id} from a different sweep "
+                    "(params/seed differ); use another out_path or delete the journal"
+                )
+
+    def stream(self) -> Iterator[Dict[str, Any]]:
+        """Yield result rows for runs not yet in the journal, as they complete."""
+        self._load_journal()
+        specs = self.runs()
+        self._check_journal(specs)
+        todo = [s for s in specs if s.run_id not in self._done]
+        os.makedirs(os.path.dirname(self.out_path) or ".", exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            for row in self._execute(todo):
+                journal.write(json.dumps(row, separators=(",", ":")) + "\n")
+                journal.flush()
+                self._done[row["run_id"]] = row
+                yield row
+
+    def _execute(self, todo: List[RunSpec]) -> Iterable[Dict[str, Any]]:
+        if self.workers == 0:
+            for spec in todo:
+                yield run_one(self.build, spec, self.n_scans, self.period_s)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(run_one, self.build, s, self.n_scans, self.period_s) for s in todo]
+            for fut in as_completed(futures):
+                yield fut.result()
+
+    def run(self) -> Dict[str, List[Any]]:
+        """Run everything outstanding, then write and return the columnar results."""
+        for _ in self.stream():
+            pass
+        rows = [self._done[s.run_id] for s in self.runs() if s.run_id in self._done]
+        columns: List[str] = []
+        for row in rows:
+            for col in row:
+                if col not in columns:
+                    columns.append(col)
+        data = {col: [row.get(col) for row in rows] for col in columns}
+
+        tmp = self.out_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump({"columns": columns, "data": data}, fp, separators=(",", ":"))
+        os.replace(tmp, self.out_path)
+        return data
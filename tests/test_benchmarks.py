@@ -0,0 +1,31 @@
+# tests/test_benchmarks.py
+import copy
+import json
+
+from benchmarks.run import compare, main, run
+
+
+def test_benchmark_run_shape_and_logging():
+    result = run(sizes=[40], scans=3, micro_n=50)
+    r = result["plants"]["40"]
+    assert r["devices"] == 40 and r["scans"] == 3
+    assert set(r["phase_ms"]) == {"inputs", "commands", "logic", "alarms", "logging"}
+    assert r["scan_ms"]["p50"] <= r["scan_ms"]["p99"] <= r["scan_ms"]["max"]
+    assert r["publishes_per_scan"] > 0 # sensor publishes went through the CSV logger
+    assert r["alloc"]["peak_bytes_per_scan"] > 0
+    assert all(m["ns_per_op"] > 0 for m in result["micro"].values())
+    json.dumps(result)
+
+
+def test_compare_flags_only_real_regressions(tmp_path):
+    base = run(sizes=[20], scans=2, micro_n=20)
+    slower = copy.deepcopy(base)
+    slower["plants"]["20"]["scan_ms"]["p99"] *= 1.5
+    slower["micro"]["all_true[8]"]["ns_per_op"] *= 1.05
+
+    flagged = {r["metric"] for r in compare(base, slower, tolerance=0.10) if r["regressed"]}
+    assert flagged == {"plant[20].scan_ms.p99"}
+
+    path = tmp_path / "base.json"
+    path.write_text(json.dumps({"plants": {}, "micro": {"all_true[8]": {"ns_per_op": 1e-6}}}))
+    assert main(["--sizes", "20", "--scans", "2", "--micro-n", "20", "--baseline", str(path)]) == 1
@@ -0,0 +1,54 @@
+# tests/test_core_calc.py
+import pytest
+
+from core.calc import CalcEngine, vote_average
+from core.point import Quality
+from core.point_types import AnalogPoint
+
+
+def _pt(tag, v, q=Quality.GOOD):
+    return AnalogPoint(id=tag, value=v, ts_mono=0.0, quality=q)
+
+
+def test_incremental_recompute_follows_dag():
+    raw = {"LT1": _pt("LT1", 2.0), "FT1": _pt("FT1", 1.0), "FT2": _pt("FT2", 3.0)}
+    eng = CalcEngine(raw.get)
+    eng.add("STATION:FLOW", ["FT1", "FT2"], lambda a, b: a + b, eu="m3/h")
+    eng.add("TK1:VOL", ["LT1"], lambda h: h * 12.5, eu="m3")
+    eng.add("TK1:HOURS_LEFT", ["TK1:VOL", "STATION:FLOW"], lambda v, q: v / q)
+
+    first = eng.update(0.0)
+    assert set(first) == {"STATION:FLOW", "TK1:VOL", "TK1:HOURS_LEFT"}
+    assert first[-1] == "TK1:HOURS_LEFT" # evaluated after both of its inputs
+    assert eng.point("TK1:HOURS_LEFT").value == 25.0 / 4.0
+
+    eng.evaluations = 0
+    raw["LT1"] = _pt("LT1", 4.0) # a COV publish replaces the point
+    assert eng.update(1.0) == ["TK1:VOL", "TK1:HOURS_LEFT"]
+    assert eng.evaluations == 2 # STATION:FLOW untouched
+    assert eng.point("TK1:HOURS_LEFT").value == 50.0 / 4.0
+
+    eng.evaluations = 0
+    assert eng.update(2.0) == [] and eng.evaluations == 0 # nothing changed -> no work
+
+
+def test_quality_propagates_and_voting():
+    raw = {"A": _pt("A", 10.0), "B": _pt("B", 11.0), "C": _pt("C", 30.0, Quality.BAD)}
+    eng = CalcEngine(raw.get)
+    eng.add("AVG", ["A", "B", "C"], vote_average(min_good=2), points=True)
+    eng.add("DOUBLE", ["C"], lambda c: 2 * c)
+    eng.update(0.0)
+    assert eng.point("AVG").value == 10.5 and eng.point("AVG").quality == Quality.GOOD
+    assert eng.point("DOUBLE").quality == Quality.BAD
+
+    raw["B"] = _pt("B", 11.0, Quality.STALE)
+    eng.update(1.0, changed=["B"])
+    assert eng.point("AVG").value == 10.0 and eng.point("AVG").quality == Quality.STALE
+
+
+def test_cycle_is_rejected():
+    eng = CalcEngine({}.get)
+    eng.add("X", ["Y"], lambda y: y)
+    eng.add("Y", ["X"], lambda x: x)
+    with pytest.raises(ValueError):
+        eng.compile()
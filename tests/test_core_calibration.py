@@ -0,0 +1,57 @@
+# tests/test_core_calibration.py
+import pytest
+
+from core.calibration import Calibration, EngTable, Linear, PiecewiseLinear, SqrtExtraction
+from core.point import CovRule, Limits, Scaling
+from core.point_types import AnalogPoint
+
+
+def test_piecewise_sqrt_and_clamp():
+    pw = PiecewiseLinear([(4.0, 0.0), (12.0, 60.0), (20.0, 100.0)]) # non-linear 4-20 mA
+    assert pw(8.0) == 30.0 and pw(16.0) == 80.0
+    assert pw(22.0) == 110.0 # end segment extended
+    assert PiecewiseLinear([(0, 0), (10, 5)], extrapolate=False)(20) == 5.0
+    with pytest.raises(ValueError):
+        PiecewiseLinear([(1, 0), (1, 2)])
+
+    dp = SqrtExtraction(raw_lo=0.0, raw_hi=250.0, eng_hi=400.0, cutoff=0.01)
+    assert dp(62.5) == 200.0 # 25% DP -> 50% flow
+    assert dp(1.0) == 0.0 # low-flow cutoff
+
+    clamped = Calibration(pw, Limits(lo=0.0, hi=100.0))
+    assert clamped(22.0) == 100.0 and clamped(2.0) == 0.0
+
+
+def test_point_eng_uses_calibration_and_caches():
+    calls = []
+    class Counting(Linear):
+        def __call__(self, raw):
+            calls.append(raw)
+            return super().__call__(raw)
+
+    p = AnalogPoint(id="FT1", value=10.0, ts_mono=0.0, calibration=Counting(2.0, 1.0), cov=CovRule(deadband_abs=0.5))
+    assert p.eng() == 21.0 and p.eng() == 21.0
+    assert calls == [10.0] # second call served from cache
+    p.value = 11.0
+    assert p.eng() == 23.0 and calls == [10.0, 11.0]
+
+    scaled = AnalogPoint(id="LT1", value=5.0, ts_mono=0.0, scaling=Scaling(k=0.1, b=0.0))
+    assert scaled.eng() == 0.5
+    scaled.scaling.k = 2.0 # Scaling is mutable: the cache must not serve the old value
+    assert scaled.eng() == 10.0
+    scaled.scaling.b = 1.0
+    assert scaled.eng() == 11.0
+
+
+def test_eng_table_batch_convert():
+    table = EngTable()
+    lin = Linear(0.5, 0.0)
+    dp = Calibration(SqrtExtraction(0.0, 100.0, 50.0), Limits(hi=45.0))
+    a = table.add(lin)
+    b = table.add(lin)
+    c = table.add(dp)
+    for idx, raw in ((a, 10.0), (b, 20.0), (c, 100.0)):
+        table.set_raw(idx, raw)
+    eng = table.convert()
+    assert list(eng) == [5.0, 10.0, 45.0]
+    assert list(table.raw) == [10.0, 20.0, 100.0]
@@ -26,4 +26,92 @@ def test_realtimeclock_overrun_calls_callback(monkeypatch):
         clk.sleep_until_next_scan()
         assert events, "Expected an overrun event"
     finally:
-        pass
\ No newline at end of file
+        pass
+
+def test_simclock_event_driven_jumps_to_next_wakeup():
+    from core.policies import dwell_ok, dwell_due
+
+    clk = SimClock(period_s=0.1, event_driven=True)
+    last = None
+    ok, last = dwell_ok(True, last, clk.now(), dwell_ms=600_000) # 10 minute dwell
+    clk.wake_at(dwell_due(last, 600_000))
+
+    scans = 0
+    while not ok:
+        clk.sleep_until_next_scan()
+        scans += 1
+        ok, last = dwell_ok(True, last, clk.now(), dwell_ms=600_000)
+    assert scans == 1
+    assert abs(clk.now() - 600.0) < 1e-6
+    assert clk.skipped_scans == 5999
+
+def test_simclock_event_driven_stays_on_period_grid():
+    clk = SimClock(period_s=0.5, event_driven=True)
+    clk.wake_at(1.2)
+    clk.wake_at(3.0)
+    clk.sleep_until_next_scan()
+    assert clk.now() == 1.5 # next tick at/after 1.2
+    clk.sleep_until_next_scan()
+    assert clk.now() == 3.0
+    clk.sleep_until_next_scan() # nothing registered -> fixed step
+    assert clk.now() == 3.5
+
+
+class FakeTime:
+    def __init__(self): self.t = 100.0; self.sleeps = []
+    def monotonic(self): return self.t
+    def sleep(self, s): self.sleeps.append(s); self.t += s
+
+def test_scaledclock_runs_faster_and_keeps_wall_consistent(monkeypatch):
+    import core.clock as clock_mod
+    from core.clock import ScaledClock
+    fake = FakeTime()
+    monkeypatch.setattr(clock_mod, "time", fake)
+
+    clk = ScaledClock(period_s=1.0, speed=10.0)
+    w0 = clk.wall_now()
+    clk.sleep_until_next_scan()
+    assert abs(fake.sleeps[-1] - 0.1) < 1e-9 # 1 s of sim time = 0.1 s real
+    assert abs(clk.now() - 1.0) < 1e-9
+    assert abs((clk.wall_now() - w0).total_seconds() - 1.0) < 1e-6
+
+    clk.set_speed(0.5) # slow down mid-run; now() must not jump
+    assert abs(clk.now() - 1.0) < 1e-9
+    clk.sleep_until_next_scan()
+    assert abs(fake.sleeps[-1] - 2.0) < 1e-9
+    assert abs(clk.now() - 2.0) < 1e-9
+
+def test_scaledclock_degrades_speed_on_overrun(monkeypatch):
+    import core.clock as clock_mod
+    from core.clock import ScaledClock
+    fake = FakeTime()
+    monkeypatch.setattr(clock_mod, "time", fake)
+    events = []
+
+    clk = ScaledClock(period_s=1.0, speed=10.0, overrun_policy="degrade",
+                      on_overrun=lambda behind, now: events.append(behind), recover_after_scans=2)
+    fake.t += 0.35 # scan took 3.5 s of sim time
+    clk.sleep_until_next_scan()
+    assert events and abs(events[0] - 2.5) < 1e-9
+    assert clk.speed == 5.0
+    assert fake.sleeps == [] # skipped ahead instead of sleeping
+
+    clk.sleep_until_next_scan(); clk.sleep_until_next_scan()
+    assert clk.speed == 10.0 # recovered after two on-time scans
+
+
+def test_scaledclock_exact_deadline_is_on_time_and_factor_validated(monkeypatch):
+    import pytest
+    import core.clock as clock_mod
+    from core.clock import ScaledClock
+    fake = FakeTime()
+    monkeypatch.setattr(clock_mod, "time", fake)
+    events = []
+    clk = ScaledClock(period_s=1.0, speed=2.0, overrun_policy="degrade",
+                      on_overrun=lambda behind, now: events.append(behind))
+    fake.t += 0.5 # lands exactly on the first deadline
+    clk.sleep_until_next_scan()
+    assert events == [] and clk.speed == 2.0 and clk.now() == 1.0
+    for bad in (0.0, 1.0, 1.5):
+        with pytest.raises(ValueError):
+            ScaledClock(period_s=1.0, degrade_factor=bad)
@@ -0,0 +1,97 @@
+# tests/test_core_event_bus.py
+import threading
+
+import pytest
+
+from core.clock import SimClock
+from core.event_bus import EV_COV, EV_TRANSITION, EventBus
+from devices.sensors.sensor_level import SensorLevel
+from plant.plant_core.state import Lifecycle, MachineState
+
+
+def test_fan_out_batches_and_slow_consumer_drops():
+    bus = EventBus(capacity=64, max_lag=32, max_batch=16)
+    fast, slow = bus.subscribe("historian"), bus.subscribe("journal")
+    seen = []
+    for k in range(100):
+        bus.publish(EV_COV, float(k), "LT_1", float(k))
+        if k % 10 == 9:
+            seen += [ev[4] for ev in fast.poll()]
+    assert seen == [float(k) for k in range(100)] and fast.dropped == 0
+
+    # the slow consumer never polled: its next poll skips to max_lag behind and counts the rest
+    assert slow.lag == 100 and slow.dropped == 0
+    batch = list(slow.poll())
+    assert slow.dropped == 68
+    assert len(batch) == 16 and batch[0][0] == 68 and batch[0][4] == 68.0
+    st = bus.stats()["consumers"]
+    assert st["journal"] == {"lag": 16, "consumed": 16, "dropped": 68}
+
+    with pytest.raises(ValueError):
+        EventBus(capacity=100)
+
+
+def test_adapters_and_threaded_consumer():
+    bus = EventBus(capacity=1024, max_batch=64)
+    sink = bus.subscribe("csv")
+    level = {"v": 0.0}
+    s = SensorLevel(id="LT_1", read_fn=lambda: level["v"], deadband_abs=0.5, min_interval_s=0.0,
+                    on_publish=bus.on_publish)
+    lc = Lifecycle()
+    lc.add_hook(bus.lifecycle_hook("PUMP_1"))
+
+    got, done = [], threading.Event()
+    def worker():
+        while not done.is_set() or sink.lag:
+            sink.drain(got.append)
+    th = threading.Thread(target=worker)
+    th.start()
+    clk = SimClock(0.1)
+    for k in range(200):
+        level["v"] = float(k // 5)
+        s.update(clk)
+        if k == 50:
+            lc.request_start(clk.now()); lc.confirm_started(clk.now())
+        clk.sleep_until_next_scan()
+    done.set(); th.join()
+
+    covs = [ev for ev in got if ev[1] == EV_COV]
+    assert [ev[4] for ev in covs] == [float(v) for v in range(40)]
+    trans = [ev for ev in got if ev[1] == EV_TRANSITION]
+    assert [ev[6].to_state for ev in trans] == [MachineState.STARTING, MachineState.RUNNING]
+    assert trans[0][3] == "PUMP_1" and sink.dropped == 0
+
+
+def test_slot_lapped_during_a_slow_batch_is_dropped_not_torn():
+    bus = EventBus(capacity=16, max_lag=8, max_batch=8)
+    c = bus.subscribe("slow")
+    for k in range(4):
+        bus.publish(EV_COV, float(k), "LT_1", float(k))
+    got = []
+    for ev in c.poll():
+        got.append(ev)
+        if len(got) == 1:
+            for k in range(4, 40): # producer laps the ring while the sink handles one event
+                bus.publish(EV_COV, float(k), "LT_1", float(k))
+    assert [ev[0] for ev in got] == [0] + list(range(32, 39))
+    assert all(ev[4] == float(ev[0]) for ev in got)
+    assert c.dropped == 31 and c.consumed == 8
+
+
+def test_slot_being_overwritten_is_dropped_not_yielded():
+    from core.event_bus import EV_ALARM
+    bus = EventBus(capacity=16, max_lag=8, max_batch=8)
+    c = bus.subscribe("slow")
+    for k in range(4):
+        bus.publish(EV_COV, float(k), "LT_1", float(k))
+    batch = c.poll()
+    assert next(batch)[0] == 0
+    for k in range(4, 17):
+        bus.publish(EV_COV, float(k), "LT_1", float(k))
+    # producer is part-way through publishing seq 17 into seq 1's slot (cursor not bumped yet)
+    i = 17 & bus.mask
+    bus.kind[i], bus.t[i], bus.source[i] = EV_ALARM, 17.0, "ALM"
+    rest = list(batch)
+    assert 1 not in [ev[0] for ev in rest]
+    assert all(ev[1] == EV_COV and ev[4] == float(ev[0]) for ev in rest)
+    assert c.dropped == 8 and [ev[0] for ev in rest] == list(range(9, 16))
@@ -0,0 +1,48 @@
+# tests/test_core_history.py
+import math
+
+from core.clock import SimClock
+from core.history import HistoryStore, TagHistory
+from devices.sensors.sensor_level import SensorLevel
+
+
+def test_ring_wraps_and_window_query():
+    h = TagHistory(capacity=5)
+    for i in range(8):
+        h.append(float(i), i * 10.0)
+    assert len(h) == 5
+    xs, ys = h.window(0.0, 100.0)
+    assert xs == [3.0, 4.0, 5.0, 6.0, 7.0] # oldest overwritten
+    assert ys == [30.0, 40.0, 50.0, 60.0, 70.0]
+    assert h.window(4.5, 6.0) == ([5.0, 6.0], [50.0, 60.0])
+    assert h.window(20.0, 30.0) == ([], [])
+
+
+def test_downsampling_keeps_shape_and_spikes():
+    h = TagHistory(capacity=2000)
+    for i in range(1000):
+        v = math.sin(i / 50.0)
+        if i == 537:
+            v = 25.0 # one-sample spike
+        h.append(i * 0.1, v)
+
+    xs, ys = h.query(0.0, 100.0, max_points=100, method="lttb")
+    assert len(xs) == 100 and xs[0] == 0.0 and xs[-1] == 99.9
+    assert 25.0 in ys # LTTB keeps the most prominent point of its bucket
+    xs, ys = h.query(0.0, 100.0, max_points=100, method="minmax")
+    assert len(xs) <= 100 and max(ys) == 25.0 and min(ys) < -0.99
+    assert xs == sorted(xs)
+
+
+def test_sensor_publish_hook_feeds_history():
+    store = HistoryStore(capacity=100)
+    level = {"h": 0.0}
+    s = SensorLevel(id="LT_1", read_fn=lambda: level["h"], deadband_abs=0.05, min_interval_s=0.0,
+                    on_publish=lambda p, now: store.record(p, now))
+    clk = SimClock(0.5)
+    for v in (1.0, 1.01, 2.0, 2.0, 3.0):
+        level["h"] = v
+        s.update(clk)
+        clk.sleep_until_next_scan()
+    xs, ys = store.query("LT_1", 0.0, 10.0, max_points=50)
+    assert ys == [1.0, 2.0, 3.0] and xs == [0.0, 1.0, 2.0]
@@ -0,0 +1,72 @@
+# tests/test_core_log_reader.py
+import gzip
+import math
+import os
+import shutil
+
+from core.clock import SimClock
+from core.history import HistoryStore
+from core.log_reader import LogReader, log_files
+from core.logger_csv import CSVEventLogger
+
+def _write_log(path, n, rotate_bytes=None):
+    clk = SimClock(period_s=0.1)
+    log = CSVEventLogger(path=path, rotate_bytes=rotate_bytes)
+    for i in range(n):
+        dev = f"P{i % 3}"
+        if i % 5 == 0:
+            log.log(clk, "WARN", "ALARM", device=dev, key="HI", limit=i)
+        else:
+            log.log(clk, "INFO", "PV", device=dev, point_id=f"{dev}.PV", value=float(i), quality="GOOD")
+        clk.sleep_until_next_scan()
+    log.close()
+
+def test_columns_codes_and_lazy_attrs(tmp_path):
+    path = str(tmp_path / "events.csv")
+    _write_log(path, 50)
+    r = LogReader(path, chunk_rows=16)
+    chunks = list(r.chunks())
+    assert [len(c) for c in chunks] == [16, 16, 16, 2]
+    data = r.read()
+    assert len(data) == 50 and r.rows_kept == 100 #read() streams the files again
+    assert data.mono_ts[:3].tolist() == [0.0, 0.1, 0.2]
+    assert r.categories["event"].names == ["ALARM", "PV"]
+    assert data.column("device")[:4] == ["P0", "P1", "P2", "P0"]
+    assert math.isnan(data.value[0]) and data.value[1] == 1.0
+    assert data.point_id[0] == -1 #empty cell
+    limits = data.attrs("limit")
+    assert limits[0] == 0 and limits[5] == 5 and limits[1] is None
+
+
+def test_attrs_with_non_ascii_keys(tmp_path):
+    path = str(tmp_path / "events.csv")
+    log = CSVEventLogger(path=path)
+    log.log(SimClock(period_s=0.1), "INFO", "PV", device="TT_1", température=21.5)
+    log.close()
+    assert LogReader(path).read().attrs("température") == [21.5]
+
+def test_filters_while_streaming(tmp_path):
+    path = str(tmp_path / "events.csv")
+    _write_log(path, 60)
+    data = LogReader(path, devices={"P1"}, events={"PV"}, t0=1.0, t1=3.0).read()
+    assert set(data.column("device")) == {"P1"} and set(data.column("event")) == {"PV"}
+    assert all(1.0 <= t < 3.0 for t in data.mono_ts)
+    assert len(data) == 5 #i in 10..29 with i % 3 == 1 and i % 5 != 0
+
+def test_rotated_and_gzip_files_read_in_order(tmp_path):
+    path = str(tmp_path / "events.csv")
+    _write_log(path, 120, rotate_bytes=2000)
+    files = log_files(path)
+    assert len(files) > 2 and files[-1] == path
+    with open(files[0], "rb") as src, gzip.open(files[0] + ".gz", "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(files[0])
+    files = log_files(path)
+    assert files[0].endswith(".gz")
+    r = LogReader(path)
+    data = r.read()
+    assert len(data) == 120
+    assert list(data.mono_ts) == sorted(data.mono_ts)
+    store = HistoryStore(capacity=200)
+    assert LogReader(path, devices={"P2"}).load_into(store) == 32
+    assert len(store.tag("P2.PV")) == 32
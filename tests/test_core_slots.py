@@ -0,0 +1,51 @@
+# tests/test_core_slots.py
+import dataclasses
+import tracemalloc
+
+import pytest
+
+from core.commands import ACK_LOCAL, ACK_LOCKED, ACK_OK, Ack, Command, CommandKind, validate_setpoint
+from devices.actuators.pump_actuator import OnOffPump
+from devices.base import Mode
+from plant.plant_core.alarms import Alarm
+from plant.plant_core.commands import Command as PlantCommand, CommandType
+from plant.plant_core.state import MachineState, Transition
+
+def _bytes_per(factory, n=2000):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        objs = [factory(i) for i in range(n)]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    del objs
+    return size / n
+
+def test_hot_objects_have_no_instance_dict():
+    objs = [
+        Command("P1", CommandKind.START),
+        Ack(True),
+        Alarm("A1", "High level"),
+        Transition(MachineState.IDLE, MachineState.STARTING),
+        PlantCommand(CommandType.START, 0.0),
+    ]
+    for o in objs:
+        assert not hasattr(o, "__dict__")
+    assert _bytes_per(lambda i: Command("P1", CommandKind.START, None, "REMOTE", float(i))) < 140  #~88 B object + 24 B float; a __dict__ alone adds ~100 B
+    assert _bytes_per(lambda i: PlantCommand(CommandType.START, float(i))) < 120
+
+def test_constant_acks_are_shared_and_frozen():
+    p = OnOffPump(id="P1")
+    p.set_mode(Mode.LOCKED)
+    assert p.command(Command("P1", CommandKind.START)) is ACK_LOCKED
+    p.set_mode(Mode.LOCAL)
+    assert p.command(Command("P1", CommandKind.START)) is ACK_LOCAL
+    p.set_mode(Mode.REMOTE)
+    assert p.command(Command("P1", CommandKind.START)) is ACK_OK
+    assert p.command(Command("P1", CommandKind.OPEN)) is p.command(Command("P1", CommandKind.CLOSE))
+    assert validate_setpoint(5.0, 0.0, 10.0) is ACK_OK
+    assert validate_setpoint(None, 0.0, 10.0) is validate_setpoint(None, -1.0, 1.0)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        ACK_OK.ok = False
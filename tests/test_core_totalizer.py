@@ -0,0 +1,89 @@
+# tests/test_core_totalizer.py
+from core.point import Quality
+from core.point_types import CounterPoint
+from core.totalizer import Totalizer
+
+
+def test_wraparound_and_bad_quality_intervals():
+    m16 = CounterPoint(id="FQ1", value=65530, ts_mono=0.0)
+    plain = CounterPoint(id="FQ2", value=100, ts_mono=0.0)
+    tot = Totalizer()
+    tot.add("FQ1", m16, wrap_bits=16, scale=0.5)
+    tot.add("FQ2", lambda: plain)
+
+    tot.update(0.0)
+    m16.value = 4          # wrapped: 6 + 4 = 10 counts
+    plain.value = 110
+    tot.update(1.0)
+    assert tot.total("FQ1") == 5.0 and tot.wraps[0] == 1
+    assert tot.total("FQ2") == 10.0
+
+    plain.quality = Quality.BAD; plain.value = 500 # glitch while BAD is not counted
+    tot.update(2.0)
+    plain.quality = Quality.GOOD; plain.value = 505
+    tot.update(3.0)
+    assert tot.total("FQ2") == 10.0 # interval touching the BAD sample excluded
+    plain.value = 515
+    tot.update(4.0)
+    assert tot.total("FQ2") == 20.0
+
+    plain.value = 3 # counter reset without wrap_bits counts nothing
+    tot.update(5.0)
+    assert tot.total("FQ2") == 20.0
+
+
+def test_sliding_window_rates():
+    meter = CounterPoint(id="E1", value=0, ts_mono=0.0)
+    tot = Totalizer(windows_s=(1.0, 60.0, 3600.0))
+    tot.add("E1", meter)
+    t = 0.0
+    tot.update(t)
+    for _ in range(1200): # 120 s at 10 counts/s, 100 ms scans
+        t = round(t + 0.1, 6)
+        meter.value += 1
+        tot.update(t)
+    r = tot.rates("E1", t)
+    assert abs(r["per_s"] - 10.0) < 1e-6
+    assert abs(r["per_min"] - 600.0) < 1e-6
+    assert abs(r["per_h"] - 36000.0) < 1e-6 # window not yet full: averaged over elapsed time
+
+    for _ in range(100): # meter stops for 10 s
+        t = round(t + 0.1, 6)
+        tot.update(t)
+    assert tot.rates("E1", t)["per_s"] == 0.0
+    assert list(tot.rate_array(1.0, t)) == [0.0]
+    assert tot.total("E1") == 1200.0
+
+
+def test_rate_follows_a_step_without_bias():
+    meter = CounterPoint(id="E1", value=0, ts_mono=0.0)
+    tot = Totalizer(windows_s=(1.0, 60.0), buckets=12)
+    tot.add("E1", meter)
+    t = 0.0
+    tot.update(t)
+    for step in (1, 3):  # 10/s for 60 s, then 30/s for 2 s
+        for _ in range(600 if step == 1 else 20):
+            t = round(t + 0.1, 6)
+            meter.value += step
+            tot.update(t)
+    assert abs(tot.rate("E1", 1.0, t) - 30.0) < 1e-6
+    per_min = tot.rate("E1", 60.0, t)
+    assert 10.0 < per_min < 11.0
+
+
+def test_rates_are_anchored_at_now_between_updates():
+    meter = CounterPoint(id="E1", value=0, ts_mono=0.0)
+    tot = Totalizer(windows_s=(1.0, 60.0), buckets=10)
+    tot.add("E1", meter)
+    t = 0.0
+    tot.update(t)
+    for _ in range(100): # 10 s at 10 counts/s, then updates stop
+        t = round(t + 0.1, 6)
+        meter.value += 1
+        tot.update(t)
+    assert abs(tot.rate("E1", 1.0, t) - 10.0) < 1e-6
+    assert abs(tot.rate("E1", 60.0, t + 10.0) - 5.0) < 1e-6 # 100 counts over 20 s
+    assert tot.rate("E1", 1.0, t + 5.0) == 0.0
+    assert list(tot.rate_array(1.0, t + 5.0)) == [0.0]
+    assert 0.0 < tot.rate_array(1.0, t + 0.5)[0] < 10.0
+    assert tot.rate("E1", 1.0, t + 0.5) == tot.rate_array(1.0, t + 0.5)[0]
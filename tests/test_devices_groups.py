@@ -0,0 +1,56 @@
+# tests/test_devices_groups.py
+from core.clock import SimClock
+from core.commands import AckCode, CommandKind
+from devices.actuators.pump_actuator import OnOffPump
+from devices.base import Mode
+from devices.groups import ACK_CODES, MODES, DeviceGroups
+from devices.sensors.sensor_level import SensorLevel
+
+
+def make_plant():
+    devices = []
+    for station in range(1, 4):
+        for k in range(4):
+            devices.append(OnOffPump(id=f"ST{station}:P_{k}", meta={"station": station}))
+        devices.append(SensorLevel(id=f"ST{station}:LT_1", meta={"station": station}))
+    return devices
+
+
+def test_groups_by_pattern_meta_and_ids():
+    groups = DeviceGroups(make_plant())
+    assert groups.define("pumps", pattern="*:P_*") == 12
+    assert groups.define("station3", meta={"station": 3}) == 5
+    assert groups.define("st3_pumps", pattern="*:P_*", meta={"station": 3}) == 4
+    assert groups.define("pair", ids=["ST1:P_0", "ST2:P_0"]) == 2
+    groups.add_device(OnOffPump(id="ST3:P_9", meta={"station": 3})) # joins matching groups
+    assert len(groups.members("st3_pumps")) == 5 and len(groups.members("pair")) == 2
+
+
+def test_bulk_mode_command_and_status_keep_arbitration():
+    groups = DeviceGroups(make_plant())
+    groups.define("pumps", pattern="*:P_*")
+    groups.define("station2", meta={"station": 2})
+    groups.define("locked", ids=["ST1:P_1"])
+    groups.set_mode("station2", Mode.LOCAL)
+    groups.set_mode("locked", Mode.LOCKED)
+
+    res = groups.command("pumps", CommandKind.START, ts_mono=0.0)
+    codes = [ACK_CODES[c] for c in res.codes]
+    assert sum(res.ok) == 7
+    assert set(res.rejected()) == {"ST1:P_1", "ST2:P_0", "ST2:P_1", "ST2:P_2", "ST2:P_3"}
+    assert codes[res.ids.index("ST1:P_1")] == AckCode.CONFLICT
+    assert codes[res.ids.index("ST1:P_0")] == AckCode.OK
+
+    unsupported = groups.command("pumps", CommandKind.SETPOINT, value=3.0)
+    assert ACK_CODES[unsupported.codes[res.ids.index("ST3:P_0")]] == AckCode.INVALID
+    groups.command("pumps", CommandKind.START)
+
+    clk = SimClock(0.1)
+    for d in groups.members("pumps"):
+        d.update(clk)
+    st = groups.status("station2")
+    assert [MODES[m] for m in st.modes] == [Mode.LOCAL] * 5
+    assert [st.state_of(i) for i in range(5)] == ["OFF"] * 4 + [None] # LOCAL pumps never got START
+    running = groups.status("pumps")
+    assert sum(running.state_of(i) == "RUNNING" for i in range(len(running.ids))) == 7
+    assert all(running.permissives_ok) and all(running.interlocks_ok)
@@ -0,0 +1,50 @@
+# tests/test_devices_signal_bank.py
+import math
+
+from core.clock import SimClock
+from core.point import Quality
+from devices.sensors.sensor_level import SensorLevel
+from devices.sensors.signal_bank import SignalBank
+
+
+def test_deterministic_shapes_and_sensor_binding():
+    bank = SignalBank(seed=1)
+    step = bank.add_channel(base=1.0, step_at=1.0, step_size=0.5)
+    ramp = bank.add_channel(ramp_at=0.5, ramp_per_s=2.0)
+    sine = bank.add_channel(base=10.0, sine_amp=1.0, sine_period_s=4.0)
+
+    clk = SimClock(0.5)
+    lt = SensorLevel(id="LT_1", read_fn=bank.reader(step), deadband_abs=0.0, min_interval_s=0.0)
+    for _ in range(3): # t = 0.0, 0.5, 1.0
+        bank.sample(clk.now())
+        lt.update(clk)
+        last_t = clk.now()
+        clk.sleep_until_next_scan()
+
+    assert last_t == 1.0
+    assert bank.values[step] == 1.5 and lt.point.value == 1.5
+    assert bank.values[ramp] == 1.0
+    assert abs(bank.values[sine] - (10.0 + math.sin(math.pi / 2))) < 1e-12
+
+
+def test_noise_is_seeded_per_channel_and_dropout_reads_bad():
+    a = SignalBank(seed=7)
+    a.add_channel(base=5.0, noise_sd=0.1)
+    b = SignalBank(seed=7)
+    b.add_channel(base=5.0, noise_sd=0.1)
+    b.add_channel(base=0.0, noise_sd=1.0, spike_prob=0.5, spike_size=10.0) # extra channel
+    series_a = [a.sample(t)[0] for t in range(50)]
+    series_b = [b.sample(t)[0] for t in range(50)]
+    assert series_a == series_b # other channels don't disturb the stream
+    assert len(set(series_a)) == 50 and abs(sum(series_a) / 50 - 5.0) < 0.1
+
+    bank = SignalBank()
+    ch = bank.add_channel(base=2.0)
+    s = SensorLevel(id="LT_2", read_fn=bank.reader(ch))
+    clk = SimClock(0.5)
+    bank.sample(clk.now()); s.update(clk)
+    clk.sleep_until_next_scan()
+    bank.set(ch, dropout_prob=1.0) # inject a dead transmitter
+    bank.sample(clk.now()); s.update(clk)
+    assert math.isnan(bank.values[ch])
+    assert s.point.quality == Quality.BAD and s.point.value == 2.0
@@ -0,0 +1,69 @@
+# tests/test_plant_core_alarm_rules.py
+from core.clock import SimClock
+from devices.sensors.sensor_level import SensorLevel
+from plant.plant_core.alarm_rules import AlarmRules, AnalogAlarm
+from plant.plant_core.alarms import AlarmPanel
+
+def _plant(*alarms):
+    val = {"h": 0.0}
+    panel = AlarmPanel()
+    rules = AlarmRules(panel)
+    s = SensorLevel(id="LT_101", read_fn=lambda: val["h"], eu="m", min_interval_s=0.0,
+                    on_publish=rules.on_publish)
+    rules.add("LT_101", s, *alarms)
+    return val, s, rules, panel
+
+def _scan(s, rules, clk):
+    s.update(clk)
+    edges = rules.update(clk.now())
+    clk.sleep_until_next_scan()
+    return edges
+
+def test_deadband_and_edges_only():
+    val, s, rules, panel = _plant(
+        AnalogAlarm("LT_101.HI", "HI", limit=8.0, deadband=0.5, latching=False),
+        AnalogAlarm("LT_101.LO", "LO", limit=2.0, deadband=0.5, latching=False),
+    )
+    clk = SimClock(0.1)
+    seen = []
+    for h in (5.0, 8.0, 7.8, 7.6, 7.5, 2.0, 2.4, 2.5):
+        val["h"] = h
+        seen.append(_scan(s, rules, clk))
+    assert seen == [[], [("LT_101.HI", True)], [], [], [("LT_101.HI", False)],
+                    [("LT_101.LO", True)], [], [("LT_101.LO", False)]]
+    assert not panel.alarms["LT_101.HI"].active and not panel.alarms["LT_101.LO"].active
+    #no change published -> nothing evaluated
+    n = rules.evaluations
+    for _ in range(20):
+        _scan(s, rules, clk)
+    assert rules.evaluations == n
+
+def test_on_off_delays_fire_from_timers():
+    val, s, rules, panel = _plant(AnalogAlarm("LT_101.HIHI", "HIHI", limit=9.0, on_delay_s=1.0, off_delay_s=0.5))
+    clk = SimClock(0.25)
+    val["h"] = 9.5
+    t_on = None
+    for _ in range(15):
+        if _scan(s, rules, clk):
+            t_on = panel.alarms["LT_101.HIHI"].first_t
+    assert t_on == 1.0   #condition since t=0, held 1 s without new samples
+    #a short dip does not clear it
+    val["h"] = 8.0; _scan(s, rules, clk)
+    val["h"] = 9.5; _scan(s, rules, clk)
+    for _ in range(10):
+        _scan(s, rules, clk)
+    assert rules.state("LT_101.HIHI") is True
+    val["h"] = 8.0
+    edges = [e for _ in range(7) for e in _scan(s, rules, clk)]
+    assert edges == [("LT_101.HIHI", False)]
+
+def test_panel_apply_unlatches_acked_alarm_without_new_edges():
+    val, s, rules, panel = _plant(AnalogAlarm("LT_101.HI", "HI", limit=8.0))
+    clk = SimClock(0.1)
+    val["h"] = 9.0; _scan(s, rules, clk)
+    val["h"] = 1.0; _scan(s, rules, clk)
+    a = panel.alarms["LT_101.HI"]
+    assert a.latched and not a.active
+    a.ack()
+    assert _scan(s, rules, clk) == []
+    assert not a.latched and not a.acked
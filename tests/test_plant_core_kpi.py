@@ -0,0 +1,50 @@
+# tests/test_plant_core_kpi.py
+import math
+
+from plant.plant_core.kpi import EquipmentKPIs
+from plant.plant_core.state import Lifecycle, MachineState
+
+def test_kpis_per_mechanism():
+    kpi = EquipmentKPIs(windows_s=(100.0,), buckets=10)
+    lc = Lifecycle()
+    kpi.attach("P1", lc)
+    lc.request_start(t=10.0); lc.confirm_started(t=12.0)    # 2 s start
+    lc.trip_fault(t=42.0, reason="Over Temp")               # 30 s run
+    lc.clear_fault(t=52.0)                                  # 10 s fault
+    lc.request_start(t=60.0); lc.confirm_started(t=64.0)    # 4 s start
+    lc.request_stop(t=84.0); lc.confirm_stopped(t=85.0)     # 20 s run, 1 s stop
+
+    k = kpi.kpis("P1", 100.0, now=99.0)
+    assert k["starts"] == 2 and k["mean_start_s"] == 3.0
+    assert k["stops"] == 1 and k["mean_stop_s"] == 1.0
+    assert k["faults"] == 1 and k["mtbf_s"] == 50.0
+    assert math.isclose(k["uptime"], 50.0 / 99.0) and math.isclose(k["availability"], 89.0 / 99.0)
+
+    # 150 s later the first 50 s (fault included) rolled out of the window
+    k = kpi.kpis("P1", 100.0, now=150.0)
+    assert k["faults"] == 0 and k["starts"] == 1
+    assert math.isclose(k["run_s"], 20.0) and k["availability"] == 1.0
+
+def test_kpis_plant_wide_is_time_weighted():
+    kpi = EquipmentKPIs(windows_s=(3600.0,))
+    fleet = [Lifecycle() for _ in range(1000)]
+    for i, lc in enumerate(fleet):
+        kpi.attach(f"M{i}", lc)
+        if i % 4 == 0: # a quarter of the fleet runs the whole time
+            lc.request_start(t=0.0); lc.confirm_started(t=0.0)
+    fleet[1].trip_fault(t=1800.0)
+
+    p = kpi.plant(3600.0, now=3599.0)
+    assert math.isclose(p["uptime"], 0.25)
+    assert math.isclose(p["availability"], 1.0 - 1799.0 / (1000 * 3599.0))
+    assert p["faults"] == 1 and p["starts"] == 250
+
+
+def test_attach_keeps_existing_transition_hooks():
+    seen = []
+    lc = Lifecycle(on_transition=seen.append, enter_at=5.0)
+    kpi = EquipmentKPIs(windows_s=(100.0,), buckets=10)
+    kpi.attach("P1", lc)
+    lc.request_start(t=6.0); lc.confirm_started(t=8.0)
+    assert [tr.to_state for tr in seen] == [MachineState.STARTING, MachineState.RUNNING]
+    assert kpi.kpis("P1", 100.0, now=8.0)["starts"] == 1
@@ -0,0 +1,58 @@
+# tests/test_plant_core_staleness.py
+from core.clock import SimClock
+from core.point import Quality
+from devices.sensors.sensor_level import SensorLevel
+from plant.plant_core.alarms import AlarmPanel
+from plant.plant_core.staleness import StalenessWatchdog, TimingWheel
+
+
+def test_timing_wheel_fires_on_time_across_levels():
+    wheel = TimingWheel(tick_s=1.0)
+    for due in (1, 255, 256, 300, 20_000, 2_000_000):
+        wheel.schedule(due, due)
+    fired = {}
+    for t in list(range(1, 2_000_000, 997)) + [2_000_000]: # coarse advances still fire in the right call
+        for key in wheel.advance(t):
+            fired[key] = t
+    for key, t in fired.items():
+        assert key <= t < key + 997
+    assert len(fired) == 6
+
+
+def test_timing_wheel_fires_exactly_at_level_boundaries():
+    for due in (256, 512, 16_384, 3 * 16_384, 1 << 20): # one per level wrap
+        wheel = TimingWheel(tick_s=1.0)
+        wheel.schedule(due, "k")
+        assert wheel.advance(due - 1) == []
+        assert wheel.advance(due) == ["k"]
+
+
+def test_watchdog_marks_stale_alarms_and_recovers():
+    panel = AlarmPanel()
+    published = []
+    wd = StalenessWatchdog(tick_s=0.1, on_stale=lambda p, now: published.append((p.id, p.quality, now)), alarms=panel)
+
+    value = {"h": 1.0}
+    s = SensorLevel(id="LT_1", read_fn=lambda: value["h"], deadband_abs=0.05, min_interval_s=0.0,
+                    on_publish=lambda p, now: wd.touch(p.id, now))
+    wd.watch("LT_1", lambda: s.point, max_age_s=2.0, alarm_key="LT_1:STALE")
+    for i in range(1000): # quiet tags cost nothing per scan
+        wd.watch(f"QUIET_{i}", None, max_age_s=3600.0)
+
+    clk = SimClock(0.1)
+    for _ in range(15): # value keeps changing -> keeps publishing
+        value["h"] += 0.1
+        s.update(clk); wd.advance(clk.now()); clk.sleep_until_next_scan()
+    assert not wd.is_stale("LT_1") and wd.expiries == 0
+
+    for _ in range(25): # device stops updating (comms lost) -> no samples for > 2 s
+        wd.advance(clk.now()); clk.sleep_until_next_scan()
+    assert wd.is_stale("LT_1") and wd.expiries == 1
+    assert s.point.quality == Quality.STALE
+    assert published and published[0][:2] == ("LT_1", Quality.STALE)
+    assert panel.alarms["LT_1:STALE"].active
+
+    # next GOOD sample republishes on the quality change, which clears it
+    s.update(clk); wd.advance(clk.now())
+    assert s.point.quality == Quality.GOOD
+    assert not wd.is_stale("LT_1") and not panel.alarms["LT_1:STALE"].active
@@ -33,3 +33,15 @@ def test_state_fault_and_clear():
     assert lc.request_start(t=4.0) is None
     tr_clear = lc.clear_fault(t=5.0)
     assert tr_clear and lc.state == MachineState.IDLE
+
+def test_state_history_ring_and_hook():
+    seen = []
+    lc = Lifecycle(on_transition=seen.append)
+    for k in range(40):
+        t = 4.0 * k
+        lc.request_start(t=t + 1); lc.confirm_started(t=t + 2)
+        lc.request_stop(t=t + 3); lc.confirm_stopped(t=t + 4)
+    assert len(seen) == 160 and len(lc.history) == 32
+    assert lc.history[-1].to_state == MachineState.STOPPED and lc.history[-1].t == 160.0
+    assert lc.enter_at == lc.entered_at == 160.0
+    assert lc.time_in_state(165.0) == 5.0
@@ -0,0 +1,70 @@
+# tests/test_runtime_acquisition.py
+import threading
+import time
+
+from core.clock import SimClock
+from core.point import Quality
+from devices.sensors.sensor_level import SensorLevel
+from runtime.acquisition import BulkInputStage
+
+
+def test_block_reads_feed_sensors_and_hung_source_goes_stale():
+    plc = {"LT1": 1.0, "LT2": 2.0}
+    block_calls = []
+    def read_plc(addrs):
+        block_calls.append(addrs)
+        return [plc[a] for a in addrs]
+
+    release = threading.Event()
+    gw = {"hang": False, "val": 5.0}
+    def read_gateway(addrs):
+        if gw["hang"]:
+            release.wait(2.0)
+        return [gw["val"] for _ in addrs]
+
+    stage = BulkInputStage(deadline_s=0.05, max_workers=2)
+    try:
+        stage.add_source("plc", read_plc)
+        stage.add_source("gw", read_gateway)
+        s1 = SensorLevel(id="LT1", read_fn=stage.bind("plc", "LT1"), min_interval_s=0.0)
+        s2 = SensorLevel(id="LT2", read_fn=stage.bind("plc", "LT2"), min_interval_s=0.0)
+        s3 = SensorLevel(id="LT3", read_fn=stage.bind("gw", "LT3"), min_interval_s=0.0)
+        sensors = (s1, s2, s3)
+
+        clk = SimClock(0.1)
+        stage.scan()
+        for s in sensors: s.update(clk)
+        assert [s.point.value for s in sensors] == [1.0, 2.0, 5.0]
+        assert block_calls == [("LT1", "LT2")] # one call for the whole source
+
+        gw["hang"] = True
+        gw["val"] = 9.0
+        for _ in range(3):
+            clk.sleep_until_next_scan()
+            t0 = time.monotonic()
+            stage.scan()
+            assert time.monotonic() - t0 < 0.2 # bounded by the deadline, not the hung read
+            for s in sensors: s.update(clk)
+
+        assert s3.point.quality == Quality.STALE and s3.point.value == 5.0
+        assert s1.point.quality == Quality.GOOD
+        st = stage.stats()
+        assert st["gw"]["timeouts"] == 3 and st["gw"]["hung"] is True
+        assert st["plc"]["timeouts"] == 0 and st["plc"]["reads"] == 4
+    finally:
+        release.set()
+        stage.close()
+
+
+def test_failed_block_read_marks_bad():
+    def broken(addrs): raise ConnectionError("refused")
+    stage = BulkInputStage(deadline_s=0.05)
+    try:
+        stage.add_source("rtu", broken, blocking=False)
+        s = SensorLevel(id="FT1", read_fn=stage.bind("rtu", "FT1"))
+        stage.scan()
+        s.update(SimClock(0.1))
+        assert s.point.quality == Quality.BAD
+        assert stage.stats()["rtu"]["errors"] == 1
+    finally:
+        stage.close()
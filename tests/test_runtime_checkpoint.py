@@ -0,0 +1,117 @@
+# tests/test_runtime_checkpoint.py
+from core.clock import SimClock
+from core.commands import Command as DeviceCommand, CommandKind
+from core.policies import LatchedTrip, dwell_ok
+from devices.actuators.pump_actuator import OnOffPump
+from devices.sensors.sensor_level import SensorLevel
+from plant.plant_core.alarms import Alarm, AlarmPanel, Severity
+from plant.plant_core.commands import Command, CommandQueue, CommandType
+from plant.plant_core.state import Lifecycle, MachineState
+from runtime.checkpoint import Checkpointer, load
+
+
+class Cell:
+    """Everything a warm restart has to bring back."""
+    def __init__(self, level):
+        self.sensor = SensorLevel(id="LT_1", read_fn=lambda: level["v"], deadband_abs=0.01, min_interval_s=0.0)
+        self.pump = OnOffPump(id="P_1")
+        self.alarms = AlarmPanel()
+        self.alarms.add(Alarm("trip", "Pump trip", Severity.TRIP, latching=True))
+        self.lc = Lifecycle()
+        self.trip = LatchedTrip()
+        self.queue = CommandQueue(debounce_s=1.0)
+        self.dwell_since = None
+
+    def track(self, ckpt):
+        ckpt.track("LT_1", self.sensor, poll=True)
+        ckpt.track("P_1", self.pump, poll=True)
+        ckpt.track("alarms", self.alarms, poll=True)
+        ckpt.track("lc", self.lc, poll=True)
+        ckpt.track("trip", self.trip, poll=True)
+        ckpt.track("queue", self.queue, poll=True)
+        ckpt.track_state("dwell", lambda: [self.dwell_since],
+                         lambda s: setattr(self, "dwell_since", s[0]), poll=False)
+
+
+def test_warm_restart_restores_state(tmp_path):
+    path = str(tmp_path / "plant.ckpt")
+    level = {"v": 2.0}
+    cell = Cell(level)
+    ckpt = Checkpointer(path, interval_s=1.0, compact_after=3)
+    cell.track(ckpt)
+
+    clk = SimClock(0.5)
+    cell.pump.command(DeviceCommand("P_1", CommandKind.START))
+    for i in range(10):
+        level["v"] += 0.5
+        cell.sensor.update(clk); cell.pump.update(clk)
+        cell.alarms.update({"trip": i == 3}, clk.now())
+        _, cell.dwell_since = dwell_ok(True, cell.dwell_since, clk.now(), 1000.0)
+        if i == 2:
+            cell.lc.request_start(clk.now()); cell.lc.confirm_started(clk.now())
+            cell.trip.eval(True)
+            cell.queue.push(Command(CommandType.STOP, clk.now(), note="queued"))
+            ckpt.mark_dirty("dwell")
+        ckpt.maybe_capture(clk.now())
+        clk.sleep_until_next_scan()
+    ckpt.flush(); ckpt.close()
+
+    fresh = Cell({"v": 0.0})
+    ckpt2 = Checkpointer(path)
+    fresh.track(ckpt2)
+    t = ckpt2.restore()
+    assert t == 4.0 # captures every 1 s: the 4.5 s scan isn't in the checkpoint
+    assert fresh.sensor.point.value == 6.5 and fresh.sensor.point.ts_mono == 4.0
+    assert fresh.pump.state == "RUNNING" and fresh.pump._last_cmd.kind == CommandKind.START
+    assert fresh.alarms.alarms["trip"].latched and not fresh.alarms.alarms["trip"].active
+    assert fresh.lc.state == MachineState.RUNNING and fresh.lc.entered_at == 1.0
+    assert fresh.trip.eval(False)
+    assert fresh.queue.pop().note == "queued" and not fresh.queue.push(Command(CommandType.START, 1.5))
+    assert fresh.dwell_since == 0.0
+    ckpt2.close()
+
+
+def test_checkpoint_cost_follows_changes_and_compacts(tmp_path):
+    path = str(tmp_path / "big.ckpt")
+    alarms = AlarmPanel()
+    for i in range(500):
+        alarms.add(Alarm(f"A{i}", "alarm", latching=False))
+    ckpt = Checkpointer(path, interval_s=0.0, compact_after=4)
+    ckpt.track("alarms", alarms, poll=False)
+    assert ckpt.capture(0.0) == 500 # first checkpoint is full
+    for t in range(1, 10):
+        alarms.alarms[f"A{t}"].update(True, float(t))
+        ckpt.mark_dirty(f"alarms/A{t}")
+        assert ckpt.capture(float(t)) == 1
+    assert ckpt.capture(10.0) == 0
+    ckpt.flush(); ckpt.close()
+
+    with open(path + ".log") as f:
+        assert len(f.readlines()) == 2 # 10 records, compacted every 4
+    with open(path + ".log", "a") as f:
+        f.write('{"seq": 99, "t"') # torn write at crash time
+    snap = load(path)
+    assert snap["seq"] == 10 and snap["state"]["alarms/A9"][0] is True
+
+
+def test_restart_after_torn_write_keeps_new_records(tmp_path):
+    path = str(tmp_path / "plant.ckpt")
+    trip = LatchedTrip()
+    ckpt = Checkpointer(path, interval_s=0.0)
+    ckpt.track("trip", trip, poll=True)
+    ckpt.capture(0.0)
+    ckpt.flush(); ckpt.close()
+    with open(path + ".log", "a") as f:
+        f.write('{"seq": 2, "t"') # torn write at crash time
+
+    ckpt = Checkpointer(path, interval_s=0.0)
+    ckpt.track("trip", trip, poll=True)
+    ckpt.restore()
+    trip.eval(True)
+    ckpt.capture(1.0)
+    ckpt.flush(); ckpt.close()
+
+    with open(path + ".log") as f:
+        assert all(line.endswith("}\n") for line in f)
+    snap = load(path)
+    assert snap["seq"] == 2 and snap["state"]["trip"] == [True]
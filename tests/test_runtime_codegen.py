@@ -0,0 +1,98 @@
+# tests/test_runtime_codegen.py
+import math
+import random
+
+from core.clock import SimClock
+from core.commands import Command, CommandKind
+from core.point import StaleRead
+from core.policy_points import threshold_ge
+from devices.actuators.pump_actuator import OnOffPump
+from devices.sensors.sensor_level import SensorLevel
+from runtime.codegen import compile_scan, differential_check
+from runtime.plant_image import PlantImage
+
+
+class TracedSensor(SensorLevel):
+    """Subclass: must go through its own update(), not the inlined code."""
+
+
+def build_hand_wired():
+    rng = random.Random(7)
+    inputs = [5.0] * 6
+    published = []
+
+    def reader(i):
+        def read():
+            v = inputs[i]
+            if v == -1.0:
+                raise StaleRead("late")
+            if v == -2.0:
+                raise IOError("comm fail")
+            return v
+        return read
+
+    devices = []
+    for i in range(6):
+        cls = TracedSensor if i == 5 else SensorLevel
+        s = cls(id=f"LT_{i}", read_fn=reader(i), deadband_abs=0.05 if i % 2 else None,
+                deadband_pct=2.0 if i % 3 == 0 else None, min_interval_s=0.3 * (i % 3),
+                on_publish=lambda p, now: published.append((p.id, now)))
+        p = OnOffPump(id=f"P_{i}")
+        p.add_permissive(lambda s=s: threshold_ge(s.point, 2.0))
+        p.add_interlock(lambda s=s: s.point.value < 9.0)
+        devices += [s, p]
+
+    def step(i, now):
+        for k in range(6):
+            r = rng.random()
+            inputs[k] = -1.0 if r < 0.05 else -2.0 if r < 0.08 else float("nan") if r < 0.1 else rng.uniform(0.0, 10.0)
+        if i % 7 == 0:
+            for p in devices[1::2]:
+                p.command(Command(p.id, CommandKind.STOP if p.state == "RUNNING" else CommandKind.START))
+    return devices, step
+
+
+def build_from_image():
+    cfg = {"devices": [], "alarms": []}
+    for i in range(20):
+        cfg["devices"].append({"id": f"LT_{i}", "type": "level_sensor", "cov": {"deadband_abs": 0.1, "min_interval_s": 0.5}})
+        cfg["devices"].append({"id": f"P_{i}", "type": "onoff_pump",
+                               "permissives": [{"tag": f"LT_{i}", "op": ">=", "value": 1.0}],
+                               "interlocks": [{"tag": f"LT_{i}", "op": "<", "value": 9.5}]})
+    t = {"now": 0.0}
+    reads = {f"LT_{i}": (lambda i=i: 5.0 + 5.0 * math.sin(t["now"] * (0.1 + i / 10))) for i in range(20)}
+    plant = PlantImage.from_config(cfg).instantiate(reads)
+    devices = list(plant.devices.values())
+
+    def step(i, now):
+        t["now"] = now
+        if i % 11 == 0:
+            for p in devices[1::2]:
+                p.command(Command(p.id, CommandKind.STOP if p.state == "RUNNING" else CommandKind.START))
+    return devices, step
+
+
+def test_generated_scan_matches_generic_path():
+    assert differential_check(build_hand_wired, 300, lambda: SimClock(0.1)) == []
+    assert differential_check(build_from_image, 300, lambda: SimClock(0.1)) == []
+
+
+def test_generated_source_inlines_specialized_devices():
+    devices, _ = build_from_image()
+    src = compile_scan(devices).source
+    assert ".update(" not in src and "threshold_ge" not in src
+    assert '.point.value >= 1.0' in src # plant image rules become direct comparisons
+
+    hand, _ = build_hand_wired()
+    src = compile_scan(hand).source
+    assert src.count("(clk)\n") == 1 # only the subclass falls back to its own update()
+
+
+def test_device_ids_cannot_inject_code():
+    evil = "LT_1\nraise SystemExit('injected')"
+    s = SensorLevel(id=evil, read_fn=lambda: 1.0, min_interval_s=0.0)
+    p = OnOffPump(id=evil + "\r")
+    scan = compile_scan([s, p])
+    assert "\nraise SystemExit" not in scan.source
+    scan(SimClock(0.1))
+    assert s.point.value == 1.0
@@ -0,0 +1,63 @@
+# tests/test_runtime_host.py
+from plant.mechanisms.dummy import DummyMechanism
+from runtime.host import TenantHost
+
+
+class DictIO:
+    def __init__(self): self.tags = {}
+    def read(self, tag, default=None): return self.tags.get(tag, default)
+    def write(self, tag, value): self.tags[tag] = value
+
+
+def test_host_runs_independent_dummy_plants_on_own_clocks():
+    host = TenantHost()
+    plants = {}
+    for i in range(50):
+        io = DictIO()
+        mech = DummyMechanism(id=f"D{i}", io=io)
+        plants[f"T{i}"] = (mech, io)
+        host.add(f"T{i}", lambda clk, m=mech: m.tick(clk, 0.1), period_s=0.1, offset_s=(i % 10) * 0.01)
+
+    plants["T7"][1].tags["DUMMY:ENABLE_CMD"] = True
+    scans = host.run_for(1.0, realtime=False)
+
+    assert scans == 50 * 10
+    assert plants["T7"][1].tags["DUMMY:RUN_FB"] is True
+    assert plants["T8"][1].tags["DUMMY:RUN_FB"] is False
+    t7 = host.tenant("T7")
+    assert t7.scans == 10 and abs(t7.clock.now() - 1.0) < 1e-9
+    assert all(st["late_scans"] == 0 for st in host.stats())
+
+
+def test_host_budget_is_fair_and_tracks_lateness():
+    host = TenantHost(max_scans_per_pass=2)
+    for name in ("A", "B", "C", "D"):
+        host.add(name, lambda clk: None, period_s=1.0)
+
+    assert host.run_due(0.0) == 2
+    first = {st["id"] for st in host.stats() if st["scans"] == 1}
+    # the two tenants that haven't used CPU yet go first in the next pass, and are late
+    assert host.run_due(0.5) == 2
+    second = {st["id"] for st in host.stats() if st["scans"] == 1} - first
+    assert second and second.isdisjoint(first)
+    assert all(host.tenant(t).late_scans == 1 for t in second)
+
+    # a host that falls far behind skips ticks instead of catching up
+    host.run_due(5.2)
+    ran = [host.tenant(st["id"]) for st in host.stats() if st["scans"] == 2]
+    assert len(ran) == 2
+    assert all(t.missed_ticks == 4 and t.next_due == 6.0 for t in ran)
+
+
+def test_deferred_tenant_runs_first_next_pass():
+    host = TenantHost(max_scans_per_pass=1)
+    heavy = host.add("heavy", lambda clk: None, period_s=1.0)
+    light = host.add("light", lambda clk: None, period_s=1.0)
+    heavy.cpu_s = 5.0
+
+    assert host.run_due(0.0) == 1
+    assert light.scans == 1 and heavy.scans == 0 and heavy.deferred
+    # both due again; the leftover goes ahead of the lighter tenant
+    assert host.run_due(1.0) == 1
+    assert heavy.scans == 1 and heavy.late_scans == 1 and light.scans == 1
+    assert not heavy.deferred and light.deferred
@@ -0,0 +1,104 @@
+# tests/test_runtime_plant_image.py
+import json
+
+import pytest
+
+from core.clock import SimClock
+from core.commands import Command, CommandKind
+from devices.base import Mode
+from runtime import plant_image
+from runtime.plant_image import ConfigError, PlantImage, load_or_compile
+
+CONFIG = {
+    "devices": [
+        {"id": "LT_1", "type": "level_sensor", "eu": "m", "cov": {"deadband_abs": 0.05, "min_interval_s": 0.0}},
+        {"id": "P_1", "type": "onoff_pump",
+         "permissives": [{"tag": "LT_1", "op": ">=", "value": 1.0}],
+         "interlocks": [{"tag": "LT_1", "op": "<", "value": 9.0}]},
+        {"id": "P_2", "type": "onoff_pump", "mode": "LOCAL"},
+    ],
+    "alarms": [
+        {"key": "LT_1:HI", "text": "Level high", "severity": "WARN", "latching": False,
+         "tag": "LT_1", "op": ">", "value": 8.0},
+    ],
+}
+
+
+def test_image_round_trip_builds_a_working_plant():
+    level = {"v": 0.5}
+    img = PlantImage.from_config(CONFIG)
+    assert img.device_ids == ["LT_1", "P_1", "P_2"] and len(img.content_hash) == 64
+    plant = img.instantiate({"LT_1": lambda: level["v"]})
+    lt, p1, p2 = (plant.devices[k] for k in ("LT_1", "P_1", "P_2"))
+    assert lt.cov.deadband_abs == 0.05 and lt.cov.deadband_pct is None
+    assert p2.mode == Mode.LOCAL and not p2.command(Command("P_2", CommandKind.START)).ok
+
+    clk = SimClock(0.1)
+    p1.command(Command("P_1", CommandKind.START))
+    lt.update(clk); p1.update(clk)
+    assert p1.state == "OFF"            # permissive: level below 1.0
+    level["v"] = 5.0; clk.tick()
+    lt.update(clk); p1.update(clk)
+    assert p1.state == "RUNNING"
+    level["v"] = 8.5; clk.tick()
+    lt.update(clk); p1.update(clk)
+    plant.alarms.update(plant.signals(), clk.now())
+    assert p1.state == "RUNNING" and plant.alarms.alarms["LT_1:HI"].active
+    level["v"] = 9.5; clk.tick()
+    lt.update(clk); p1.update(clk)
+    assert p1.state == "FAULT"          # interlock
+
+
+@pytest.mark.parametrize("bad, msg", [
+    ({"devices": []}, "non-empty"),
+    ({"devices": [{"id": "A", "type": "level_sensor"}, {"id": "A", "type": "level_sensor"}]}, "duplicate"),
+    ({"devices": [{"id": "P", "type": "onoff_pump", "interlocks": [{"tag": "X", "op": "<", "value": 1}]}]}, "not a configured sensor"),
+    ({"devices": [{"id": "L", "type": "level_sensor"}], "alarms": [{"key": "K", "tag": "L", "op": "~", "value": 1}]}, "unknown op"),
+    ({"devices": [{"id": "L", "type": "level_sensor"}], "alarms": [{"key": "K", "tag": "L", "op": ">"}]}, "value is missing"),
+    ({"devices": [{"id": "L", "type": "level_sensor"}], "alarms": [{"key": "K", "tag": "L", "op": ">", "value": float("inf")}]}, "finite"),
+    ({"devices": ["L"]}, "must be an object"),
+    ({"devices": [{"id": "L", "type": "level_sensor"}], "alarms": [["K"]]}, "must be an object"),
+    ({"devices": [{"id": "L", "type": "level_sensor", "eu": 3}]}, "eu must be a string"),
+    ({"devices": [{"id": "L", "type": "level_sensor"}], "alarms": [{"key": "K", "text": ["hi"], "tag": "L", "op": ">", "value": 1}]}, "text must be a string"),
+    ({"devices": [{"id": "L", "type": "level_sensor"}], "alarms": [{"key": "K", "latching": "false", "tag": "L", "op": ">", "value": 1}]}, "latching must be true or false"),
+])
+def test_invalid_configs_are_rejected(bad, msg):
+    with pytest.raises(ConfigError, match=msg):
+        plant_image.compile_config(bad)
+
+
+def test_load_or_compile_reuses_cache_until_config_changes(tmp_path, monkeypatch):
+    cfg = tmp_path / "plant.json"
+    cache = tmp_path / "cache"
+    cfg.write_text(json.dumps(CONFIG))
+    calls = []
+    real = plant_image.compile_config
+    monkeypatch.setattr(plant_image, "compile_config", lambda c: calls.append(1) or real(c))
+
+    first = load_or_compile(str(cfg), str(cache))
+    again = load_or_compile(str(cfg), str(cache))
+    assert len(calls) == 1 and again.content_hash == first.content_hash
+
+    changed = dict(CONFIG, alarms=[])
+    cfg.write_text(json.dumps(changed))
+    third = load_or_compile(str(cfg), str(cache))
+    assert len(calls) == 2 and third.content_hash != first.content_hash
+    assert len(list(cache.glob("*.otimg"))) == 2
+
+    cfg.write_text(json.dumps(dict(CONFIG, alarms=[dict(CONFIG["alarms"][0], value=float("nan"))])))
+    with pytest.raises(ConfigError, match="NaN"):
+        load_or_compile(str(cfg), str(cache))
+
+
+def test_truncated_cached_image_is_recompiled(tmp_path):
+    cfg = tmp_path / "plant.json"
+    cache = tmp_path / "cache"
+    cfg.write_text(json.dumps(CONFIG))
+    first = load_or_compile(str(cfg), str(cache))
+    [cached] = cache.glob("*.otimg")
+    data = cached.read_bytes()
+    cached.write_bytes(data[:len(data) - 12])
+
+    again = load_or_compile(str(cfg), str(cache))
+    assert again.content_hash == first.content_hash and again.device_ids == first.device_ids
+    assert cached.read_bytes() == data
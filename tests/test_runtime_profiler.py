@@ -0,0 +1,61 @@
+# tests/test_runtime_profiler.py
+import json
+import time
+
+from core.clock import SimClock
+from devices.sensors.sensor_level import SensorLevel
+from runtime.profiler import ScanProfiler
+
+
+def test_profiler_timers_and_window_export(tmp_path):
+    metrics = tmp_path / "metrics.jsonl"
+    prof = ScanProfiler(window_scans=10, metrics_path=str(metrics))
+    sensors = [SensorLevel(id=f"LT_{i}", read_fn=lambda: 1.0) for i in range(3)]
+    clk = SimClock(0.1)
+    for _ in range(20):
+        prof.begin_scan()
+        with prof.timer("phase/inputs"):
+            for s in sensors:
+                prof.update(s, clk)
+        prof.record("phase/logic", 0.002)
+        prof.end_scan()
+        clk.sleep_until_next_scan()
+
+    lines = [json.loads(l) for l in metrics.read_text().splitlines()]
+    assert [l["kind"] for l in lines] == ["window", "window"]
+    timers = lines[-1]["timers"]
+    assert timers["scan"]["count"] == 20 and timers["device/LT_2"]["count"] == 20
+    logic = timers["phase/logic"]
+    assert 2.0 <= logic["p50_ms"] <= 2.0 * 2 ** (1 / 8) # one log bucket wide
+    assert not prof.captures
+
+
+def test_overrun_and_p99_breach_capture_next_scans(tmp_path):
+    prof = ScanProfiler(window_scans=1000, capture_scans=2, p99_budget_s=0.001, min_samples=5,
+                        cooldown_scans=3, capture_dir=str(tmp_path))
+    def scan(dt):
+        prof.begin_scan()
+        time.sleep(dt)
+        prof.end_scan()
+
+    scan(0.0)
+    prof.on_overrun(0.05, 1.0)
+    assert not prof.arm("p99") # already armed
+    scan(0.0); scan(0.0)
+    assert len(prof.captures) == 1 and prof.captures[0]["reason"] == "overrun"
+    assert prof.captures[0]["path"].endswith(".prof") and "function calls" in prof.captures[0]["top"]
+
+    for _ in range(8): # slow scans push the rolling p99 over budget once cooled down
+        scan(0.002)
+    assert [c["reason"] for c in prof.captures][:2] == ["overrun", "p99"]
+
+
+def test_nested_use_of_one_timer_times_each_block():
+    prof = ScanProfiler()
+    t = prof.timer("subsystem/recurse")
+    with t:
+        time.sleep(0.02)
+        with prof.timer("subsystem/recurse"):
+            time.sleep(0.001)
+    assert t.count == 2
+    assert t.max_s >= 0.02 and t.total_s < 2 * t.max_s
@@ -0,0 +1,170 @@
+# tests/test_runtime_replay.py
+from core.clock import SimClock
+from devices.sensors.sensor_level import SensorLevel
+from plant.plant_core.commands import Command, CommandType
+from runtime.replay import InputRecorder, InputReplayer
+
+
+class DictIO:
+    def __init__(self, tags=None): self.tags = dict(tags or {})
+    def read(self, tag, default=None): return self.tags.get(tag, default)
+    def write(self, tag, value): self.tags[tag] = value
+
+
+def _record_run(path):
+    levels = [0.0, 0.2, 0.21, float("nan"), 0.5, 0.5]
+    state = {"i": 0}
+    def read():
+        v = levels[state["i"]]
+        if v != v:
+            raise IOError("gateway timeout")
+        return v
+
+    clk = SimClock(0.5)
+    io = DictIO({"HMI:ENABLE": False})
+    with InputRecorder(str(path), clk.period_s) as rec:
+        s = SensorLevel(id="LT_1", read_fn=rec.wrap_read("LT_1", read), deadband_abs=0.05)
+        rio = rec.wrap_io(io)
+        for i in range(len(levels)):
+            state["i"] = i
+            rec.begin_scan(clk)
+            if i == 2:
+                io.tags["HMI:ENABLE"] = True
+                rec.record_command("hmi", Command(CommandType.START, clk.now(), note="op"))
+            rio.read("HMI:ENABLE", False)
+            s.update(clk)
+            rec.record_output("LT_1", s.point.value)
+            rec.record_output("LT_1.q", s.point.quality)
+            clk.sleep_until_next_scan()
+
+
+def test_replay_reproduces_outputs(tmp_path):
+    path = tmp_path / "run.otrp"
+    _record_run(path)
+
+    rp = InputReplayer(str(path))
+    assert rp.n_scans == 6 and rp.period_s == 0.5
+
+    clk = rp.clock()
+    s = SensorLevel(id="LT_1", read_fn=rp.reader("LT_1"), deadband_abs=0.05)
+    io = rp.io()
+    enables, cmds = [], []
+    for scan in rp.scans(clk):
+        cmds += rp.commands("hmi")
+        enables.append(io.read("HMI:ENABLE", False))
+        s.update(clk)
+        rp.check_output("LT_1", s.point.value)
+        rp.check_output("LT_1.q", s.point.quality)
+
+    assert rp.mismatches == []
+    assert enables == [False, False, True, True, True, True]
+    assert len(cmds) == 1 and cmds[0].type == CommandType.START and cmds[0].note == "op"
+    assert cmds[0].t == 1.0
+
+
+def test_replay_flags_divergence_from_baseline(tmp_path):
+    path = tmp_path / "run.otrp"
+    _record_run(path)
+
+    rp = InputReplayer(str(path))
+    clk = rp.clock()
+    # A "changed" sensor with a wide deadband publishes differently than the baseline
+    s = SensorLevel(id="LT_1", read_fn=rp.reader("LT_1"), deadband_abs=1.0)
+    for scan in rp.scans(clk):
+        rp.commands("hmi")
+        rp.read("HMI:ENABLE")
+        s.update(clk)
+        rp.check_output("LT_1", s.point.value)
+        rp.check_output("LT_1.q", s.point.quality)
+
+    assert rp.mismatches
+    first_scan, tag, expected, got = rp.mismatches[0]
+    assert tag == "LT_1" and expected == 0.2 and got == 0.0
+
+
+def test_loader_only_resolves_registered_types(tmp_path):
+    import enum
+    import pytest
+    from runtime.replay import REPLAY_TYPES, _qualname, register_type
+
+    @register_type
+    class Shift(enum.Enum):
+        DAY = 1
+
+    path = str(tmp_path / "run.otrp")
+    clk = SimClock(0.5)
+    with InputRecorder(path, clk.period_s) as rec:
+        rec.begin_scan(clk)
+        rec.record_read("SHIFT", Shift.DAY)
+    assert InputReplayer(path)._reads["SHIFT"].values == [Shift.DAY]
+
+    del REPLAY_TYPES[_qualname(Shift)]
+    with pytest.raises(ValueError, match="unregistered type"):
+        InputReplayer(path)
+
+
+def test_unrecordable_value_leaves_no_partial_record(tmp_path):
+    path = str(tmp_path / "run.otrp")
+    clk = SimClock(0.5)
+    with InputRecorder(path, clk.period_s) as rec:
+        read = rec.wrap_read("LT_1", lambda: 2 ** 70) #doesn't fit the i64 payload
+        rec.begin_scan(clk)
+        assert read() == 2 ** 70
+        rec.record_read("LT_1", 1.5)
+    assert [(scan, tag) for scan, tag, _ in rec.errors] == [(0, "LT_1")]
+    rp = InputReplayer(path)
+    assert rp._reads["LT_1"].values == [1.5]
+
+
+def test_stale_read_replays_as_stale(tmp_path):
+    from core.point import Quality, StaleRead
+    path = tmp_path / "run.otrp"
+    levels = [0.3, None, 0.4]
+    state = {"i": 0}
+    def read():
+        v = levels[state["i"]]
+        if v is None:
+            raise StaleRead("scan overrun")
+        return v
+
+    clk = SimClock(0.5)
+    recorded = []
+    with InputRecorder(str(path), clk.period_s) as rec:
+        s = SensorLevel(id="LT_1", read_fn=rec.wrap_read("LT_1", read), deadband_abs=0.05)
+        for i in range(len(levels)):
+            state["i"] = i
+            rec.begin_scan(clk)
+            s.update(clk)
+            recorded.append(s.point.quality)
+            rec.record_output("LT_1.q", s.point.quality)
+            clk.sleep_until_next_scan()
+    assert recorded[1] == Quality.STALE
+
+    rp = InputReplayer(str(path))
+    clk = rp.clock()
+    s = SensorLevel(id="LT_1", read_fn=rp.reader("LT_1"), deadband_abs=0.05)
+    replayed = []
+    for scan in rp.scans(clk):
+        s.update(clk)
+        replayed.append(s.point.quality)
+        rp.check_output("LT_1.q", s.point.quality)
+    assert rp.mismatches == [] and replayed == recorded
+
+
+def test_output_missing_from_baseline_is_a_mismatch(tmp_path):
+    path = tmp_path / "run.otrp"
+    _record_run(path)
+
+    rp = InputReplayer(str(path))
+    clk = rp.clock()
+    s = SensorLevel(id="LT_1", read_fn=rp.reader("LT_1"), deadband_abs=0.05)
+    for scan in rp.scans(clk):
+        rp.commands("hmi")
+        rp.read("HMI:ENABLE")
+        s.update(clk)
+        if scan != 1:
+            rp.check_output("LT_1", s.point.value) #skipped once: later scans still line up
+        rp.check_output("LT_2", s.point.value)
+
+    assert [m[1] for m in rp.mismatches] == ["LT_2"] * 6
+    assert rp.mismatches[0] == (0, "LT_2", None, 0.0)
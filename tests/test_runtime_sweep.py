@@ -0,0 +1,115 @@
+# tests/test_runtime_sweep.py
+import json
+import random
+
+from core.commands import Command, CommandKind
+from devices.actuators.pump_actuator import OnOffPump
+from devices.sensors.sensor_level import SensorLevel
+from plant.plant_core.alarms import Alarm, AlarmPanel, Severity
+from runtime.sweep import ParamGrid, RandomSample, SweepRunner, Uniform
+
+
+class TankScenario:
+    """Level ramps up with a little seeded noise; the pump trips on high level."""
+    def __init__(self, params, seed):
+        self.rng = random.Random(seed)
+        self.level = 0.0
+        self.sensor = SensorLevel(id="LT_1", read_fn=lambda: self.level, deadband_abs=params["deadband"])
+        self.pump = OnOffPump(id="P_1")
+        self.pump.add_interlock(lambda: self.sensor.point.value < params["trip_level"])
+        self.pump.command(Command("P_1", CommandKind.START))
+        self.alarms = AlarmPanel()
+        self.alarms.add(Alarm("trip", "Pump trip", Severity.TRIP))
+        self.publishes = 0
+        self.trip_t = None
+
+    def scan(self, clk):
+        self.level += 0.05 + self.rng.uniform(-0.01, 0.01)
+        before = self.sensor.point
+        self.sensor.update(clk)
+        self.publishes += self.sensor.point is not before
+        self.pump.update(clk)
+        tripped = self.pump.state == "FAULT"
+        if tripped and self.trip_t is None:
+            self.trip_t = clk.now()
+        self.alarms.update({"trip": tripped}, clk.now())
+
+    def metrics(self):
+        return {
+            "publishes": self.publishes,
+            "alarms": sum(1 for a in self.alarms.alarms.values() if a.latched),
+            "trip_t": self.trip_t,
+        }
+
+
+def build_tank(params, seed):
+    return TankScenario(params, seed)
+
+
+def test_grid_sweep_writes_columns_and_is_reproducible(tmp_path):
+    spec = ParamGrid({"deadband": [0.01, 0.2], "trip_level": [1.0, 100.0]})
+    out = str(tmp_path / "results.json")
+    data = SweepRunner(build_tank, spec, out, n_scans=50, workers=0, base_seed=7).run()
+
+    assert data["run_id"] == ["r000000", "r000001", "r000002", "r000003"]
+    assert data["param.deadband"] == [0.01, 0.01, 0.2, 0.2]
+    # wider deadband -> fewer publishes; low trip level trips, high one doesn't
+    assert data["publishes"][0] > data["publishes"][2]
+    assert data["trip_t"][0] is not None and data["trip_t"][1] is None
+    assert all(p99 >= 0 for p99 in data["scan_p99_ms"])
+    with open(out) as fp:
+        assert json.load(fp)["data"]["publishes"] == data["publishes"]
+
+    again = SweepRunner(build_tank, spec, str(tmp_path / "again.json"), n_scans=50, workers=0, base_seed=7).run()
+    assert again["seed"] == data["seed"] and again["publishes"] == data["publishes"]
+
+
+def test_sweep_resumes_from_journal_on_process_pool(tmp_path):
+    spec = RandomSample({"deadband": Uniform(0.0, 0.1), "trip_level": [1.0, 2.0]}, n=4, seed=3)
+    out = str(tmp_path / "results.json")
+
+    first = SweepRunner(build_tank, spec, out, n_scans=20, workers=2)
+    stream = first.stream()
+    partial = next(stream)
+    stream.close() # simulate an interruption after one finished run
+
+    runner = SweepRunner(build_tank, spec, out, n_scans=20, workers=2)
+    new_rows = list(runner.stream())
+    assert len(new_rows) == 3
+    assert partial["run_id"] not in {r["run_id"] for r in new_rows}
+    data = runner.run()
+    assert len(data["run_id"]) == 4
+
+
+def test_resume_after_torn_journal_line_and_spec_check(tmp_path):
+    import pytest
+    spec = ParamGrid({"deadband": [0.01, 0.2], "trip_level": [1.0]})
+    out = str(tmp_path / "results.json")
+    runner = SweepRunner(build_tank, spec, out, n_scans=10, workers=0)
+    stream = runner.stream()
+    next(stream)
+    stream.close()
+    with open(runner.journal_path, "a") as fp:
+        fp.write('{"run_id":"r000001","se') # interrupted write
+
+    data = SweepRunner(build_tank, spec, out, n_scans=10, workers=0).run()
+    assert data["run_id"] == ["r000000", "r000001"]
+    with open(runner.journal_path) as fp:
+        assert [json.loads(line)["run_id"] for line in fp] == ["r000000", "r000001"]
+
+    other = ParamGrid({"deadband": [0.5, 0.2], "trip_level": [1.0]})
+    with pytest.raises(ValueError, match="different sweep"):
+        SweepRunner(build_tank, other, out, n_scans=10, workers=0).run()
+
+
+def test_resume_with_tuple_params(tmp_path):
+    spec = ParamGrid({"deadband": [0.01, 0.2], "trip_level": [1.0], "band": [(0.5, 1.5)]})
+    out = str(tmp_path / "results.json")
+    stream = SweepRunner(build_tank, spec, out, n_scans=10, workers=0).stream()
+    next(stream)
+    stream.close()
+
+    data = SweepRunner(build_tank, spec, out, n_scans=10, workers=0).run()
+    assert data["run_id"] == ["r000000", "r000001"]
+    with open(out) as fp:
+        assert json.load(fp)["data"]["param.band"] == [[0.5, 1.5], [0.5, 1.5]]